@@ -0,0 +1,54 @@
+import sys
+import os
+import argparse
+import random
+import time
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from evaluators.accuracy import AccuracyEvaluator, ACCURACY_METHODS
+
+def make_pairs(n: int, words: int, rng: random.Random):
+    """Reference answers plus responses that copy a random fraction of them, so scores spread over 0-10."""
+    vocab = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(2000)]
+    references, responses = [], []
+    for _ in range(n):
+        ref = [rng.choice(vocab) for _ in range(max(5, words // 4))]
+        keep = rng.random()
+        resp = [w if rng.random() < keep else rng.choice(vocab) for w in ref]
+        resp += [rng.choice(vocab) for _ in range(max(0, words - len(resp)))]
+        references.append(" ".join(ref))
+        responses.append(" ".join(resp))
+    return responses, references
+
+def bench():
+    parser = argparse.ArgumentParser(description="Benchmark accuracy backends for speed and agreement")
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--words", type=int, nargs="+", default=[50, 500, 3000], help="Response lengths in words")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for words in args.words:
+        responses, references = make_pairs(args.rows, words, rng)
+        queries = [""] * args.rows
+        print(f"\n{args.rows} rows, ~{words} words per response")
+        print(f"{'method':>10} {'seconds':>9} {'rows/s':>10} {'pearson vs sequence':>20}")
+
+        baseline = None
+        for method in ACCURACY_METHODS:
+            evaluator = AccuracyEvaluator({"method": method})
+            evaluator.evaluate_batch(queries[:2], responses[:2], references[:2])  # warm up lazy imports
+            start = time.perf_counter()
+            scores = np.array(evaluator.evaluate_batch(queries, responses, references).scores)
+            elapsed = time.perf_counter() - start
+            if baseline is None:
+                baseline = scores
+            agreement = np.corrcoef(baseline, scores)[0, 1] if scores.std() and baseline.std() else float("nan")
+            print(f"{method:>10} {elapsed:>9.3f} {args.rows / elapsed:>10.0f} {agreement:>20.3f}")
+
+if __name__ == "__main__":
+    bench()
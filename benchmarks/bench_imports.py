@@ -0,0 +1,63 @@
+import sys
+import os
+import argparse
+import json
+import statistics
+import subprocess
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules a local-only run should never import
+HEAVY_MODULES = ["pandas", "openai", "sklearn", "pyarrow", "scipy"]
+
+# A local-debug run up to its first scored row: config-driven client and evaluators, one generation
+COLD_START = f"""
+import sys
+sys.path.insert(0, {ROOT!r})
+from scripts.run_experiment import get_model, get_evaluators, evaluate_rows, build_row
+model = get_model({{"provider": "local", "model_name": "debug", "latency_ms": 0}})
+evaluators = get_evaluators({{"relevance": {{"enabled": True}}, "safety": {{"enabled": True}}}})
+response = model.generate("How should I save for retirement?")
+evaluate_rows([build_row(model, "p.md", {{"query": "How should I save for retirement?"}}, response)], evaluators)
+import json
+print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))
+"""
+
+def run_once(args) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], check=True, capture_output=True, cwd=ROOT)
+    return (time.perf_counter() - start) * 1000
+
+def heavy_modules_loaded() -> list:
+    out = subprocess.run([sys.executable, "-c", COLD_START], check=True, capture_output=True, text=True, cwd=ROOT)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def bench():
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold-start time against a budget")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (the median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=600, help="Allowed median cold start of a local-only run")
+    args = parser.parse_args()
+
+    measurements = {
+        "python -c pass": ["-c", "pass"],
+        "run_experiment.py --help": ["scripts/run_experiment.py", "--help"],
+        "local-only run (first row)": ["-c", COLD_START],
+    }
+    print(f"{'command':<30} {'median ms':>10} {'min ms':>10}")
+    medians = {}
+    for name, cmd in measurements.items():
+        times = [run_once(cmd) for _ in range(args.repeat)]
+        medians[name] = statistics.median(times)
+        print(f"{name:<30} {medians[name]:>10.0f} {min(times):>10.0f}")
+
+    loaded = heavy_modules_loaded()
+    print(f"\nHeavy modules imported by a local-only run: {', '.join(loaded) or 'none'}")
+    cold_start = medians["local-only run (first row)"]
+    if loaded or cold_start > args.budget_ms:
+        print(f"❌ Cold start {cold_start:.0f}ms (budget {args.budget_ms:.0f}ms)")
+        sys.exit(1)
+    print(f"✅ Cold start {cold_start:.0f}ms is within the {args.budget_ms:.0f}ms budget")
+
+if __name__ == "__main__":
+    bench()
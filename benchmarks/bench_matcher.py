@@ -0,0 +1,62 @@
+import sys
+import os
+import argparse
+import random
+import time
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from evaluators.matcher import TermMatcher
+
+def make_terms(n: int, rng: random.Random) -> list:
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    return list({"".join(rng.choice(alphabet) for _ in range(rng.randint(4, 12))) for _ in range(n)})
+
+def make_texts(n: int, words: int, terms: list, rng: random.Random) -> list:
+    vocab = ["the", "market", "index", "fund", "portfolio", "risk", "return", "savings", "tax", "account"]
+    texts = []
+    for _ in range(n):
+        tokens = [rng.choice(vocab) for _ in range(words)]
+        if rng.random() < 0.1:
+            tokens[rng.randrange(words)] = rng.choice(terms)
+        texts.append(" ".join(tokens))
+    return texts
+
+def substring_scan(terms: list, texts: list) -> list:
+    """The original per-keyword `w in response_lower` scan."""
+    return [{w for w in terms if w in t.lower()} for t in texts]
+
+def bench():
+    parser = argparse.ArgumentParser(description="Benchmark TermMatcher against per-keyword substring scans")
+    parser.add_argument("--terms", type=int, nargs="+", default=[5, 100, 1000, 5000])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=300, help="Words per response text")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--substring", action="store_true",
+                        help="Benchmark the matcher without word boundaries (same semantics as the scan)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'terms':>6} {'scan (s)':>10} {'build (s)':>10} {'matcher (s)':>12} {'speedup':>8}")
+    for n_terms in args.terms:
+        terms = make_terms(n_terms, rng)
+        texts = make_texts(args.texts, args.words, terms, rng)
+
+        start = time.perf_counter()
+        substring_scan(terms, texts)
+        scan_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = TermMatcher(terms, word_boundary=not args.substring)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for t in texts:
+            matcher.found(t)
+        match_s = time.perf_counter() - start
+
+        print(f"{n_terms:>6} {scan_s:>10.3f} {build_s:>10.3f} {match_s:>12.3f} {scan_s / match_s:>7.1f}x")
+
+if __name__ == "__main__":
+    bench()
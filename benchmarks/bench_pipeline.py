@@ -0,0 +1,176 @@
+import sys
+import os
+import argparse
+import contextlib
+import json
+import platform
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import yaml
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import make_dataset, make_responses, make_results_frame, write_dataset
+from scripts.results_store import write_parquet_results
+from scripts.run_experiment import get_evaluators
+
+BENCH_EVALUATORS = {
+    "relevance": {"enabled": True},
+    "safety": {"enabled": True},
+    "accuracy": {"enabled": True, "method": "sequence"},
+    "clarity": {"enabled": True},
+    "vector_relevance": {"enabled": True},
+}
+
+@contextlib.contextmanager
+def cli(argv: List[str]):
+    """Runs a script's argparse entry point in-process with its output discarded."""
+    saved = sys.argv
+    sys.argv = argv
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        sys.argv = saved
+
+def timed(fn: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def bench_evaluators(rows: int, response_words: int, seed: int) -> Dict[str, float]:
+    records = make_dataset(rows, seed=seed)
+    queries = [r["query"] for r in records]
+    references = [r["reference_answer"] for r in records]
+    responses = make_responses(records, response_words, seed)
+    metrics = {}
+    for name, evaluator in get_evaluators(BENCH_EVALUATORS).items():
+        evaluator.evaluate_batch(queries[:4], responses[:4], references[:4])  # warm up lazy imports
+        elapsed = timed(lambda: evaluator.evaluate_batch(queries, responses, references))
+        metrics[f"evaluator.{name}.rows_per_s"] = rows / elapsed
+    return metrics
+
+def bench_end_to_end(tmp: str, queries: int, latency_ms: int, max_concurrency: int, seed: int) -> float:
+    """Rows/s of a full run_experiment.py run against LocalModelClient."""
+    from scripts import run_experiment
+
+    dataset = os.path.join(tmp, f"queries-{latency_ms}.jsonl")
+    write_dataset(dataset, make_dataset(queries, seed=seed))
+    prompt = os.path.join(tmp, "prompt.md")
+    with open(prompt, 'w') as f:
+        f.write("You are a financial planner. Answer briefly.\n\nUser Query: {{query}}\n")
+    eval_path, models_path = os.path.join(tmp, "evaluation.yaml"), os.path.join(tmp, "models.yaml")
+    with open(eval_path, 'w') as f:
+        yaml.safe_dump({
+            "experiment_name": "bench",
+            "prompts": [prompt],
+            "datasets": [dataset],
+            "models": ["local"],
+            "evaluators": {k: v for k, v in BENCH_EVALUATORS.items() if k != "vector_relevance"},
+            "cache": {"mode": "off"},
+            "output": {"format": "json", "save_dir": os.path.join(tmp, f"results-{latency_ms}")},
+        }, f)
+    with open(models_path, 'w') as f:
+        yaml.safe_dump({"models": {"local": {
+            "provider": "local", "model_name": "bench-local", "latency_ms": latency_ms, "max_concurrency": max_concurrency,
+        }}}, f)
+
+    with cli(["run_experiment.py", "--config", eval_path, "--models-config", models_path]):
+        elapsed = timed(run_experiment.run)
+    return queries / elapsed
+
+def bench_analysis(tmp: str, rows: int, seed: int) -> Dict[str, float]:
+    """Seconds for compare_prompts.py and analyze_failures.py on a synthetic result set."""
+    from scripts.compare_prompts import compare
+    from scripts.analyze_failures import analyze
+
+    df = make_results_frame(rows, seed=seed)
+    path = os.path.join(tmp, "results.parquet")
+    write_parquet_results(df, path, "bench")  # a DataFrame is accepted as-is
+    config = os.path.join(tmp, "missing.yaml")  # default weights and thresholds
+
+    metrics = {"analysis.rows": float(len(df))}
+    with cli(["compare_prompts.py", "--results", path, "--config", config, "--bootstrap", "2000"]):
+        metrics["analysis.compare_prompts_s"] = timed(compare)
+    with cli(["analyze_failures.py", "--results", path, "--config", config, "--top-k", "20"]):
+        metrics["analysis.analyze_failures_s"] = timed(analyze)
+    return metrics
+
+def compare_to_baseline(metrics: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """
+    Regressions beyond `threshold` (0.2 = 20%). Metrics ending in "_per_s" are
+    higher-is-better and metrics ending in "_s" lower-is-better; others are informational.
+    """
+    regressions = []
+    for name, value in metrics.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if name.endswith("_per_s") and value < base * (1 - threshold):
+            regressions.append(f"{name}: {value:.1f} vs baseline {base:.1f} ({value / base - 1:+.0%})")
+        elif name.endswith("_s") and not name.endswith("_per_s") and value > base * (1 + threshold):
+            regressions.append(f"{name}: {value:.2f}s vs baseline {base:.2f}s ({value / base - 1:+.0%})")
+    return regressions
+
+def bench():
+    parser = argparse.ArgumentParser(description="Benchmark evaluators, end-to-end runs and analysis scripts")
+    parser.add_argument("--eval-rows", type=int, default=5000, help="Rows scored per evaluator")
+    parser.add_argument("--response-words", type=int, default=120, help="Words per synthetic response")
+    parser.add_argument("--e2e-queries", type=int, default=500, help="Queries per end-to-end run")
+    parser.add_argument("--latency-ms", type=int, nargs="+", default=[0, 20], help="LocalModelClient latencies to run")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="max_concurrency of the local model")
+    parser.add_argument("--analysis-rows", type=int, default=1_000_000, help="Rows in the synthetic result set")
+    parser.add_argument("--skip", nargs="*", default=[], choices=["evaluators", "e2e", "analysis"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmarks/results/latest.json", help="Where to save this run's metrics")
+    parser.add_argument("--baseline", default=None, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression vs baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    metrics: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        if "evaluators" not in args.skip:
+            print(f"⏱️  Evaluators on {args.eval_rows} rows...")
+            metrics.update(bench_evaluators(args.eval_rows, args.response_words, args.seed))
+        if "e2e" not in args.skip:
+            for latency in args.latency_ms:
+                print(f"⏱️  End-to-end run, {args.e2e_queries} queries at latency_ms={latency}...")
+                metrics[f"e2e.latency_{latency}ms.rows_per_s"] = bench_end_to_end(
+                    tmp, args.e2e_queries, latency, args.max_concurrency, args.seed)
+        if "analysis" not in args.skip:
+            print(f"⏱️  Analysis scripts on {args.analysis_rows} rows...")
+            metrics.update(bench_analysis(tmp, args.analysis_rows, args.seed))
+
+    print(f"\n{'metric':<45} {'value':>12}")
+    for name, value in metrics.items():
+        print(f"{name:<45} {value:>12.2f}")
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "args": vars(args),
+        "metrics": metrics,
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)["metrics"]
+        regressions = compare_to_baseline(metrics, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} vs {args.baseline}")
+
+if __name__ == "__main__":
+    bench()
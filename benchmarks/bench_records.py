@@ -0,0 +1,99 @@
+import sys
+import os
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from typing import Callable, Tuple
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import make_results_frame
+from models.base_model import LLMResponse, TokenUsage
+from scripts.sink import collect_columns, iter_sink, row_key
+
+def measure(fn: Callable[[], object]) -> Tuple[float, float]:
+    """(seconds, peak MB of Python allocations) of fn(); timed and traced in separate calls."""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+def collect_dicts(path: str, planned_keys) -> list:
+    """The previous collect_results: every sink row kept as a dict, grouped in a deque per key."""
+    by_key = defaultdict(deque)
+    for row in iter_sink(path):
+        by_key[row_key(row)].append(row)
+    return [by_key[key].popleft() for key in planned_keys if by_key[key]]
+
+def raw_payload(content: str, i: int) -> dict:
+    """Shaped like an OpenAI ChatCompletion.model_dump()."""
+    return {
+        "id": f"chatcmpl-{i:024d}", "object": "chat.completion", "created": 1700000000 + i,
+        "model": "gpt-4-turbo-preview", "system_fingerprint": "fp_0123456789", "service_tier": None,
+        "choices": [{"index": 0, "finish_reason": "stop", "logprobs": None, "message": {
+            "role": "assistant", "content": content, "refusal": None, "function_call": None,
+            "tool_calls": None, "audio": None, "annotations": []}}],
+        "usage": {"prompt_tokens": 120, "completion_tokens": 300, "total_tokens": 420,
+                  "completion_tokens_details": None, "prompt_tokens_details": None},
+    }
+
+def bench_responses(n: int, contents) -> None:
+    print(f"\n{n} LLMResponse objects (as cached)")
+    print(f"{'raw_response':>14} {'seconds':>9} {'per s':>10} {'peak MB':>9} {'cache bytes/row':>16}")
+    for keep_raw in (True, False):
+        def build():
+            return [
+                LLMResponse(
+                    content=contents[i % len(contents)],
+                    raw_response=raw_payload(contents[i % len(contents)], i) if keep_raw else {},
+                    token_usage=TokenUsage(prompt_tokens=120, completion_tokens=300, total_tokens=420),
+                    latency_ms=812.5,
+                    model_name="gpt-4-turbo-preview",
+                )
+                for i in range(n)
+            ]
+        elapsed, peak = measure(build)
+        size = sum(len(r.model_dump_json()) for r in build()[:1000]) / min(n, 1000)
+        print(f"{'kept' if keep_raw else 'dropped':>14} {elapsed:>9.2f} {n / elapsed:>10.0f} {peak:>9.0f} {size:>16.0f}")
+
+def bench_collect(rows: int, seed: int) -> None:
+    df = make_results_frame(rows, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = os.path.join(tmp, "results.jsonl")
+        with open(sink, 'w') as f:
+            for row in df.to_dict(orient="records"):
+                f.write(json.dumps(row) + "\n")
+        planned = [row_key(row) for row in df[["model", "prompt_source", "query"]].to_dict(orient="records")]
+        del df
+
+        print(f"\nCollecting {len(planned)} result rows from the sink into a DataFrame")
+        print(f"{'representation':>14} {'seconds':>9} {'rows/s':>10} {'peak MB':>9}")
+        import pandas as pd
+        for name, fn in (
+            ("columns", lambda: collect_columns(sink, planned)[0].to_frame()),
+            ("dicts", lambda: pd.DataFrame(collect_dicts(sink, planned))),  # last: may need several GB at 1M rows
+        ):
+            elapsed, peak = measure(fn)
+            print(f"{name:>14} {elapsed:>9.2f} {len(planned) / elapsed:>10.0f} {peak:>9.0f}", flush=True)
+
+def bench():
+    parser = argparse.ArgumentParser(description="Benchmark memory and throughput of result and response records")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Result rows to collect")
+    parser.add_argument("--responses", type=int, default=200_000, help="LLMResponse objects to build")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    contents = list(make_results_frame(600, response_words=120, seed=args.seed)["response"])
+    bench_responses(args.responses, contents)
+    bench_collect(args.rows, args.seed)
+
+if __name__ == "__main__":
+    bench()
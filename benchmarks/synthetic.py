@@ -0,0 +1,75 @@
+import json
+import random
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Domain-flavoured vocabulary so keyword evaluators hit realistic term densities
+VOCAB = [
+    "the", "a", "to", "and", "of", "your", "you", "is", "for", "in", "it", "with", "can", "should",
+    "market", "index", "fund", "portfolio", "risk", "return", "savings", "tax", "account", "retirement",
+    "diversification", "bond", "stock", "inflation", "budget", "emergency", "interest", "rate", "plan",
+    "invest", "income", "expense", "loan", "credit", "debt", "pension", "allocation", "volatility",
+]
+
+def make_text(words: int, rng: random.Random) -> str:
+    return " ".join(rng.choice(VOCAB) for _ in range(words))
+
+def make_dataset(n: int, query_words: int = 12, reference_words: int = 40, seed: int = 0) -> List[Dict[str, str]]:
+    """Dataset records with a unique query and a reference answer each."""
+    rng = random.Random(seed)
+    return [
+        {"query": f"{make_text(query_words, rng)} #{i}?", "reference_answer": make_text(reference_words, rng)}
+        for i in range(n)
+    ]
+
+def write_dataset(path: str, records: Sequence[Dict[str, str]]):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+def make_responses(records: Sequence[Dict[str, str]], response_words: int = 120, seed: int = 0) -> List[str]:
+    """Responses that reuse part of the query and reference, with a bullet list every few rows."""
+    rng = random.Random(seed)
+    responses = []
+    for i, record in enumerate(records):
+        body = record["query"].split()[:5] + record["reference_answer"].split()[:10]
+        body += make_text(max(0, response_words - len(body)), rng).split()
+        text = " ".join(body)
+        if i % 3 == 0:
+            text += "\n- point one\n- point two"
+        responses.append(text)
+    return responses
+
+def make_results_frame(rows: int, models: Sequence[str] = ("model-a", "model-b"),
+                       prompts: Sequence[str] = ("v1.md", "v2.md", "v3.md"),
+                       evaluators: Sequence[str] = ("relevance", "safety", "accuracy", "clarity"),
+                       response_words: int = 20, seed: int = 0) -> pd.DataFrame:
+    """
+    A results table shaped like run_experiment output: every query answered by every
+    (model, prompt) arm, scores on the 0.01 grid, short response and reason text.
+    """
+    rng = np.random.default_rng(seed)
+    arms = len(models) * len(prompts)
+    queries = max(1, rows // arms)
+    n = queries * arms
+    query_ids = np.tile(np.arange(queries), arms)
+
+    words = np.array(VOCAB)
+    pool = [" ".join(words[rng.integers(0, len(words), response_words)]) for _ in range(1000)]
+    df = pd.DataFrame({
+        "model": np.repeat(np.array(models), queries * len(prompts)),
+        "prompt_source": np.tile(np.repeat(np.array(prompts), queries), len(models)),
+        "query": pd.Series(query_ids).map(lambda q: f"synthetic query {q}"),
+        "reference": "synthetic reference",
+        "response": np.array(pool, dtype=object)[rng.integers(0, len(pool), n)],
+        "latency_ms": np.round(rng.gamma(2.0, 200.0, n), 1),
+        "prompt_tokens": rng.integers(50, 400, n),
+        "completion_tokens": rng.integers(20, 600, n),
+    })
+    for i, name in enumerate(evaluators):
+        arm_shift = rng.normal(0, 0.5, arms)[np.repeat(np.arange(arms), queries)]
+        df[f"score_{name}"] = np.round(np.clip(rng.normal(6 + i * 0.3, 2, n) + arm_shift, 0, 10), 2)
+        df[f"reason_{name}"] = f"synthetic {name} reason"
+    return df
@@ -1,13 +1,58 @@
-from typing import Optional
-from .base import BaseEvaluator, EvaluationResult
+from typing import Optional, Sequence
+from .base import BaseEvaluator, EvaluationResult, BatchEvaluationResult
+from .similarity import token_f1, rouge_l, char_ngrams, jaccard, TfidfCorpus, tfidf_cosine
+from .matcher import load_terms
 from difflib import SequenceMatcher
 
+# Backends selectable with `method:` in the accuracy evaluator config
+ACCURACY_METHODS = {
+    "sequence": "Similarity",      # difflib ratio; can be quadratic on long texts
+    "token_f1": "Token F1",
+    "rouge_l": "ROUGE-L F1",
+    "jaccard": "Char n-gram Jaccard",
+    "tfidf": "TF-IDF cosine",
+}
+
+# Earlier names still accepted in configs
+METHOD_ALIASES = {"minhash": "jaccard"}
+
 class AccuracyEvaluator(BaseEvaluator):
     """
     Heuristic accuracy checker.
     Compares response to a reference answer using sequence matching (Levenshtein distance proxy).
+
+    Config:
+        method: sequence (default), token_f1, rouge_l, jaccard or tfidf.
+            All but `sequence` are near-linear in text length.
+        ngram: jaccard only; character n-gram size (default 3).
+        idf_corpus: tfidf only; file with one document per line to fit the IDF on
+            once. Without it each pair is weighted by its own two texts.
     """
-    
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.method = self.config.get("method", "sequence")
+        self.method = METHOD_ALIASES.get(self.method, self.method)
+        if self.method not in ACCURACY_METHODS:
+            raise ValueError(f"Unknown accuracy method: {self.method}. Expected one of {list(ACCURACY_METHODS)}")
+        self.ngram = self.config.get("ngram", 3)
+        self.tfidf = None
+        if self.method == "tfidf" and self.config.get("idf_corpus"):
+            self.tfidf = TfidfCorpus(load_terms(self.config["idf_corpus"]))
+
+    def similarity(self, response_text: str, reference_answer: str) -> float:
+        if self.method == "token_f1":
+            return token_f1(response_text, reference_answer)
+        if self.method == "rouge_l":
+            return rouge_l(response_text, reference_answer)
+        if self.method == "jaccard":
+            return jaccard(char_ngrams(response_text, self.ngram), char_ngrams(reference_answer, self.ngram))
+        if self.method == "tfidf":
+            if self.tfidf is not None:
+                return float(self.tfidf.cosine([response_text], [reference_answer])[0])
+            return tfidf_cosine(response_text, reference_answer)
+        return SequenceMatcher(None, response_text.lower(), reference_answer.lower()).ratio()
+
     def evaluate(self, query: str, response_text: str, reference_answer: Optional[str] = None) -> EvaluationResult:
         if not reference_answer:
             return EvaluationResult(
@@ -16,11 +61,62 @@ class AccuracyEvaluator(BaseEvaluator):
                 evaluator_name="AccuracyHeuristic",
                 metadata={"status": "skipped"}
             )
-            
-        similarity = SequenceMatcher(None, response_text.lower(), reference_answer.lower()).ratio()
-        
+
+        similarity = self.similarity(response_text, reference_answer)
+
         return EvaluationResult(
             score=round(similarity * 10, 2),
-            reasoning=f"Similarity to reference: {similarity:.2f}",
-            evaluator_name="AccuracyHeuristic"
+            reasoning=f"{ACCURACY_METHODS[self.method]} to reference: {similarity:.2f}",
+            evaluator_name="AccuracyHeuristic",
+            metadata={"method": self.method}
         )
+
+    def evaluate_batch(self,
+                       queries: Sequence[str],
+                       responses: Sequence[str],
+                       references: Optional[Sequence[Optional[str]]] = None) -> BatchEvaluationResult:
+        if references is None:
+            references = [None] * len(responses)
+        scores = [0.0] * len(responses)
+        reasons = ["No reference answer provided for accuracy check."] * len(responses)
+        label = ACCURACY_METHODS[self.method]
+
+        rows = [i for i, ref in enumerate(references) if ref]
+        if self.tfidf is not None:
+            # One sparse product for the whole batch against the corpus-fitted IDF
+            sims = self.tfidf.cosine([responses[i] for i in rows], [references[i] for i in rows]).tolist()
+            for i, similarity in zip(rows, sims):
+                scores[i] = round(similarity * 10, 2)
+                reasons[i] = f"{label} to reference: {similarity:.2f}"
+            return BatchEvaluationResult(scores=scores, reasons=reasons, evaluator_name="AccuracyHeuristic")
+
+        # Group rows by reference so per-reference work happens once: SequenceMatcher
+        # indexes its second sequence in set_seq2, jaccard shingles the reference once.
+        # Identical responses to the same reference (refusals, cached generations) are scored once.
+        order = sorted(rows, key=lambda i: references[i])
+        matcher = SequenceMatcher(None)
+        current_ref = None
+        ref_grams = None
+        seen = {}
+        for i in order:
+            if references[i] != current_ref:
+                current_ref = references[i]
+                if self.method == "sequence":
+                    matcher.set_seq2(current_ref.lower())
+                elif self.method == "jaccard":
+                    ref_grams = char_ngrams(current_ref, self.ngram)
+                seen = {}
+            similarity = seen.get(responses[i])
+            if similarity is None:
+                if self.method == "sequence":
+                    matcher.set_seq1(responses[i].lower())
+                    similarity = matcher.ratio()
+                elif self.method == "jaccard":
+                    similarity = jaccard(char_ngrams(responses[i], self.ngram), ref_grams)
+                else:
+                    similarity = self.similarity(responses[i], current_ref)
+                seen[responses[i]] = similarity
+            scores[i] = round(similarity * 10, 2)
+            reasons[i] = f"{label} to reference: {similarity:.2f}"
+
+        return BatchEvaluationResult(scores=scores, reasons=reasons, evaluator_name="AccuracyHeuristic")
@@ -1,5 +1,8 @@
+import hashlib
+import inspect
+import json
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Sequence
 from pydantic import BaseModel
 
 class EvaluationResult(BaseModel):
@@ -8,6 +11,14 @@ class EvaluationResult(BaseModel):
     evaluator_name: str
     metadata: Dict[str, Any] = {}
 
+class BatchEvaluationResult(BaseModel):
+    """Columnar results for a batch: scores[i] and reasons[i] belong to row i."""
+    scores: List[float]
+    reasons: List[str]
+    evaluator_name: str
+    # Optional per-dimension sub-scores (e.g. an LLM judge), written as score_<name>_<dimension>
+    dimension_scores: Dict[str, List[float]] = {}
+
 class BaseEvaluator(ABC):
     """
     Abstract Interface for Prompt Evaluators.
@@ -17,6 +28,24 @@ class BaseEvaluator(ABC):
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
 
+    def fingerprint(self) -> str:
+        """
+        Hash of everything that determines this evaluator's scores: its class, the
+        source of the module defining it, and its config (minus `weight`/`enabled`,
+        which do not change scores). Stored results whose fingerprint differs are stale.
+        """
+        config = {k: v for k, v in self.config.items() if k not in ("weight", "enabled")}
+        module = inspect.getmodule(type(self))
+        try:
+            source = inspect.getsource(module) if module else ""
+        except (OSError, TypeError):
+            source = ""
+        payload = json.dumps(
+            {"class": type(self).__qualname__, "config": config, "source": source},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
     @abstractmethod
     def evaluate(self, 
                  query: str, 
@@ -34,3 +63,20 @@ class BaseEvaluator(ABC):
             EvaluationResult with score and explanation.
         """
         pass
+
+    def evaluate_batch(self,
+                       queries: Sequence[str],
+                       responses: Sequence[str],
+                       references: Optional[Sequence[Optional[str]]] = None) -> BatchEvaluationResult:
+        """
+        Evaluate many rows at once. The default loops over `evaluate()`; heuristic
+        evaluators override it to share precompiled state across the whole batch.
+        """
+        if references is None:
+            references = [None] * len(queries)
+        results = [self.evaluate(q, r, ref) for q, r, ref in zip(queries, responses, references)]
+        return BatchEvaluationResult(
+            scores=[res.score for res in results],
+            reasons=[res.reasoning for res in results],
+            evaluator_name=results[0].evaluator_name if results else type(self).__name__
+        )
@@ -1,29 +1,59 @@
-from typing import Optional
-from .base import BaseEvaluator, EvaluationResult
+import re
+from typing import Optional, Sequence
+import numpy as np
+from .base import BaseEvaluator, EvaluationResult, BatchEvaluationResult
+
+# A line that starts (after whitespace) with a bullet or a numbered item
+BULLET_LINE = re.compile(r"^\s*(?:-|\*|1\.)", re.MULTILINE)
 
 class ClarityEvaluator(BaseEvaluator):
     """
     Checks for structure and readability.
     """
-    
+
     def evaluate(self, query: str, response_text: str, reference_answer: Optional[str] = None) -> EvaluationResult:
         # Heuristics: Bullet points, moderate length, no all-caps
         lines = response_text.strip().split('\n')
         has_bullets = any(line.strip().startswith(('-', '*', '1.')) for line in lines)
         length_ok = 50 < len(response_text) < 2000
-        
+
         score = 5.0
         details = []
-        
+
         if has_bullets:
             score += 2.0
             details.append("Has bullet points")
         if length_ok:
             score += 3.0
             details.append("Good length")
-        
+
         return EvaluationResult(
             score=min(score, 10.0),
             reasoning=f"Clarity checks: {', '.join(details)}",
             evaluator_name="ClarityHeuristic"
         )
+
+    def evaluate_batch(self,
+                       queries: Sequence[str],
+                       responses: Sequence[str],
+                       references: Optional[Sequence[Optional[str]]] = None) -> BatchEvaluationResult:
+        has_bullets = np.fromiter((BULLET_LINE.search(r) is not None for r in responses), dtype=bool, count=len(responses))
+        lengths = np.fromiter((len(r) for r in responses), dtype=np.int64, count=len(responses))
+        length_ok = (lengths > 50) & (lengths < 2000)
+
+        scores = np.minimum(5.0 + 2.0 * has_bullets + 3.0 * length_ok, 10.0)
+
+        # Only four possible explanations; index them by (has_bullets, length_ok)
+        reason_table = [
+            "Clarity checks: ",
+            "Clarity checks: Good length",
+            "Clarity checks: Has bullet points",
+            "Clarity checks: Has bullet points, Good length",
+        ]
+        codes = 2 * has_bullets.astype(np.int64) + length_ok.astype(np.int64)
+
+        return BatchEvaluationResult(
+            scores=scores.tolist(),
+            reasons=[reason_table[c] for c in codes.tolist()],
+            evaluator_name="ClarityHeuristic"
+        )
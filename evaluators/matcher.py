@@ -0,0 +1,136 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+WORD = re.compile(r"\w+")
+
+# Below this many substring terms, per-term `in` checks (C memmem) beat the trie regex
+# (see benchmarks/bench_matcher.py --substring)
+SMALL_SCAN_TERMS = 500
+
+class TermMatch(NamedTuple):
+    term: str
+    start: int
+    end: int
+
+def load_terms(path: str) -> List[str]:
+    """Reads one term per line; blank lines and lines starting with '#' are skipped."""
+    terms = []
+    with open(path, 'r', encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                terms.append(line)
+    return terms
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    """
+    Compiles terms into a prefix-trie shaped regex, e.g. ["hack", "hacker", "harm"]
+    becomes "ha(?:ck(?:er)?|rm)". Unlike a flat alternation, the engine only follows
+    branches that match the text so far, so cost stays close to linear in the text
+    length even with thousands of terms. Optional suffixes are greedy, which makes the
+    longest term win at each position.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and not terminal else f"(?:{'|'.join(branches)})"
+        if terminal:
+            return f"(?:{body})?" if len(branches) == 1 else f"{body}?"
+        return body
+
+    return build(trie)
+
+class TermMatcher:
+    """
+    Finds every occurrence of a fixed set of terms in one pass over the text.
+
+    Built once per term list (e.g. per evaluator config) and reused for every row.
+    Matching is case-insensitive and by substring ("harm" matches "harmful" and
+    "pharmacy"); with `word_boundary` a term only matches when it is not part of a
+    longer word.
+
+    With word boundaries, single-word terms are found by splitting the text into
+    words once and looking each word up in a set, which costs the same for 5 or
+    50,000 terms. Multi-word terms (and all terms without word boundaries) use one
+    trie-shaped regex. Short substring lists fall back to plain `in` scans.
+    """
+
+    def __init__(self, terms: Iterable[str], word_boundary: bool = True):
+        self.terms = list(dict.fromkeys(t.lower() for t in terms if t.strip()))
+        self.word_boundary = word_boundary
+        self._index = {t: i for i, t in enumerate(self.terms)}
+
+        if word_boundary:
+            self._words = frozenset(t for t in self.terms if WORD.fullmatch(t))
+        else:
+            self._words = frozenset()
+        phrases = [t for t in self.terms if t not in self._words]
+
+        self._pattern: Optional[re.Pattern] = None
+        self._overlapping: Optional[re.Pattern] = None
+        self._prefix_terms: Dict[str, List[str]] = {}
+        if phrases:
+            body = _trie_regex(phrases)
+            if word_boundary:
+                body = rf"(?<!\w)(?:{body})(?!\w)"
+            else:
+                # Zero-width lookahead: the longest term starting at every position, so
+                # terms nested in or overlapping a longer match ("hack" in "hacker") are
+                # not skipped by found()
+                self._overlapping = re.compile(f"(?=({body}))", re.IGNORECASE)
+            self._pattern = re.compile(body, re.IGNORECASE)
+
+    def find_all(self, text: str) -> List[TermMatch]:
+        """All non-overlapping matches with their character offsets in `text`, in text order."""
+        matches = []
+        if self._words:
+            for m in WORD.finditer(text):
+                word = m.group().lower()
+                if word in self._words:
+                    matches.append(TermMatch(word, m.start(), m.end()))
+        if self._pattern is not None:
+            matches.extend(TermMatch(m.group().lower(), m.start(), m.end()) for m in self._pattern.finditer(text))
+            if self._words:
+                matches.sort(key=lambda m: m.start)
+        return matches
+
+    def found(self, text: str) -> Set[str]:
+        """The distinct terms present in `text`."""
+        if not self.word_boundary and len(self.terms) <= SMALL_SCAN_TERMS:
+            text_lower = text.lower()
+            return {t for t in self.terms if t in text_lower}
+
+        hits: Set[str] = set()
+        if self._overlapping is not None:
+            for m in set(self._overlapping.findall(text)):
+                hits.update(self._prefixes(m.lower()))
+            return hits
+        if self._words:
+            hits.update(self._words.intersection(WORD.findall(text.lower())))
+        if self._pattern is not None:
+            hits.update(m.lower() for m in self._pattern.findall(text))
+        return hits
+
+    def _prefixes(self, match: str) -> List[str]:
+        """Terms that are prefixes of `match` (the longest term at a position), itself included."""
+        terms = self._prefix_terms.get(match)
+        if terms is None:
+            terms = [match[:i] for i in range(1, len(match) + 1) if match[:i] in self._index]
+            self._prefix_terms[match] = terms
+        return terms
+
+    def found_in_order(self, text: str) -> List[str]:
+        """Distinct terms present in `text`, in the order they were given to the matcher."""
+        return self.in_order(self.found(text))
+
+    def in_order(self, terms: Iterable[str]) -> List[str]:
+        return sorted(set(terms), key=lambda t: self._index.get(t, len(self._index)))
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Union
+
+from models.registry import load_object
+
+# evaluator name -> class, or "module:Class" imported only when the evaluator is enabled.
+# Evaluators run (and their score columns appear) in this order.
+EVALUATORS: Dict[str, Union[str, type]] = {
+    "relevance": "evaluators.relevance:RelevanceEvaluator",
+    "safety": "evaluators.safety:SafetyEvaluator",
+    "accuracy": "evaluators.accuracy:AccuracyEvaluator",
+    "clarity": "evaluators.clarity:ClarityEvaluator",
+    "vector_relevance": "evaluators.vector_relevance:VectorRelevanceEvaluator",
+    "judge": "evaluators.llm_judge:LLMJudgeEvaluator",
+}
+
+def register_evaluator(name: str, evaluator: Union[str, type]):
+    """Adds an evaluator that the `evaluators:` section of evaluation.yaml can enable by name."""
+    EVALUATORS[name] = evaluator
+
+def get_evaluator_class(name: str, conf: Dict[str, Any] = None) -> type:
+    """Class of a registered evaluator, or of the "module:Class" path in its config's `class` key."""
+    target = EVALUATORS.get(name) or (conf or {}).get("class")
+    if target is None:
+        raise ValueError(f"Unknown evaluator: {name} (register it or set `class: module:Class`)")
+    return load_object(target)
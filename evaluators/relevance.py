@@ -1,17 +1,36 @@
-from typing import Optional
-from .base import BaseEvaluator, EvaluationResult
+import string
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .base import BaseEvaluator, EvaluationResult, BatchEvaluationResult
+from .matcher import TermMatcher
+
+STOP_WORDS = frozenset({'what', 'is', 'how', 'to', 'the', 'a', 'an', 'in', 'of', 'for'})
+
+@lru_cache(maxsize=4096)
+def _query_matcher(terms: Tuple[str, ...]) -> TermMatcher:
+    # Each query is scored once per model x prompt, so its matcher is compiled once
+    return TermMatcher(terms, word_boundary=True)
 
 class RelevanceEvaluator(BaseEvaluator):
     """
     Heuristic-based relevance evaluator.
-    Checks if keywords from the query appear in the response.
+    Checks if keywords from the query appear as whole words in the response.
     """
-    
+
+    @staticmethod
+    def query_terms(query: str) -> List[str]:
+        # Simple stop-word filtering; surrounding punctuation ("France?") is not part of the term
+        words = (word.strip(string.punctuation).lower() for word in query.split())
+        return sorted(set(w for w in words if w not in STOP_WORDS and len(w) > 2))
+
+    def matched_terms(self, query_words: List[str], response_text: str) -> List[str]:
+        found = _query_matcher(tuple(query_words)).found(response_text)
+        return [w for w in query_words if w in found]
+
     def evaluate(self, query: str, response_text: str, reference_answer: Optional[str] = None) -> EvaluationResult:
-        # Simple stop-word filtering
-        stop_words = {'what', 'is', 'how', 'to', 'the', 'a', 'an', 'in', 'of', 'for'}
-        query_words = set(word.lower() for word in query.split() if word.lower() not in stop_words and len(word) > 2)
-        
+        query_words = self.query_terms(query)
+
         if not query_words:
             return EvaluationResult(
                 score=0.5,
@@ -19,20 +38,54 @@ class RelevanceEvaluator(BaseEvaluator):
                 evaluator_name="RelevanceHeuristic"
             )
 
-        response_lower = response_text.lower()
-        matched_words = [w for w in query_words if w in response_lower]
+        matched_words = self.matched_terms(query_words, response_text)
         score = len(matched_words) / len(query_words)
-        
+
         # Scale to 0-10
         final_score = round(score * 10, 2)
-        
-        reasoning = (
-            f"Found {len(matched_words)}/{len(query_words)} meaningful query terms in response. "
-            f"Terms found: {matched_words}"
-        )
 
         return EvaluationResult(
             score=final_score,
-            reasoning=reasoning,
+            reasoning=self._reasoning(matched_words, len(query_words)),
             evaluator_name="RelevanceHeuristic"
         )
+
+    def evaluate_batch(self,
+                       queries: Sequence[str],
+                       responses: Sequence[str],
+                       references: Optional[Sequence[Optional[str]]] = None) -> BatchEvaluationResult:
+        # The same query is scored once per model x prompt, so extract its terms once
+        terms_by_query: Dict[str, List[str]] = {}
+        matched_counts = np.zeros(len(queries))
+        term_counts = np.zeros(len(queries))
+        reasons = []
+
+        for i, (query, response_text) in enumerate(zip(queries, responses)):
+            query_words = terms_by_query.get(query)
+            if query_words is None:
+                query_words = terms_by_query[query] = self.query_terms(query)
+            if not query_words:
+                reasons.append("Query contained only stop words or was empty.")
+                continue
+
+            matched_words = self.matched_terms(query_words, response_text)
+            matched_counts[i] = len(matched_words)
+            term_counts[i] = len(query_words)
+            reasons.append(self._reasoning(matched_words, len(query_words)))
+
+        has_terms = term_counts > 0
+        scores = np.full(len(queries), 0.5)
+        scores[has_terms] = np.round(matched_counts[has_terms] / term_counts[has_terms] * 10, 2)
+
+        return BatchEvaluationResult(
+            scores=scores.tolist(),
+            reasons=reasons,
+            evaluator_name="RelevanceHeuristic"
+        )
+
+    @staticmethod
+    def _reasoning(matched_words: List[str], total: int) -> str:
+        return (
+            f"Found {len(matched_words)}/{total} meaningful query terms in response. "
+            f"Terms found: {matched_words}"
+        )
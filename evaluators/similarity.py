@@ -0,0 +1,134 @@
+import math
+import re
+from collections import Counter
+from typing import FrozenSet, List, Sequence, Union
+import numpy as np
+
+TOKEN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.lower())
+
+def token_f1(response: str, reference: str) -> float:
+    """Bag-of-tokens F1 (SQuAD style). Linear in the combined length."""
+    pred, gold = tokenize(response), tokenize(reference)
+    if not pred or not gold:
+        return float(pred == gold)
+    overlap = sum((Counter(pred) & Counter(gold)).values())
+    if overlap == 0:
+        return 0.0
+    precision, recall = overlap / len(pred), overlap / len(gold)
+    return 2 * precision * recall / (precision + recall)
+
+def lcs_length(a: Sequence[str], b: Sequence[str]) -> int:
+    """
+    Longest common subsequence length via the bit-parallel algorithm (Allison-Dix /
+    Hyyro): one big-integer update per token of `a`, each costing O(len(b) / 64)
+    machine words, instead of the O(len(a) * len(b)) Python-level DP table.
+    """
+    if not a or not b:
+        return 0
+    masks = {}
+    for i, tok in enumerate(b):
+        masks[tok] = masks.get(tok, 0) | (1 << i)
+    full = (1 << len(b)) - 1
+    v = full
+    for tok in a:
+        u = v & masks.get(tok, 0)
+        v = ((v + u) | (v - u)) & full
+    return len(b) - bin(v).count("1")
+
+def rouge_l(response: str, reference: str) -> float:
+    """ROUGE-L F-measure over word tokens."""
+    pred, gold = tokenize(response), tokenize(reference)
+    if not pred or not gold:
+        return float(pred == gold)
+    lcs = lcs_length(pred, gold)
+    if lcs == 0:
+        return 0.0
+    precision, recall = lcs / len(pred), lcs / len(gold)
+    return 2 * precision * recall / (precision + recall)
+
+# Code points (+1, so no character packs to zero) fit in 21 bits: up to three
+# characters pack exactly into one int64
+_CODE_POINT_BITS = 21
+_MAX_PACKED_NGRAM = 63 // _CODE_POINT_BITS
+
+NgramSet = Union[np.ndarray, FrozenSet[str]]
+
+def char_ngrams(text: str, n: int = 3) -> NgramSet:
+    """
+    Distinct character n-grams of `text`, lowercased with whitespace runs collapsed.
+
+    For n <= 3 each n-gram is packed losslessly into an int64 and the result is a
+    sorted array of unique codes, built and intersected in NumPy rather than by
+    slicing thousands of Python strings; longer n-grams fall back to a frozenset.
+    """
+    text = " ".join(text.lower().split())
+    if n > _MAX_PACKED_NGRAM:
+        if len(text) < n:
+            return frozenset({text} if text else ())
+        return frozenset(text[i:i + n] for i in range(len(text) - n + 1))
+    points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64) + 1
+    if len(points) < n:
+        # A text shorter than n is its own single n-gram
+        n = len(points)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+    count = len(points) - n + 1
+    codes = points[:count].copy()
+    for j in range(1, n):
+        codes = (codes << _CODE_POINT_BITS) | points[j:j + count]
+    return np.unique(codes)
+
+def jaccard(a: NgramSet, b: NgramSet) -> float:
+    """Exact Jaccard similarity of two char_ngrams() results; two empty sets are identical."""
+    if not len(a) or not len(b):
+        return float(not len(a) and not len(b))
+    if isinstance(a, np.ndarray):
+        overlap = int(np.isin(a, b, assume_unique=True).sum())
+    else:
+        overlap = len(a & b)
+    return overlap / (len(a) + len(b) - overlap)
+
+# Smoothed IDF (as in sklearn's TfidfVectorizer) of a term in one of the two texts of a pair;
+# a term in both gets ln(3/3) + 1 = 1
+_PAIR_IDF_ONE = math.log(3 / 2) + 1
+
+def tfidf_cosine(response: str, reference: str) -> float:
+    """
+    Cosine similarity of the TF-IDF vectors of one response/reference pair, with the
+    IDF taken over just the two texts. Linear in their combined length, and a pair's
+    score never depends on what else is scored alongside it.
+    """
+    a, b = Counter(tokenize(response)), Counter(tokenize(reference))
+    if not a or not b:
+        return 0.0
+    dot = sum(n * b[t] for t, n in a.items() if t in b)
+    if dot == 0:
+        return 0.0
+    norm_a = math.sqrt(sum((n * (1.0 if t in b else _PAIR_IDF_ONE)) ** 2 for t, n in a.items()))
+    norm_b = math.sqrt(sum((n * (1.0 if t in a else _PAIR_IDF_ONE)) ** 2 for t, n in b.items()))
+    return dot / (norm_a * norm_b)
+
+class TfidfCorpus:
+    """
+    TF-IDF cosine with the vocabulary and IDF fitted once on a fixed corpus (e.g. the
+    dataset's reference answers), so scores are comparable across rows and runs.
+    Terms outside the corpus vocabulary are ignored. Sparse and linear in the total text length.
+    """
+
+    def __init__(self, documents: Sequence[str]):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.vectorizer = TfidfVectorizer(token_pattern=r"(?u)\b\w+\b")
+        self.vectorizer.fit(documents)
+
+    def cosine(self, responses: Sequence[str], references: Sequence[str]) -> np.ndarray:
+        """Row-wise cosine between responses[i] and references[i]."""
+        if len(responses) == 0:
+            return np.zeros(0)
+        # Rows are L2-normalised, so the cosine is the row-wise dot product
+        res = self.vectorizer.transform(responses)
+        ref = self.vectorizer.transform(references)
+        return np.asarray(res.multiply(ref).sum(axis=1)).ravel()
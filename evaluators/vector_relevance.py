@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+import numpy as np
+from .base import BaseEvaluator, EvaluationResult, BatchEvaluationResult
+
+class HashingEmbedder:
+    """
+    Local, CPU-only text embeddings: hashed n-gram counts projected into a fixed
+    number of dimensions and L2-normalised. Stateless (nothing to fit or download),
+    so the same text always maps to the same vector in every process.
+    """
+
+    def __init__(self, dims: int = 2048, analyzer: str = "word", ngram_range=(1, 2)):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.dims = dims
+        self._vectorizer = HashingVectorizer(
+            n_features=dims,
+            analyzer=analyzer,
+            ngram_range=tuple(ngram_range),
+            alternate_sign=False,
+            norm="l2",
+            lowercase=True,
+        )
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dims), dtype=np.float32)
+        return self._vectorizer.transform(texts).toarray().astype(np.float32)
+
+class EmbeddingCache:
+    """
+    LRU cache of text -> embedding in front of an embedder. Only texts not already
+    cached are embedded, in one batch call.
+    """
+
+    def __init__(self, embedder: HashingEmbedder, max_entries: int = 100_000):
+        self.embedder = embedder
+        self.max_entries = max_entries
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        missing = list(dict.fromkeys(t for t in texts if t not in self._vectors))
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+        if missing:
+            for text, vector in zip(missing, self.embedder.embed(missing)):
+                self._vectors[text] = vector
+        out = np.empty((len(texts), self.embedder.dims), dtype=np.float32)
+        for i, text in enumerate(texts):
+            out[i] = self._vectors[text]
+            self._vectors.move_to_end(text)
+        while len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
+        return out
+
+def rowwise_cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Cosine similarity of a[i] and b[i] for L2-normalised rows."""
+    return np.einsum("ij,ij->i", a, b)
+
+class VectorRelevanceEvaluator(BaseEvaluator):
+    """
+    Embedding-based relevance evaluator.
+    Scores the cosine similarity between the response and the query, blended with the
+    similarity to the reference answer when one is provided.
+
+    Config:
+        dims, analyzer, ngram_range: HashingEmbedder settings.
+        query_weight: share of the score from query similarity when a reference exists (default 0.5).
+        cache_size: number of query/reference embeddings kept across batches.
+    """
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.embedder = HashingEmbedder(
+            dims=self.config.get("dims", 2048),
+            analyzer=self.config.get("analyzer", "word"),
+            ngram_range=self.config.get("ngram_range", (1, 2)),
+        )
+        # Queries and references repeat for every model x prompt; responses rarely do
+        self.cache = EmbeddingCache(self.embedder, self.config.get("cache_size", 100_000))
+        self.query_weight = self.config.get("query_weight", 0.5)
+
+    def evaluate(self, query: str, response_text: str, reference_answer: Optional[str] = None) -> EvaluationResult:
+        batch = self.evaluate_batch([query], [response_text], [reference_answer])
+        return EvaluationResult(
+            score=batch.scores[0],
+            reasoning=batch.reasons[0],
+            evaluator_name=batch.evaluator_name
+        )
+
+    def evaluate_batch(self,
+                       queries: Sequence[str],
+                       responses: Sequence[str],
+                       references: Optional[Sequence[Optional[str]]] = None) -> BatchEvaluationResult:
+        if references is None:
+            references = [None] * len(queries)
+        has_ref = np.array([bool(r) for r in references], dtype=bool)
+
+        q_vecs = self.cache.embed(list(queries))
+        r_vecs = self.embedder.embed(list(responses))
+        ref_vecs = self.cache.embed([r or "" for r in references])
+
+        query_sim = np.clip(rowwise_cosine(q_vecs, r_vecs), 0.0, 1.0)
+        ref_sim = np.clip(rowwise_cosine(ref_vecs, r_vecs), 0.0, 1.0)
+        blended = np.where(has_ref, self.query_weight * query_sim + (1 - self.query_weight) * ref_sim, query_sim)
+        scores = np.round(blended * 10, 2)
+
+        reasons: List[str] = [
+            f"Cosine similarity to query: {q:.2f}, to reference: {r:.2f}" if has
+            else f"Cosine similarity to query: {q:.2f}"
+            for q, r, has in zip(query_sim.tolist(), ref_sim.tolist(), has_ref.tolist())
+        ]
+
+        return BatchEvaluationResult(
+            scores=scores.tolist(),
+            reasons=reasons,
+            evaluator_name="VectorRelevance"
+        )
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field
+import asyncio
 import time
 
 class TokenUsage(BaseModel):
@@ -15,6 +16,7 @@ class LLMResponse(BaseModel):
     latency_ms: float = 0.0
     model_name: str
     error: Optional[str] = None
+    retryable: bool = False  # transient error (rate limit, timeout, 5xx) worth retrying
 
 class BaseModelClient(ABC):
     """
@@ -25,6 +27,8 @@ class BaseModelClient(ABC):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.model_name = config.get("model_name", "unknown-model")
+        # Provider payloads are large and mostly duplicate `content`; keep them only on request
+        self.keep_raw_response = config.get("keep_raw_response", False)
 
     @abstractmethod
     def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
@@ -40,3 +44,12 @@ class BaseModelClient(ABC):
             LLMResponse object containing text, usage metrics, and latency.
         """
         pass
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        """
+        Async counterpart of `generate()`.
+
+        The default runs the blocking `generate()` in a worker thread so third-party
+        clients work unchanged; clients with a native async transport should override it.
+        """
+        return await asyncio.to_thread(self.generate, prompt, system_prompt, **kwargs)
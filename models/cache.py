@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+from .base_model import BaseModelClient, LLMResponse
+
+CACHE_MODES = ("read_through", "write_only", "refresh", "off")
+
+def cache_key(config: Dict[str, Any], prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
+    """
+    Content address of a generation: everything that can change the model output.
+    """
+    payload = {
+        "model_name": config.get("model_name"),
+        "temperature": kwargs.pop("temperature", config.get("temperature")),
+        "max_tokens": kwargs.pop("max_tokens", config.get("max_tokens")),
+        "system_prompt": system_prompt,
+        "prompt": prompt,
+        "params": kwargs,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    Persistent SQLite store of complete LLMResponse objects keyed by `cache_key`.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = None, max_age_days: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        # Generous lock timeout: shard processes on one machine may share the cache file
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return LLMResponse.model_validate_json(row[0])
+
+    def put(self, key: str, response: LLMResponse, overwrite: bool = True):
+        verb = "INSERT OR REPLACE" if overwrite else "INSERT OR IGNORE"
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                f"{verb} INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response.model_dump_json(), now, now)
+            )
+            self.writes += cur.rowcount
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def evict(self) -> int:
+        """
+        Drops entries older than `max_age_days`, then the least recently used
+        entries beyond `max_entries`. Returns the number of entries removed.
+        """
+        removed = 0
+        with self._lock:
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self._conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,)).rowcount
+            if self.max_entries is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM responses WHERE key NOT IN ("
+                    " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?)",
+                    (self.max_entries,)
+                ).rowcount
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class CachedModelClient(BaseModelClient):
+    """
+    Wraps another client with a ResponseCache.
+
+    Modes:
+        read_through: serve hits from the cache, generate and store misses.
+        write_only:   always generate, store responses not already cached.
+        refresh:      always generate, overwrite cached responses.
+        off:          bypass the cache entirely.
+
+    Responses with an `error` are never cached.
+    """
+
+    def __init__(self, client: BaseModelClient, cache: ResponseCache, mode: str = "read_through"):
+        super().__init__(client.config)
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}. Expected one of {CACHE_MODES}")
+        self.client = client
+        self.cache = cache
+        self.mode = mode
+        self.model_name = client.model_name
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        if self.mode == "off":
+            return self.client.generate(prompt, system_prompt, **kwargs)
+
+        key = cache_key(self.config, prompt, system_prompt, **kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        response = self.client.generate(prompt, system_prompt, **kwargs)
+        self._store(key, response)
+        return response
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        if self.mode == "off":
+            return await self.client.agenerate(prompt, system_prompt, **kwargs)
+
+        key = cache_key(self.config, prompt, system_prompt, **kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        response = await self.client.agenerate(prompt, system_prompt, **kwargs)
+        self._store(key, response)
+        return response
+
+    def _lookup(self, key: str) -> Optional[LLMResponse]:
+        if self.mode != "read_through":
+            return None
+        return self.cache.get(key)
+
+    def _store(self, key: str, response: LLMResponse):
+        if response.error:
+            return
+        self.cache.put(key, response, overwrite=self.mode != "write_only")
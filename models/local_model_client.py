@@ -1,21 +1,40 @@
+import asyncio
 import time
 import random
 from typing import Dict, Any, Optional
 from .base_model import BaseModelClient, LLMResponse, TokenUsage
+from .tokens import get_counter
 
 class LocalModelClient(BaseModelClient):
     """
-    A local mock model client for testing, debugging, and development 
+    A local mock model client for testing, debugging, and development
     without incurring API costs or requiring internet access.
+    Token usage is counted with the offline tokenizer named by `tokenizer` in its config.
     """
 
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.counter = get_counter(self.config.get("tokenizer"))
+
     def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
         start_time = time.perf_counter()
-        
+
         # Simulate processing time based on config or random
         latency_sim = self.config.get("latency_ms", 50) / 1000.0
         time.sleep(latency_sim)
-        
+
+        return self._build_response(prompt, start_time)
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        start_time = time.perf_counter()
+
+        # Same simulated latency, but without holding a thread
+        latency_sim = self.config.get("latency_ms", 50) / 1000.0
+        await asyncio.sleep(latency_sim)
+
+        return self._build_response(prompt, start_time)
+
+    def _build_response(self, prompt: str, start_time: float) -> LLMResponse:
         # Deterministic dummy response logic
         # We'll just echo parts of the prompt to simulate "relevance"
         response_text = (
@@ -25,17 +44,18 @@ class LocalModelClient(BaseModelClient):
         )
 
         end_time = time.perf_counter()
-        
-        # Mock usage
+
+        prompt_tokens = self.counter.count(prompt)
+        completion_tokens = self.counter.count(response_text)
         usage = TokenUsage(
-            prompt_tokens=len(prompt) // 4,
-            completion_tokens=len(response_text) // 4,
-            total_tokens=(len(prompt) + len(response_text)) // 4
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
         )
-        
+
         return LLMResponse(
             content=response_text,
-            raw_response={"mock_id": "local-123"},
+            raw_response={"mock_id": "local-123"} if self.keep_raw_response else {},
             token_usage=usage,
             latency_ms=(end_time - start_time) * 1000,
             model_name=self.model_name
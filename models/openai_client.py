@@ -1,37 +1,120 @@
+import asyncio
 import os
+import threading
 import time
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from .base_model import BaseModelClient, LLMResponse, TokenUsage
 
-try:
-    from openai import OpenAI, OpenAIError
-except ImportError:
-    OpenAI = None
-    OpenAIError = Exception
+@lru_cache(maxsize=None)
+def _sdk():
+    """The `openai` package, imported on first use (it takes about half a second); None if not installed."""
+    try:
+        import openai
+    except ImportError:
+        return None
+    return openai
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS = {408, 409, 429}
+
+def is_retryable(e: Exception) -> bool:
+    sdk = _sdk()
+    if sdk is None:
+        return False
+    if isinstance(e, sdk.APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(e, sdk.APIStatusError):
+        return e.status_code in RETRYABLE_STATUS or e.status_code >= 500
+    return False
+
+# One pooled AsyncOpenAI per API key and endpoint: its HTTP connection pool is shared by
+# every OpenAIClient with those settings. Pools are bound to the event loop they were
+# created on, so a new client is built when a different loop asks for one.
+_ASYNC_CLIENTS: Dict[Tuple[Any, ...], Tuple[Any, Any]] = {}
+_ASYNC_CLIENTS_LOCK = threading.Lock()
+
+def _shared_async_client(api_key: str, max_retries: int, base_url: Optional[str] = None, timeout: Optional[float] = None):
+    loop = asyncio.get_running_loop()
+    key = (api_key, max_retries, base_url, timeout)
+    with _ASYNC_CLIENTS_LOCK:
+        cached = _ASYNC_CLIENTS.get(key)
+        if cached is None or cached[0] is not loop:
+            cached = (loop, _sdk().AsyncOpenAI(**_client_kwargs(api_key, max_retries, base_url, timeout)))
+            _ASYNC_CLIENTS[key] = cached
+    return cached[1]
+
+def _client_kwargs(api_key: str, max_retries: int, base_url: Optional[str], timeout: Optional[float]) -> Dict[str, Any]:
+    kwargs = {"api_key": api_key, "max_retries": max_retries}
+    if base_url:
+        kwargs["base_url"] = base_url
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    return kwargs
 
 class OpenAIClient(BaseModelClient):
     """
-    Client for OpenAI's Chat Completions API.
-    Requires 'openai' package and an API Key.
+    Client for OpenAI's Chat Completions API, or any compatible server via `base_url`
+    (e.g. scripts/mock_openai_server.py). Requires 'openai' package and an API Key;
+    with a `base_url` and no key set, a placeholder key is sent.
     """
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         api_key_env = config.get("api_key_env", "OPENAI_API_KEY")
-        self.api_key = os.getenv(api_key_env)
+        self.base_url = config.get("base_url")
+        self.api_key = os.getenv(api_key_env) or ("not-needed" if self.base_url else None)
+        # SDK-level retries; set to 0 when a `rate_limit` scheduler handles retries
+        self.sdk_max_retries = config.get("sdk_max_retries", 2)
+        self.timeout_s = config.get("timeout_s")
+        # Stream completions and join the chunks (exercises the SSE path; usage comes from the final chunk)
+        self.stream = config.get("stream", False)
         self.client = None
-        
-        if self.api_key and OpenAI:
-            self.client = OpenAI(api_key=self.api_key)
-        
+
+        sdk = _sdk() if self.api_key else None
+        if sdk is not None:
+            self.client = sdk.OpenAI(**_client_kwargs(self.api_key, self.sdk_max_retries, self.base_url, self.timeout_s))
+
     def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
         if not self.client:
-           return LLMResponse(
-               content="",
-               model_name=self.model_name,
-               error="OpenAI client not initialized. Check OPENAI_API_KEY and 'openai' package."
-           )
+           return self._not_initialized()
+
+        messages, model_params = self._build_request(prompt, system_prompt, **kwargs)
+        start_time = time.perf_counter()
+
+        try:
+            response = self.client.chat.completions.create(
+                messages=messages,
+                **model_params
+            )
+            if self.stream:
+                return self._join_stream(list(response), start_time)
+            return self._to_llm_response(response, start_time)
+
+        except Exception as e:
+            return self._error_response(e, start_time)
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        if not self.client:
+            return self._not_initialized()
 
+        client = _shared_async_client(self.api_key, self.sdk_max_retries, self.base_url, self.timeout_s)
+        messages, model_params = self._build_request(prompt, system_prompt, **kwargs)
+        start_time = time.perf_counter()
+
+        try:
+            response = await client.chat.completions.create(
+                messages=messages,
+                **model_params
+            )
+            if self.stream:
+                return self._join_stream([chunk async for chunk in response], start_time)
+            return self._to_llm_response(response, start_time)
+
+        except Exception as e:
+            return self._error_response(e, start_time)
+
+    def _build_request(self, prompt: str, system_prompt: Optional[str], **kwargs) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -41,40 +124,62 @@ class OpenAIClient(BaseModelClient):
             "model": self.config.get("model_name", "gpt-3.5-turbo"),
             "temperature": self.config.get("temperature", 0.7),
             "max_tokens": self.config.get("max_tokens", 1024),
-            **kwargs 
+            **kwargs
         }
+        if self.stream:
+            model_params.update(stream=True, stream_options={"include_usage": True})
+        return messages, model_params
 
-        start_time = time.perf_counter()
-        
-        try:
-            response = self.client.chat.completions.create(
-                messages=messages,
-                **model_params
-            )
-            
-            end_time = time.perf_counter()
-            content = response.choices[0].message.content
-            
-            # Extract usage
-            u = response.usage
-            usage = TokenUsage(
-                prompt_tokens=u.prompt_tokens,
-                completion_tokens=u.completion_tokens,
-                total_tokens=u.total_tokens
-            )
-            
-            return LLMResponse(
-                content=content,
-                raw_response=response.model_dump(),
-                token_usage=usage,
-                latency_ms=(end_time - start_time) * 1000,
-                model_name=self.model_name
-            )
+    def _to_llm_response(self, response, start_time: float) -> LLMResponse:
+        end_time = time.perf_counter()
+        content = response.choices[0].message.content
 
-        except Exception as e:
-            return LLMResponse(
-                content="",
-                model_name=self.model_name,
-                error=str(e),
-                latency_ms=(time.perf_counter() - start_time) * 1000
-            )
+        # Extract usage
+        u = response.usage
+        usage = TokenUsage(
+            prompt_tokens=u.prompt_tokens,
+            completion_tokens=u.completion_tokens,
+            total_tokens=u.total_tokens
+        )
+
+        return LLMResponse(
+            content=content,
+            raw_response=response.model_dump() if self.keep_raw_response else {},
+            token_usage=usage,
+            latency_ms=(end_time - start_time) * 1000,
+            model_name=self.model_name
+        )
+
+    def _join_stream(self, chunks: List[Any], start_time: float) -> LLMResponse:
+        end_time = time.perf_counter()
+        content = "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+        u = next((c.usage for c in reversed(chunks) if c.usage), None)
+        usage = TokenUsage(
+            prompt_tokens=u.prompt_tokens,
+            completion_tokens=u.completion_tokens,
+            total_tokens=u.total_tokens
+        ) if u else TokenUsage()
+
+        return LLMResponse(
+            content=content,
+            raw_response={"chunks": [c.model_dump() for c in chunks]} if self.keep_raw_response else {},
+            token_usage=usage,
+            latency_ms=(end_time - start_time) * 1000,
+            model_name=self.model_name
+        )
+
+    def _error_response(self, e: Exception, start_time: float) -> LLMResponse:
+        return LLMResponse(
+            content="",
+            model_name=self.model_name,
+            error=str(e),
+            retryable=is_retryable(e),
+            latency_ms=(time.perf_counter() - start_time) * 1000
+        )
+
+    def _not_initialized(self) -> LLMResponse:
+        return LLMResponse(
+            content="",
+            model_name=self.model_name,
+            error="OpenAI client not initialized. Check OPENAI_API_KEY and 'openai' package."
+        )
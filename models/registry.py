@@ -0,0 +1,28 @@
+import importlib
+from typing import Any, Dict, Union
+
+# provider name -> client class, or "module:Class" imported the first time the provider is used
+PROVIDERS: Dict[str, Union[str, type]] = {
+    "openai": "models.openai_client:OpenAIClient",
+    "local": "models.local_model_client:LocalModelClient",
+}
+
+def load_object(target: Union[str, Any]) -> Any:
+    """Resolves a "package.module:attr" string by importing the module; other values are returned as-is."""
+    if not isinstance(target, str):
+        return target
+    module, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+def register_provider(name: str, client: Union[str, type]):
+    """Adds a provider that models.yaml entries can select with `provider: <name>`."""
+    PROVIDERS[name] = client
+
+def get_provider(name: str) -> type:
+    """Client class for a registered provider, or for a "module:Class" path given as the provider."""
+    target = PROVIDERS.get(name)
+    if target is None and name and ":" in name:
+        target = name
+    if target is None:
+        raise ValueError(f"Unknown model provider: {name}")
+    return load_object(target)
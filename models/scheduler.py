@@ -0,0 +1,158 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, Any, Optional
+from .base_model import BaseModelClient, LLMResponse
+from .tokens import TokenCounter, get_counter
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `per_minute` tokens per minute.
+
+    `reserve()` deducts immediately (the balance may go negative) and returns how long
+    the caller must wait, so concurrent callers queue fairly without holding the lock
+    while they sleep.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def refund(self, amount: float):
+        """Returns over-reserved tokens (e.g. when actual usage was below the estimate)."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+# Buckets are shared by every client that names the same budget, so several models
+# on one provider account can draw from one RPM/TPM limit.
+_BUCKETS: Dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+def get_bucket(name: str, per_minute: float) -> TokenBucket:
+    with _BUCKETS_LOCK:
+        if name not in _BUCKETS:
+            _BUCKETS[name] = TokenBucket(per_minute)
+        return _BUCKETS[name]
+
+def estimate_prompt_tokens(prompt: str, system_prompt: Optional[str] = None, counter: Optional[TokenCounter] = None) -> int:
+    """Pre-send estimate with the model's offline tokenizer, plus one token of slack."""
+    return (counter or get_counter()).count_prompt(prompt, system_prompt) + 1
+
+class ScheduledModelClient(BaseModelClient):
+    """
+    Wraps another client with RPM/TPM budgets and retries.
+
+    Before each request it reserves one request from the RPM bucket and the
+    estimated prompt tokens plus `max_tokens` from the TPM bucket, waiting if either
+    budget is exhausted; unused tokens are refunded once usage is known. Responses
+    flagged `retryable` (429, timeouts, 5xx) are retried with full-jitter
+    exponential backoff.
+
+    Config (the `rate_limit` section of a models.yaml entry):
+        rpm, tpm: budgets per minute (omit to leave unlimited).
+        bucket: budget name to share across models (default: provider:model_name).
+        max_retries, base_backoff_s, max_backoff_s: retry policy.
+    """
+
+    def __init__(self, client: BaseModelClient, rate_limit: Dict[str, Any]):
+        super().__init__(client.config)
+        self.client = client
+        self.model_name = client.model_name
+
+        bucket = rate_limit.get("bucket", f"{client.config.get('provider')}:{client.model_name}")
+        self.rpm = get_bucket(f"{bucket}:rpm", rate_limit["rpm"]) if rate_limit.get("rpm") else None
+        self.tpm = get_bucket(f"{bucket}:tpm", rate_limit["tpm"]) if rate_limit.get("tpm") else None
+        self.max_retries = rate_limit.get("max_retries", 3)
+        self.base_backoff_s = rate_limit.get("base_backoff_s", 1.0)
+        self.max_backoff_s = rate_limit.get("max_backoff_s", 60.0)
+        self.counter = get_counter(client.config.get("tokenizer"))
+
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.throttle_s = 0.0
+        self.backoff_s = 0.0
+        self._stats_lock = threading.Lock()
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        attempt = 0
+        while True:
+            reserved, wait = self._reserve(prompt, system_prompt, kwargs)
+            if wait:
+                time.sleep(wait)
+            response = self.client.generate(prompt, system_prompt, **kwargs)
+            delay = self._after_response(response, reserved, attempt)
+            if delay is None:
+                return response
+            time.sleep(delay)
+            attempt += 1
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        attempt = 0
+        while True:
+            reserved, wait = self._reserve(prompt, system_prompt, kwargs)
+            if wait:
+                await asyncio.sleep(wait)
+            response = await self.client.agenerate(prompt, system_prompt, **kwargs)
+            delay = self._after_response(response, reserved, attempt)
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _reserve(self, prompt: str, system_prompt: Optional[str], kwargs: Dict[str, Any]):
+        wait = 0.0
+        reserved = 0
+        if self.rpm:
+            wait = max(wait, self.rpm.reserve(1))
+        if self.tpm:
+            max_tokens = kwargs.get("max_tokens", self.config.get("max_tokens", 0)) or 0
+            reserved = estimate_prompt_tokens(prompt, system_prompt, self.counter) + max_tokens
+            wait = max(wait, self.tpm.reserve(reserved))
+        with self._stats_lock:
+            self.requests += 1
+            self.throttle_s += wait
+        return reserved, wait
+
+    def _after_response(self, response: LLMResponse, reserved: int, attempt: int) -> Optional[float]:
+        """Settles the TPM reservation; returns a backoff delay if the request should be retried."""
+        if self.tpm and reserved:
+            used = response.token_usage.total_tokens if not response.error else 0
+            if used < reserved:
+                self.tpm.refund(reserved - used)
+
+        if not (response.error and response.retryable):
+            return None
+        if attempt >= self.max_retries:
+            with self._stats_lock:
+                self.failures += 1
+            return None
+
+        delay = random.uniform(0, min(self.max_backoff_s, self.base_backoff_s * 2 ** attempt))
+        with self._stats_lock:
+            self.retries += 1
+            self.backoff_s += delay
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "throttle_s": round(self.throttle_s, 3),
+            "backoff_s": round(self.backoff_s, 3),
+        }
@@ -0,0 +1,107 @@
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+class Tokenizer(ABC):
+    """Offline token counter. Subclasses only need `count`."""
+
+    name = "base"
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        pass
+
+class CharTokenizer(Tokenizer):
+    """The classic ~4 characters per token heuristic."""
+
+    name = "chars"
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return int(len(text) // self.chars_per_token)
+
+class RegexTokenizer(Tokenizer):
+    """
+    Approximates GPT-style BPE without a vocabulary: text is split with the same kind
+    of pre-tokenizer regex BPE tokenizers use (words with their leading space, short
+    digit runs, punctuation runs, whitespace), then long pieces are charged extra,
+    since BPE vocabularies cover common words whole but break up rare long ones.
+    """
+
+    name = "regex"
+
+    PIECES = re.compile(r"'(?:s|t|re|ve|m|ll|d)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+(?!\S)|\s+")
+
+    def __init__(self, chars_per_piece: int = 10):
+        self.chars_per_piece = chars_per_piece
+
+    def count(self, text: str) -> int:
+        total = 0
+        for piece in self.PIECES.findall(text):
+            length = len(piece.strip()) or 1
+            total += max(1, math.ceil(length / self.chars_per_piece))
+        return total
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact counts for OpenAI models via `tiktoken` (its BPE files must be cached locally)."""
+
+    name = "tiktoken"
+
+    def __init__(self, encoding: str = "cl100k_base"):
+        try:
+            import tiktoken
+        except ImportError as e:
+            raise ImportError("The 'tiktoken' tokenizer needs the 'tiktoken' package: pip install tiktoken") from e
+        self._encoding = tiktoken.get_encoding(encoding)
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+DEFAULT_TOKENIZER = "regex"
+
+# name -> factory(argument or None); "tiktoken:o200k_base" passes "o200k_base"
+TOKENIZERS: Dict[str, Callable[[Optional[str]], Tokenizer]] = {
+    "chars": lambda arg: CharTokenizer(float(arg)) if arg else CharTokenizer(),
+    "regex": lambda arg: RegexTokenizer(int(arg)) if arg else RegexTokenizer(),
+    "tiktoken": lambda arg: TiktokenTokenizer(arg) if arg else TiktokenTokenizer(),
+}
+
+def register_tokenizer(name: str, factory: Callable[[Optional[str]], Tokenizer]):
+    """Adds a tokenizer that models.yaml entries can select with `tokenizer: <name>[:<arg>]`."""
+    TOKENIZERS[name] = factory
+
+class TokenCounter:
+    """A tokenizer with an LRU cache of counts; prompts and references repeat across models and rows."""
+
+    def __init__(self, tokenizer: Tokenizer, max_entries: int = 65536):
+        self.tokenizer = tokenizer
+        self.count = lru_cache(maxsize=max_entries)(tokenizer.count)
+
+    def count_prompt(self, prompt: str, system_prompt: Optional[str] = None) -> int:
+        return self.count(prompt) + (self.count(system_prompt) if system_prompt else 0)
+
+_COUNTERS: Dict[str, TokenCounter] = {}
+_COUNTERS_LOCK = threading.Lock()
+
+def get_counter(spec: Optional[str] = None) -> TokenCounter:
+    """Shared TokenCounter for a `name[:arg]` spec (default: the regex approximation)."""
+    spec = spec or DEFAULT_TOKENIZER
+    with _COUNTERS_LOCK:
+        if spec not in _COUNTERS:
+            name, _, arg = spec.partition(":")
+            if name not in TOKENIZERS:
+                raise ValueError(f"Unknown tokenizer: {name} (available: {sorted(TOKENIZERS)})")
+            _COUNTERS[spec] = TokenCounter(TOKENIZERS[name](arg or None))
+        return _COUNTERS[spec]
+
+def estimate_cost(pricing: Optional[Dict], prompt_tokens: int, completion_tokens: int) -> float:
+    """USD cost from a models.yaml `pricing` block (prices per 1k tokens)."""
+    if not pricing:
+        return 0.0
+    return (prompt_tokens * pricing.get("prompt_per_1k", 0.0)
+            + completion_tokens * pricing.get("completion_per_1k", 0.0)) / 1000
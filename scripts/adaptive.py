@@ -0,0 +1,110 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scripts.stats import sign_flip_pvalue
+
+Arm = Tuple[str, str]  # (model, prompt_source)
+
+def shuffled_order(n: int, seed: Optional[int]) -> np.ndarray:
+    """Seeded query order, so adaptive runs are reproducible and rounds are unbiased samples."""
+    return np.random.default_rng(seed).permutation(n)
+
+class RunningStats:
+    """Streaming count/mean/variance (Welford), updated round by round."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, value: float):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+class AdaptiveSampler:
+    """
+    Tracks per-(model, prompt) arms over rounds of shuffled queries and retires arms
+    that the current leader beats with a paired sign-flip test on the queries both
+    have answered. The error budget (1 - confidence) is split across every round and
+    comparison (Bonferroni), so an arm is only dropped when it is clearly dominated.
+    """
+
+    def __init__(self, arms: Sequence[Arm], total_queries: int, round_size: int = 20, confidence: float = 0.95,
+                 min_rounds: int = 2, n_resamples: int = 2000, seed: Optional[int] = None):
+        self.arms = list(arms)
+        self.active: List[Arm] = list(arms)
+        self.total_queries = total_queries
+        self.round_size = max(1, round_size)
+        self.min_rounds = min_rounds
+        self.n_resamples = n_resamples
+        self.rounds = 0
+        max_rounds = max(1, math.ceil(total_queries / self.round_size))
+        self.alpha = (1 - confidence) / (max_rounds * max(1, len(self.arms) - 1))
+        self.stats: Dict[Arm, RunningStats] = {arm: RunningStats() for arm in self.arms}
+        self.scores: Dict[Arm, Dict[int, float]] = {arm: {} for arm in self.arms}
+        self.tokens: Dict[Arm, int] = {arm: 0 for arm in self.arms}
+        self.cost: Dict[Arm, float] = {arm: 0.0 for arm in self.arms}
+        self.dropped: Dict[Arm, int] = {}
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def done(self) -> bool:
+        return len(self.active) <= 1
+
+    def record(self, arm: Arm, query_index: int, score: float, tokens: int = 0, cost: float = 0.0):
+        self.scores[arm][query_index] = score
+        self.tokens[arm] += tokens
+        self.cost[arm] += cost
+        if score == score:  # NaN scores (no evaluator ran) do not move the statistics
+            self.stats[arm].update(score)
+
+    def leader(self) -> Arm:
+        return max(self.active, key=lambda arm: self.stats[arm].mean)
+
+    def end_round(self) -> List[Arm]:
+        """Closes a round and returns the arms dropped as dominated."""
+        self.rounds += 1
+        if self.rounds < self.min_rounds or self.done:
+            return []
+        best = self.leader()
+        dropped = []
+        for arm in self.active:
+            if arm == best:
+                continue
+            shared = self.scores[best].keys() & self.scores[arm].keys()
+            diffs = np.round([self.scores[best][q] - self.scores[arm][q] for q in shared], 2)
+            if len(diffs) and diffs.mean() > 0 and sign_flip_pvalue(diffs, self.n_resamples, self._rng) < self.alpha:
+                dropped.append(arm)
+        for arm in dropped:
+            self.active.remove(arm)
+            self.dropped[arm] = self.rounds
+        return dropped
+
+    def savings(self) -> Dict[str, float]:
+        """
+        Generations, tokens and cost avoided compared with running every arm on every
+        query. Skipped generations are priced at each arm's observed per-generation average.
+        """
+        generations = tokens = cost = 0.0
+        for arm in self.arms:
+            done = len(self.scores[arm])
+            skipped = self.total_queries - done
+            if done:
+                tokens += skipped * self.tokens[arm] / done
+                cost += skipped * self.cost[arm] / done
+            generations += skipped
+        full = self.total_queries * len(self.arms)
+        return {
+            "generations": int(generations),
+            "generations_pct": round(100 * generations / full, 1) if full else 0.0,
+            "tokens": int(round(tokens)),
+            "cost_usd": round(cost, 4),
+        }
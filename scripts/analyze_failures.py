@@ -1,71 +1,152 @@
 import pandas as pd
+import numpy as np
 import argparse
 import os
 import sys
+from typing import Dict, List, Optional
+
+import yaml
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.results_store import default_results_path, read_results, result_columns
+
+# Ordered rules: the first match wins, anything unmatched is "Other".
+# `pattern` is a case-insensitive regex on the response; `max_length` matches short responses.
+DEFAULT_CATEGORIES = [
+    {"name": "Refusal", "pattern": r"cannot|sorry"},
+    {"name": "Empty", "max_length": 4},
+]
+
+def load_analysis_config(path: Optional[str]) -> Dict:
+    """Reads the optional `analysis` section of an evaluation config."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return (yaml.safe_load(f) or {}).get("analysis", {})
+
+def metric_thresholds(score_cols: List[str], thresholds: Dict[str, float], default_threshold: float) -> np.ndarray:
+    """Threshold per score column; `thresholds` may be keyed by "score_safety" or just "safety"."""
+    return np.array([thresholds.get(c, thresholds.get(c[len("score_"):], default_threshold)) for c in score_cols], dtype=float)
+
+def failure_mask(df: pd.DataFrame, score_cols: List[str], limits: np.ndarray) -> pd.DataFrame:
+    """Boolean frame: True where a score is below its metric's threshold."""
+    return pd.DataFrame(df[score_cols].to_numpy(dtype=float) < limits, index=df.index, columns=score_cols)
+
+def failure_criteria(df: pd.DataFrame, mask: pd.DataFrame) -> pd.Series:
+    """Per-row "score_x (value), score_y (value)" strings, built column by column."""
+    criteria = pd.Series("", index=df.index)
+    for col in mask.columns:
+        part = (col + " (" + df[col].astype(str) + ")").where(mask[col], "")
+        joined = criteria + ", " + part
+        criteria = joined.where((criteria != "") & (part != ""), criteria + part)
+    return criteria
+
+def categorize(responses: pd.Series, categories: List[Dict]) -> pd.Series:
+    """Assigns each response the first matching category, or "Other"."""
+    text = responses.fillna("").astype(str).str.lower()
+    conditions, names = [], []
+    for cat in categories:
+        cond = np.zeros(len(text), dtype=bool)
+        if cat.get("pattern"):
+            cond |= text.str.contains(cat["pattern"], case=False, regex=True).to_numpy()
+        if cat.get("max_length") is not None:
+            cond |= (text.str.len() <= cat["max_length"]).to_numpy()
+        conditions.append(cond)
+        names.append(cat["name"])
+    return pd.Series(np.select(conditions, names, default="Other"), index=responses.index)
+
+def top_k_failures(failures: pd.DataFrame, severity: pd.Series, k: int) -> pd.DataFrame:
+    """The k most severe failures, found with a partial sort (argpartition) instead of sorting everything."""
+    if k >= len(failures):
+        return failures.iloc[np.argsort(-severity.to_numpy(), kind="stable")]
+    values = -severity.to_numpy()
+    top = np.argpartition(values, k - 1)[:k]
+    top = top[np.argsort(values[top], kind="stable")]
+    return failures.iloc[top]
 
 def analyze():
     parser = argparse.ArgumentParser(description="Analyze Prompt Evaluation Failures")
-    parser.add_argument("--results", default="results/results.csv", help="Path to results CSV")
-    parser.add_argument("--threshold", type=float, default=5.0, help="Score threshold for failure detection")
+    parser.add_argument("--results", default=None,
+                        help="Path to results CSV, JSON or Parquet dataset (default: where --config saves them)")
+    parser.add_argument("--experiment", default=None, help="Only analyze rows from this experiment (Parquet)")
+    parser.add_argument("--model", default=None, help="Only analyze rows from this model")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Score threshold for failure detection; overrides the config's default_threshold (default 5.0)")
+    parser.add_argument("--config", default="config/evaluation.yaml",
+                        help="Evaluation config whose `analysis` section sets per-metric thresholds and categories")
+    parser.add_argument("--top-k", type=int, default=None, help="Only print the K most severe failures")
     args = parser.parse_args()
+    args.results = args.results or default_results_path(args.config)
 
     if not os.path.exists(args.results):
         print(f"File not found: {args.results}")
         return
 
-    print(f"🔍 Analyzing Failures in {args.results} (Threshold < {args.threshold})")
-    
-    df = pd.read_csv(args.results)
-    
-    # Identify score columns
-    score_cols = [c for c in df.columns if c.startswith("score_")]
-    
-    failures = []
-    
-    for _, row in df.iterrows():
-        failed_criteria = []
-        for col in score_cols:
-            if row[col] < args.threshold:
-                failed_criteria.append(f"{col} ({row[col]})")
-        
-        if failed_criteria:
-            failures.append({
-                "model": row["model"],
-                "query": row["query"],
-                "response": row["response"],
-                "failures": ", ".join(failed_criteria)
-            })
-            
-    if not failures:
+    analysis_conf = load_analysis_config(args.config)
+    thresholds = analysis_conf.get("thresholds", {})
+    # An explicit flag beats the config, which beats the built-in default; per-metric thresholds still apply
+    default_threshold = args.threshold if args.threshold is not None else analysis_conf.get("default_threshold", 5.0)
+    categories = analysis_conf.get("categories", DEFAULT_CATEGORIES)
+
+    print(f"🔍 Analyzing Failures in {args.results} (Threshold < {default_threshold})")
+
+    # Identify score columns; text columns are only loaded once there are failures to show
+    columns = result_columns(args.results)
+    score_cols = [c for c in columns if c.startswith("score_")]
+    filters = []
+    if args.experiment:
+        filters.append(("experiment", "==", args.experiment))
+    if args.model:
+        filters.append(("model", "==", args.model))
+
+    df = read_results(args.results, columns=["model", "prompt_source", *score_cols], filters=filters)
+    if "prompt_source" not in df.columns:
+        df["prompt_source"] = "unknown"
+
+    limits = metric_thresholds(score_cols, thresholds, default_threshold)
+    mask = failure_mask(df, score_cols, limits)
+    failed = mask.any(axis=1)
+
+    if not failed.any():
         print("✅ No failures detected above threshold.")
         return
 
+    text = read_results(args.results, columns=["query", "response"], filters=filters)
+    text.index = df.index
+    failures = df.loc[failed, ["model", "prompt_source"]].join(text.loc[failed])
+    failures["failures"] = failure_criteria(df.loc[failed], mask.loc[failed])
+    failures["category"] = categorize(failures["response"], categories)
+
+    # Severity: total shortfall below threshold across failing metrics
+    shortfall = np.clip(limits - df.loc[failed, score_cols].to_numpy(dtype=float), 0, None)
+    severity = pd.Series(np.nansum(shortfall, axis=1), index=failures.index)
+
     print(f"⚠️ Found {len(failures)} failures:\n")
-    
-    for f in failures:
-        print(f"❌ Model: {f['model']}")
-        print(f"   Query: {f['query']}")
-        print(f"   Failures: {f['failures']}")
-        print(f"   Response Preview: {str(f['response'])[:100]}...")
+
+    shown = failures if args.top_k is None else top_k_failures(failures, severity, args.top_k)
+    if args.top_k is not None:
+        print(f"Showing the {len(shown)} most severe:\n")
+
+    for f in shown.itertuples(index=False):
+        print(f"❌ Model: {f.model} | Prompt: {f.prompt_source}")
+        print(f"   Query: {f.query}")
+        print(f"   Failures: {f.failures}")
+        print(f"   Response Preview: {str(f.response)[:100]}...")
         print("-" * 50)
-        
-    # Categorization logic (simple keyword based)
+
+    print("\n📉 Failures by Model & Prompt:")
+    failing_metrics = mask.loc[failed].groupby([failures["model"], failures["prompt_source"]]).sum()
+    failing_metrics.insert(0, "failed_rows", failures.groupby(["model", "prompt_source"]).size())
+    print(failing_metrics)
+
+    # Categorization logic (configurable regex / length rules)
     print("\n📊 Failure Categorization (Heuristic):")
-    cats = {"Refusal": 0, "Hallucination": 0, "Empty": 0, "Other": 0}
-    
-    for f in failures:
-        resp = str(f['response']).lower()
-        if "cannot" in resp or "sorry" in resp:
-            cats["Refusal"] += 1
-        elif len(resp) < 5:
-            cats["Empty"] += 1
-        # Hallucination is hard to detect without ground truth match failure, 
-        # but let's assume low accuracy score + high confidence (not implemented) 
-        # is hallucination. For now just "Other".
-        else:
-            cats["Other"] += 1
-            
-    print(cats)
+    names = [c["name"] for c in categories] + ["Other"]
+    cats = failures.groupby(["model", "prompt_source"])["category"].value_counts().unstack(fill_value=0)
+    print(cats.reindex(columns=names, fill_value=0))
+    print(failures["category"].value_counts().reindex(names, fill_value=0).to_dict())
 
 if __name__ == "__main__":
     analyze()
@@ -1,11 +1,32 @@
-import pandas as pd
+import numpy as np
 import argparse
 import os
+import sys
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.results_store import default_results_path, read_results, result_columns
+from scripts.utils import load_config
+from scripts.stats import (evaluator_weights, weighted_overall, paired_matrix, prompt_summary,
+                           compare_pairs, sequential_compare, format_pairs)
 
 def compare():
     parser = argparse.ArgumentParser(description="Compare Prompt Performance")
-    parser.add_argument("--results", default="results/results.csv", help="Path to results CSV")
+    parser.add_argument("--results", default=None,
+                        help="Path to results CSV, JSON or Parquet dataset (default: where --config saves them)")
+    parser.add_argument("--experiment", default=None, help="Only compare rows from this experiment (Parquet)")
+    parser.add_argument("--model", default=None, help="Only compare rows from this model")
+    parser.add_argument("--config", default="config/evaluation.yaml",
+                        help="Evaluation config whose evaluator weights define the overall score")
+    parser.add_argument("--bootstrap", type=int, default=10000, help="Bootstrap / permutation resamples")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level (family-wise across pairs)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for resampling")
+    parser.add_argument("--sequential", action="store_true",
+                        help="Stop as soon as one prompt significantly beats all others")
+    parser.add_argument("--looks", type=int, default=5, help="Interim analyses in --sequential mode")
     args = parser.parse_args()
+    args.results = args.results or default_results_path(args.config)
 
     if not os.path.exists(args.results):
         print(f"File not found: {args.results}")
@@ -13,30 +34,61 @@ def compare():
 
     print(f"⚖️  Comparing Prompts in {args.results}")
     
-    df = pd.read_csv(args.results)
-    
+    columns = result_columns(args.results)
+
     # Check if we have multiple prompts
-    if "prompt_source" not in df.columns:
+    if "prompt_source" not in columns:
         print("Error: 'prompt_source' column missing. Cannot compare prompts.")
         return
 
+    # Only the score columns (and the query, to pair rows) are read; response and reason text is never loaded
+    score_cols = [c for c in columns if c.startswith("score_")]
+    filters = []
+    if args.experiment:
+        filters.append(("experiment", "==", args.experiment))
+    if args.model:
+        filters.append(("model", "==", args.model))
+    df = read_results(args.results, columns=["prompt_source", "model", "query", *score_cols], filters=filters)
+
     # Group by Prompt Source and Model
-    score_cols = [c for c in df.columns if c.startswith("score_")]
     
     grouped = df.groupby(["prompt_source", "model"])[score_cols].mean()
     print("\n📈 Mean Scores by Prompt & Model:")
     print(grouped)
     
-    # Ranking logic
-    # Calculate weighted score if config provided? For now just average of scores
-    df['overall_score'] = df[score_cols].mean(axis=1)
-    
-    ranking = df.groupby("prompt_source")['overall_score'].mean().sort_values(ascending=False)
-    print("\n🏆 Prompt Ranking (Overall Score):")
+    # Overall score: evaluator scores weighted as in evaluation.yaml (plain mean without a config)
+    weights = evaluator_weights(load_config(args.config).get("evaluators", {})) if os.path.exists(args.config) else None
+    df['overall_score'] = weighted_overall(df, weights)
+    matrix = paired_matrix(df)
+    rng = np.random.default_rng(args.seed)
+
+    ranking = prompt_summary(matrix, args.bootstrap, args.alpha, rng)
+    print(f"\n🏆 Prompt Ranking (Weighted Overall Score, {1 - args.alpha:.0%} bootstrap CI):")
     print(ranking)
-    
+
+    pairs = compare_pairs(matrix, args.bootstrap, args.alpha, rng)
+    if len(pairs):
+        print("\n🔬 Paired Comparisons (shared queries, sign-flip test, Holm-adjusted):")
+        for line in format_pairs(pairs):
+            print(f"   {line}")
+
+    if args.sequential:
+        seq = sequential_compare(matrix, args.looks, args.alpha, min(args.bootstrap, 2000), args.seed)
+        print("\n⏱️  Sequential Comparison:")
+        if seq["winner"] is None:
+            print(f"   No significant winner after all {seq['n_total']} paired queries.")
+        else:
+            print(f"   {seq['winner']} wins at look {seq['look']}/{args.looks}, "
+                  f"after {seq['n_used']} of {seq['n_total']} paired queries.")
+
     best_prompt = ranking.index[0]
-    print(f"\n✨ Best Performing Prompt: {best_prompt}")
+    leader_pairs = pairs[(pairs["prompt_a"] == best_prompt) | (pairs["prompt_b"] == best_prompt)]
+    # Significant and in the leader's favour (mean_diff is prompt_a - prompt_b)
+    favours_leader = np.where(leader_pairs["prompt_a"] == best_prompt, leader_pairs["mean_diff"], -leader_pairs["mean_diff"]) > 0
+    if len(leader_pairs) and (leader_pairs["significant"] & favours_leader).all():
+        print(f"\n✨ Best Performing Prompt: {best_prompt} (significantly better than all others)")
+    else:
+        print(f"\n✨ Best Performing Prompt: {best_prompt} (not significantly better than every other prompt)")
 
 if __name__ == "__main__":
     compare()
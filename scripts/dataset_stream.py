@@ -0,0 +1,93 @@
+import glob
+import gzip
+import io
+import os
+import random
+from typing import Any, Dict, IO, Iterator, List, Optional, Sequence, Union
+
+try:
+    import orjson
+
+    def _loads(line: bytes) -> Dict[str, Any]:
+        return orjson.loads(line)
+except ImportError:
+    import json
+
+    def _loads(line: bytes) -> Dict[str, Any]:
+        return json.loads(line)
+
+def expand_paths(patterns: Union[str, Sequence[str]]) -> List[str]:
+    """
+    Expands dataset paths and glob patterns (e.g. "data/queries-*.jsonl.gz") into a
+    sorted, de-duplicated file list, so sharded inputs are read in a stable order.
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    paths: List[str] = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No dataset files match {pattern}")
+            paths.extend(matches)
+        elif os.path.exists(pattern):
+            paths.append(pattern)
+        else:
+            raise FileNotFoundError(f"Dataset not found: {pattern}")
+    return list(dict.fromkeys(paths))
+
+def open_binary(path: str) -> IO[bytes]:
+    """Opens a plain, gzip (.gz) or zstd (.zst/.zstd) file for buffered binary line reads."""
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rb')
+    if path.endswith((".zst", ".zstd")):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("Reading .zst datasets needs the 'zstandard' package: pip install zstandard") from e
+        raw = open(path, 'rb')
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+    return open(path, 'rb')
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Yields records from one JSONL file, one line at a time."""
+    with open_binary(path) as f:
+        for line in f:
+            if line.strip():
+                yield _loads(line)
+
+class StreamingDataset:
+    """
+    Lazy, re-iterable view over one or more JSONL datasets.
+
+    Every iteration streams the files again from disk, so memory stays flat however
+    large the dataset is and the first record is available immediately.
+    `offset` skips leading records, `sample` keeps each remaining record with that
+    probability (seeded, so every pass sees the same subset) and `limit` caps how
+    many are yielded.
+    """
+
+    def __init__(self, patterns: Union[str, Sequence[str]], offset: int = 0, limit: Optional[int] = None,
+                 sample: Optional[float] = None, seed: int = 0):
+        self.paths = expand_paths(patterns)
+        self.offset = offset
+        self.limit = limit
+        self.sample = sample
+        self.seed = seed
+
+    def _records(self) -> Iterator[Dict[str, Any]]:
+        for path in self.paths:
+            yield from iter_jsonl(path)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        rng = random.Random(self.seed)
+        yielded = 0
+        for position, record in enumerate(self._records()):
+            if self.limit is not None and yielded >= self.limit:
+                return
+            if position < self.offset:
+                continue
+            if self.sample is not None and rng.random() >= self.sample:
+                continue
+            yielded += 1
+            yield record
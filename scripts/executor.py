@@ -0,0 +1,119 @@
+import asyncio
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def ordered_map(fn: Callable[[T], R], items: Iterable[T], max_concurrency: int = 1) -> Iterator[Tuple[T, R]]:
+    """
+    Applies `fn` to every item on a bounded thread pool and yields (item, result)
+    pairs in input order.
+
+    At most `max_concurrency` calls run at once and at most twice that many results
+    are buffered, so the consumer (e.g. the evaluators) can work on finished rows
+    while later generations are still in flight.
+    """
+    if max_concurrency <= 1:
+        for item in items:
+            yield item, fn(item)
+        return
+
+    window = max_concurrency * 2
+    source = iter(items)
+    pending: deque = deque()
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        for item in source:
+            pending.append((item, pool.submit(fn, item)))
+            if len(pending) >= window:
+                break
+
+        while pending:
+            item, future = pending.popleft()
+            result = future.result()
+            for nxt in source:
+                pending.append((nxt, pool.submit(fn, nxt)))
+                break
+            yield item, result
+
+_DONE = object()
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+def ordered_amap(coro_fn: Callable[[T], Awaitable[R]], items: Iterable[T], max_concurrency: int = 1) -> Iterator[Tuple[T, R]]:
+    """
+    Async variant of `ordered_map` for clients with a native `agenerate()`.
+
+    Coroutines run on an event loop in a background thread, so hundreds of requests
+    can be in flight without a thread each. Results are handed back to the calling
+    thread in input order through a bounded queue, which keeps memory flat and lets
+    the caller evaluate rows while the loop keeps generating.
+    """
+    max_concurrency = max(1, max_concurrency)
+    window = max_concurrency * 2
+    out: queue.Queue = queue.Queue(maxsize=window)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    async def produce():
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(item):
+            async with semaphore:
+                return await coro_fn(item)
+
+        source = iter(items)
+        pending: deque = deque()
+        try:
+            for item in source:
+                pending.append((item, asyncio.ensure_future(bounded(item))))
+                if len(pending) >= window:
+                    break
+
+            while pending and not stop.is_set():
+                item, task = pending.popleft()
+                result = await task
+                for nxt in source:
+                    pending.append((nxt, asyncio.ensure_future(bounded(nxt))))
+                    break
+                if not await asyncio.to_thread(put, (item, result)):
+                    break
+            put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    worker = threading.Thread(target=asyncio.run, args=(produce(),), daemon=True)
+    worker.start()
+    try:
+        while True:
+            entry = out.get()
+            if entry is _DONE:
+                break
+            if isinstance(entry, _Failure):
+                raise entry.error
+            yield entry
+    finally:
+        stop.set()
+        worker.join()
+
+def get_max_concurrency(model_conf: dict, default: int = 1) -> int:
+    """Reads the per-model `max_concurrency` setting from models.yaml."""
+    value: Any = model_conf.get("max_concurrency", default)
+    return max(1, int(value or 1))
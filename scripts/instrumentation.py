@@ -0,0 +1,138 @@
+import json
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+TIMINGS_FILE = "timings.json"
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram: constant memory however many samples are
+    recorded, with percentiles accurate to about 1% (bucket width `growth`).
+    """
+
+    def __init__(self, growth: float = 1.02, floor_s: float = 1e-6):
+        self._log_growth = math.log(growth)
+        self._growth = growth
+        self._floor = floor_s
+        self._buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        bucket = int(math.log(max(seconds, self._floor) / self._floor) / self._log_growth)
+        self._buckets[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-th percentile (q in 0-100)."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(self._floor * self._growth ** (bucket + 1), self.max)
+        return self.max
+
+class Instrumentation:
+    """
+    Per-stage timers, counters and latency histograms for one run. Stages are
+    accumulated wall time of main-thread work and may nest (waiting on generations
+    includes rendering the prompts fed to the pool); histograms are per-call latencies
+    (e.g. "model:<name>" for generations, "evaluator:<name>" for batches) and
+    are safe to update from worker threads.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Counter = Counter()
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def add_stage(self, name: str, seconds: float, calls: int = 1):
+        with self._lock:
+            entry = self.stages.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def summary(self, wall_s: Optional[float] = None) -> Dict[str, Any]:
+        wall_s = wall_s if wall_s is not None else time.perf_counter() - self._start
+        return {
+            "wall_s": round(wall_s, 4),
+            "stages": {
+                name: {"total_s": round(total, 4), "calls": calls,
+                       "share": round(total / wall_s, 4) if wall_s else 0.0,
+                       "mean_ms": round(1000 * total / calls, 4) if calls else 0.0}
+                for name, (total, calls) in sorted(self.stages.items(), key=lambda kv: -kv[1][0])
+            },
+            "latency_ms": {
+                name: {"count": h.count, "p50": round(1000 * h.percentile(50), 3), "p95": round(1000 * h.percentile(95), 3),
+                       "p99": round(1000 * h.percentile(99), 3), "max": round(1000 * h.max, 3),
+                       "total_s": round(h.total, 4)}
+                for name, h in sorted(self.histograms.items())
+            },
+            "counters": dict(self.counters),
+        }
+
+def timed_iter(items: Iterable[T], instr: Instrumentation, name: str) -> Iterator[T]:
+    """Yields from `items`, charging the time spent waiting on each next() to stage `name`."""
+    source = iter(items)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(source)
+        except StopIteration:
+            instr.add_stage(name, time.perf_counter() - start, calls=0)
+            return
+        instr.add_stage(name, time.perf_counter() - start)
+        yield item
+
+def save_summary(summary: Dict[str, Any], path: str):
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Plain-text tables of a summary() for the end of a run."""
+    lines = [f"{'stage':<32} {'total s':>9} {'share':>7} {'calls':>9} {'mean ms':>9}"]
+    for name, s in summary["stages"].items():
+        lines.append(f"{name:<32} {s['total_s']:>9.3f} {s['share']:>7.1%} {s['calls']:>9} {s['mean_ms']:>9.3f}")
+    lines.append(f"{'wall time':<32} {summary['wall_s']:>9.3f}")
+    if summary["latency_ms"]:
+        lines.append("")
+        lines.append(f"{'latency (ms)':<32} {'n':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+        for name, h in summary["latency_ms"].items():
+            lines.append(f"{name:<32} {h['count']:>9} {h['p50']:>9.2f} {h['p95']:>9.2f} {h['p99']:>9.2f} {h['max']:>9.2f}")
+    if summary["counters"]:
+        lines.append("")
+        lines.extend(f"{name:<32} {value:>9}" for name, value in sorted(summary["counters"].items()))
+    return "\n".join(lines)
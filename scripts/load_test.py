@@ -0,0 +1,166 @@
+import sys
+import os
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.utils import load_config
+from scripts.run_experiment import build_client
+from scripts.instrumentation import LatencyHistogram
+from scripts.mock_openai_server import MockOpenAIServer, add_mock_arguments, settings_from_args
+
+DEFAULT_PROMPT = "You are a financial planner. Answer briefly.\n\nUser Query: How much should I save for retirement?"
+
+def classify_error(error: str) -> str:
+    """Short label for an LLMResponse error: the HTTP status, "timeout", "connection" or "other"."""
+    status = re.search(r"Error code: (\d{3})", error)
+    if status:
+        return status.group(1)
+    lowered = error.lower()
+    if "timed out" in lowered or "timeout" in lowered:
+        return "timeout"
+    if "connection" in lowered:
+        return "connection"
+    return "other"
+
+async def run_load_test(client, qps: float, duration_s: float, max_in_flight: int = 256,
+                        prompt: str = DEFAULT_PROMPT) -> Dict[str, Any]:
+    """
+    Open-loop load: request i is due at start + i / qps whether or not earlier ones
+    have finished. Latency is measured from each request's due time. Requests due
+    while `max_in_flight` are outstanding are not sent and are counted as "shed".
+    """
+    latency = LatencyHistogram()
+    outcomes: Counter = Counter()
+    in_flight = set()
+    loop = asyncio.get_running_loop()
+
+    async def one(due: float):
+        response = await client.agenerate(prompt)
+        latency.record(loop.time() - due)
+        outcomes["ok" if not response.error else classify_error(response.error)] += 1
+
+    total = int(qps * duration_s)
+    start = loop.time()
+    for i in range(total):
+        due = start + i / qps
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            outcomes["shed"] += 1
+            continue
+        task = asyncio.ensure_future(one(due))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    send_s = loop.time() - start
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    elapsed = loop.time() - start
+
+    completed = sum(n for outcome, n in outcomes.items() if outcome != "shed")
+    return {
+        "target_qps": qps,
+        "duration_s": round(elapsed, 3),
+        "requests": total,
+        "offered_qps": round(total / send_s, 2) if send_s else 0.0,
+        "achieved_qps": round(outcomes["ok"] / elapsed, 2) if elapsed else 0.0,
+        "completed": completed,
+        "outcomes": dict(outcomes),
+        "error_rate": round(1 - outcomes["ok"] / completed, 4) if completed else 0.0,
+        "latency_ms": {
+            "p50": round(1000 * latency.percentile(50), 2),
+            "p95": round(1000 * latency.percentile(95), 2),
+            "p99": round(1000 * latency.percentile(99), 2),
+            "max": round(1000 * latency.max, 2),
+            "mean": round(1000 * latency.total / latency.count, 2) if latency.count else 0.0,
+        },
+    }
+
+def format_report(report: Dict[str, Any]) -> str:
+    lat = report["latency_ms"]
+    lines = [
+        f"requests        {report['requests']} over {report['duration_s']:.1f}s",
+        f"throughput      target {report['target_qps']:.1f}/s, offered {report['offered_qps']:.1f}/s, "
+        f"achieved {report['achieved_qps']:.1f}/s (successful)",
+        f"latency (ms)    p50 {lat['p50']:.1f}  p95 {lat['p95']:.1f}  p99 {lat['p99']:.1f}  max {lat['max']:.1f}",
+        f"outcomes        " + ", ".join(f"{k}: {v}" for k, v in sorted(report["outcomes"].items())),
+        f"error rate      {report['error_rate']:.2%}",
+    ]
+    if report.get("scheduler"):
+        lines.append("scheduler       " + ", ".join(f"{k}: {v}" for k, v in report["scheduler"].items()))
+    if report.get("server"):
+        lines.append("server          " + ", ".join(f"{k}: {v}" for k, v in report["server"].items()))
+    return "\n".join(lines)
+
+def resolve_model_conf(args: argparse.Namespace, base_url: Optional[str]) -> Dict[str, Any]:
+    if args.model:
+        models = load_config(args.models_config)["models"]
+        if args.model not in models:
+            raise SystemExit(f"Unknown model '{args.model}' in {args.models_config}")
+        model_conf = dict(models[args.model])
+    else:
+        model_conf = {"provider": "openai", "model_name": "mock", "sdk_max_retries": 0}
+    if base_url:
+        model_conf["base_url"] = base_url
+    if args.stream:
+        model_conf["stream"] = True
+    if args.timeout_s_client is not None:
+        model_conf["timeout_s"] = args.timeout_s_client
+    return model_conf
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive an OpenAI-compatible endpoint at a target QPS and report throughput and tail latency",
+        epilog="Mock server options (--latency, --rate-429, ...) apply with --mock.",
+    )
+    parser.add_argument("--models-config", default="config/models.yaml", help="Path to models config")
+    parser.add_argument("--model", default=None, help="models.yaml entry to load test (default: a bare openai client)")
+    parser.add_argument("--base-url", default=None, help="Override the model's base_url")
+    parser.add_argument("--mock", action="store_true", help="Start the mock server in-process and point the model at it")
+    parser.add_argument("--qps", type=float, default=20.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Outstanding requests before new ones are shed")
+    parser.add_argument("--prompt", default=DEFAULT_PROMPT, help="Prompt sent with every request")
+    parser.add_argument("--stream", action="store_true", help="Request streamed completions")
+    parser.add_argument("--client-timeout-s", dest="timeout_s_client", type=float, default=None,
+                        help="Per-request timeout of the client")
+    parser.add_argument("--output", default=None, help="Save the report as JSON")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    if not args.mock and not (args.model or args.base_url):
+        parser.error("pass --mock, --model or --base-url")
+
+    server = MockOpenAIServer(settings_from_args(args)).start() if args.mock else None
+    try:
+        model_conf = resolve_model_conf(args, server.base_url if server else args.base_url)
+        client, scheduler = build_client(model_conf)
+        print(f"🚀 Load testing {model_conf.get('model_name')} at {model_conf.get('base_url', 'the provider default')}: "
+              f"{args.qps:g} qps for {args.duration:g}s")
+        report = asyncio.run(run_load_test(client, args.qps, args.duration, args.max_in_flight, args.prompt))
+        if scheduler is not None:
+            report["scheduler"] = scheduler.stats()
+        if server is not None:
+            with server.state.lock:
+                report["server"] = dict(server.state.stats)
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(f"\n{format_report(report)}")
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import sys
+import os
+import argparse
+from typing import Optional
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.utils import load_config, save_results, save_evaluator_manifest
+from scripts.sharding import SHARDS_DIR, merge_shards
+
+def merge(config_path: str, shards_dir: Optional[str] = None, output_dir: Optional[str] = None,
+          allow_incomplete: bool = False) -> bool:
+    """Validates and merges shard partitions into the experiment's final result files. Returns True on success."""
+    eval_config = load_config(config_path)
+    output_dir = output_dir or eval_config["output"]["save_dir"]
+    shards_dir = shards_dir or os.path.join(eval_config["output"]["save_dir"], SHARDS_DIR)
+
+    print(f"🧩 Merging shards from {shards_dir}")
+    rows, report = merge_shards(shards_dir)
+    print(f"   {report['shards']}/{report['expected_shards']} shards, {report['rows']} rows, "
+          f"{report['duplicates']} duplicate rows dropped")
+    for error in report["errors"]:
+        print(f"❌ {error}")
+    if not report["complete"] and not allow_incomplete:
+        print("Merge aborted: re-run the missing or incomplete shards (or pass --allow-incomplete).")
+        return False
+
+    save_results(rows, output_dir, eval_config["output"]["format"], eval_config.get("experiment_name", "default"))
+    save_evaluator_manifest(output_dir, report["evaluators"])
+    print(f"\n✅ Merge Complete. Results saved to {output_dir}/")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge sharded experiment results")
+    parser.add_argument("--config", default="config/evaluation.yaml", help="Path to evaluation config")
+    parser.add_argument("--shards-dir", default=None, help="Directory holding shard partitions (default: <save_dir>/shards)")
+    parser.add_argument("--output-dir", default=None, help="Where to write merged results (default: save_dir)")
+    parser.add_argument("--allow-incomplete", action="store_true", help="Write whatever rows exist even if shards are missing")
+    args = parser.parse_args()
+
+    if not merge(args.config, args.shards_dir, args.output_dir, args.allow_incomplete):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import sys
+import os
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.tokens import get_counter
+
+LATENCY_DISTRIBUTIONS = ["fixed", "uniform", "normal", "lognormal", "exponential"]
+
+class LatencyModel:
+    """
+    Samples response latencies in seconds. `mean_ms` is the mean for every shape;
+    `spread` is the relative width (uniform: +/- spread * mean, normal: sd = spread * mean,
+    lognormal: sigma of the underlying normal, so 1.0 gives a long tail).
+    """
+
+    def __init__(self, distribution: str = "fixed", mean_ms: float = 200.0, spread: float = 0.5,
+                 rng: Optional[random.Random] = None):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution} (available: {LATENCY_DISTRIBUTIONS})")
+        self.distribution = distribution
+        self.mean = mean_ms / 1000
+        self.spread = spread
+        self.rng = rng or random.Random()
+
+    def sample(self) -> float:
+        mean, spread, rng = self.mean, self.spread, self.rng
+        if self.distribution == "uniform":
+            return rng.uniform(mean * (1 - spread), mean * (1 + spread))
+        if self.distribution == "normal":
+            return max(0.0, rng.gauss(mean, mean * spread))
+        if self.distribution == "lognormal":
+            # E[lognormal(mu, sigma)] = exp(mu + sigma^2 / 2)
+            return rng.lognormvariate(math.log(mean) - spread ** 2 / 2, spread) if mean > 0 else 0.0
+        if self.distribution == "exponential":
+            return rng.expovariate(1 / mean) if mean > 0 else 0.0
+        return mean
+
+class MockSettings:
+    """Behaviour of the mock server; every field maps to a CLI flag of the same name."""
+
+    def __init__(self, latency: str = "fixed", latency_ms: float = 200.0, latency_spread: float = 0.5,
+                 max_qps: Optional[float] = None, max_concurrency: Optional[int] = None,
+                 rate_429: float = 0.0, rate_500: float = 0.0, rate_timeout: float = 0.0, timeout_s: float = 30.0,
+                 stream_tokens_per_s: float = 200.0, completion_words: int = 40, seed: Optional[int] = None):
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.latency_spread = latency_spread
+        self.max_qps = max_qps
+        self.max_concurrency = max_concurrency
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.rate_timeout = rate_timeout
+        self.timeout_s = timeout_s
+        self.stream_tokens_per_s = stream_tokens_per_s
+        self.completion_words = completion_words
+        self.seed = seed
+
+class _State:
+    """Shared counters and limits of one server, guarded by a lock."""
+
+    def __init__(self, settings: MockSettings):
+        self.settings = settings
+        self.rng = random.Random(settings.seed)
+        self.latency = LatencyModel(settings.latency, settings.latency_ms, settings.latency_spread, self.rng)
+        self.counter = get_counter("regex")
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.stats = {"requests": 0, "ok": 0, "streamed": 0, "throttled": 0, "injected_429": 0,
+                      "injected_500": 0, "injected_timeout": 0}
+
+    def admit(self) -> Optional[str]:
+        """Applies throughput caps and error injection; returns the injected failure, if any."""
+        s = self.settings
+        with self.lock:
+            self.stats["requests"] += 1
+            now = time.monotonic()
+            if now - self.window_start >= 1.0:
+                self.window_start, self.window_count = now, 0
+            over_qps = s.max_qps is not None and self.window_count >= s.max_qps
+            over_concurrency = s.max_concurrency is not None and self.in_flight >= s.max_concurrency
+            if over_qps or over_concurrency:
+                self.stats["throttled"] += 1
+                return "throttled"
+            self.window_count += 1
+            roll = self.rng.random()
+            for failure, rate in (("injected_429", s.rate_429), ("injected_500", s.rate_500),
+                                  ("injected_timeout", s.rate_timeout)):
+                if roll < rate:
+                    self.stats[failure] += 1
+                    return failure
+                roll -= rate
+            self.in_flight += 1
+            return None
+
+    def sample_latency(self) -> float:
+        with self.lock:
+            return self.latency.sample()
+
+    def release(self, streamed: bool):
+        with self.lock:
+            self.in_flight -= 1
+            self.stats["ok"] += 1
+            self.stats["streamed"] += streamed
+
+def _completion_text(prompt: str, words: int) -> str:
+    echo = prompt.split()[:words // 2]
+    filler = ["This", "is", "a", "simulated", "completion", "from", "the", "local", "mock", "server."]
+    return " ".join(echo + [filler[i % len(filler)] for i in range(max(0, words - len(echo)))])
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients reuse connections as they would against the real API
+    state: _State = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str, error_type: str, headers: Optional[Dict[str, str]] = None):
+        self._send_json(status, {"error": {"message": message, "type": error_type, "code": None}}, headers)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "local"}]})
+        elif self.path.rstrip("/").endswith("/stats"):
+            with self.state.lock:
+                self._send_json(200, dict(self.state.stats, in_flight=self.state.in_flight))
+        else:
+            self._error(404, f"Unknown path {self.path}", "invalid_request_error")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._error(404, f"Unknown path {self.path}", "invalid_request_error")
+            return
+
+        failure = self.state.admit()
+        if failure in ("throttled", "injected_429"):
+            self._error(429, "Rate limit reached (mock)", "rate_limit_exceeded", {"Retry-After": "1"})
+            return
+        if failure == "injected_500":
+            self._error(500, "Internal server error (mock)", "server_error")
+            return
+        if failure == "injected_timeout":
+            time.sleep(self.state.settings.timeout_s)  # outlast the client's timeout
+            self._error(504, "Gateway timeout (mock)", "server_error")
+            return
+
+        try:
+            self._complete(request)
+        finally:
+            self.state.release(bool(request.get("stream")))
+
+    def _complete(self, request: Dict[str, Any]):
+        messages = request.get("messages") or []
+        prompt = "\n".join(str(m.get("content") or "") for m in messages)
+        text = _completion_text(messages[-1].get("content", "") if messages else "", self.state.settings.completion_words)
+        prompt_tokens = self.state.counter.count(prompt)
+        completion_tokens = self.state.counter.count(text)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        created = int(time.time())
+        completion_id = f"chatcmpl-mock-{self.state.rng.getrandbits(48):012x}"
+        model = request.get("model", "mock")
+        latency = self.state.sample_latency()
+
+        if not request.get("stream"):
+            time.sleep(latency)
+            self._send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop", "logprobs": None,
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": usage,
+            })
+            return
+
+        # Server-sent events over chunked transfer encoding: first token after `latency`,
+        # then one word per chunk at `stream_tokens_per_s`
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(payload):
+            data = f"data: {payload if isinstance(payload, str) else json.dumps(payload)}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def chunk(delta, finish_reason=None, chunk_usage=None):
+            return {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [] if chunk_usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                    "usage": chunk_usage}
+
+        time.sleep(latency)
+        words = text.split(" ")
+        event(chunk({"role": "assistant", "content": ""}))
+        for i, word in enumerate(words):
+            event(chunk({"content": word if i == 0 else " " + word}))
+            if self.state.settings.stream_tokens_per_s:
+                time.sleep(1 / self.state.settings.stream_tokens_per_s)
+        event(chunk({}, finish_reason="stop"))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            event(chunk({}, chunk_usage=usage))
+        event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+class MockOpenAIServer:
+    """
+    OpenAI-compatible Chat Completions stand-in (`POST /v1/chat/completions`, plus
+    `GET /v1/models` and `GET /v1/stats`) on a background thread. Point an `openai`
+    model at it with `base_url: http://host:port/v1`.
+    """
+
+    def __init__(self, settings: Optional[MockSettings] = None, host: str = "127.0.0.1", port: int = 0):
+        handler = type("MockHandler", (_Handler,), {"state": _State(settings or MockSettings())})
+        self.state = handler.state
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockOpenAIServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def add_mock_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal", help="Latency distribution")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mean time to first byte")
+    parser.add_argument("--latency-spread", type=float, default=0.5, help="Relative spread (lognormal: sigma)")
+    parser.add_argument("--max-qps", type=float, default=None, help="Requests per second before answering 429")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Requests in flight before answering 429")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-timeout", type=float, default=0.0, help="Fraction of requests that hang for --timeout-s")
+    parser.add_argument("--timeout-s", type=float, default=30.0, help="How long injected timeouts hang")
+    parser.add_argument("--stream-tokens-per-s", type=float, default=200.0, help="Pace of streamed chunks")
+    parser.add_argument("--completion-words", type=int, default=40, help="Words per completion")
+    parser.add_argument("--seed", type=int, default=None)
+
+def settings_from_args(args: argparse.Namespace) -> MockSettings:
+    return MockSettings(
+        latency=args.latency, latency_ms=args.latency_ms, latency_spread=args.latency_spread,
+        max_qps=args.max_qps, max_concurrency=args.max_concurrency, rate_429=args.rate_429, rate_500=args.rate_500,
+        rate_timeout=args.rate_timeout, timeout_s=args.timeout_s, stream_tokens_per_s=args.stream_tokens_per_s,
+        completion_words=args.completion_words, seed=args.seed,
+    )
+
+def serve():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible Chat Completions server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(settings_from_args(args), args.host, args.port)
+    print(f"🧪 Mock OpenAI server on {server.base_url} (latency {args.latency} ~{args.latency_ms}ms)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+from collections import Counter, defaultdict, deque
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from scripts.prompt_templates import PromptTemplate
+from scripts.sink import RowKey
+
+CELL_MANIFEST = "cells.jsonl"
+
+# models.yaml keys that change how a model is called or accounted for, not what it generates
+OPERATIONAL_MODEL_KEYS = {
+    "api_key_env", "max_concurrency", "rate_limit", "sdk_max_retries", "pricing", "tokenizer",
+    "expected_completion_tokens", "expected_latency_ms", "keep_raw_response", "timeout_s", "stream",
+}
+
+GENERATE, RESCORE, REUSE = "generate", "rescore", "reuse"
+
+def _digest(value: Any) -> str:
+    return hashlib.blake2b(json.dumps(value, sort_keys=True, default=str).encode("utf-8"), digest_size=8).hexdigest()
+
+def model_fingerprint(model_conf: Dict[str, Any]) -> str:
+    return _digest({k: v for k, v in model_conf.items() if k not in OPERATIONAL_MODEL_KEYS})
+
+def record_fingerprint(record: Dict[str, Any]) -> str:
+    return _digest(record)
+
+class Cell(NamedTuple):
+    """One (model, prompt, query) result row and the fingerprints of everything that produced it."""
+    key: RowKey
+    model: str       # model config
+    prompt: str      # expanded prompt text
+    record: str      # whole dataset record (the reference answer feeds the evaluators)
+    generation: str  # model config + prompt + the record fields the prompt reads
+
+def make_cell(key: RowKey, model_fp: str, template: PromptTemplate, record: Dict[str, Any]) -> Cell:
+    generation = _digest([model_fp, template.content_hash, template.field_values(record)])
+    return Cell(key, model_fp, template.content_hash, record_fingerprint(record), generation)
+
+def load_cell_manifest(output_dir: str) -> Dict[RowKey, deque]:
+    """Cells of the last completed run, grouped by key (a key repeats when a query does)."""
+    cells: Dict[RowKey, deque] = defaultdict(deque)
+    path = os.path.join(output_dir, CELL_MANIFEST)
+    if not os.path.exists(path):
+        return cells
+    with open(path, 'r') as f:
+        for line in f:
+            model, prompt_source, query, *fingerprints = json.loads(line)
+            key = (model, prompt_source, query)
+            cells[key].append(Cell(key, *fingerprints))
+    return cells
+
+def remove_cell_manifest(output_dir: str):
+    """Forgets the last run's cells (e.g. before a run that rewrites results without recording them)."""
+    path = os.path.join(output_dir, CELL_MANIFEST)
+    if os.path.exists(path):
+        os.remove(path)
+
+class CellManifestWriter:
+    """
+    Writes the cells of a run to a temporary file and moves it into place with
+    `commit()` once the results are saved, so an interrupted run never leaves a
+    manifest that claims cells it did not finish. The previous manifest stays in
+    place until then (an interrupted --incremental run still needs it).
+    """
+
+    def __init__(self, output_dir: str):
+        self.path = os.path.join(output_dir, CELL_MANIFEST)
+        os.makedirs(output_dir, exist_ok=True)
+        self._f = open(self.path + ".tmp", 'w')
+
+    def write(self, cell: Cell):
+        self._f.write(json.dumps([*cell.key, *cell[1:]]) + "\n")
+
+    def commit(self):
+        self._f.close()
+        os.replace(self.path + ".tmp", self.path)
+
+class Plan:
+    """
+    Diff of a run's cells against the previous run's manifest. Each cell is:
+      GENERATE  new, or its model config, prompt or prompt inputs changed
+      RESCORE   same generation, but its record changed: evaluate the old response again
+      REUSE     unchanged: keep the row, re-running only evaluators whose fingerprint changed
+    """
+
+    def __init__(self, prior_cells: Dict[RowKey, deque], evaluator_fps: Dict[str, str], prior_evaluator_fps: Dict[str, str]):
+        self._prior = prior_cells
+        self.has_prior = bool(prior_cells)
+        self.stale_evaluators = sorted(n for n, fp in evaluator_fps.items() if prior_evaluator_fps.get(n) != fp)
+        self.removed_evaluators = sorted(set(prior_evaluator_fps) - set(evaluator_fps))
+        self.added_evaluators = sorted(set(evaluator_fps) - set(prior_evaluator_fps))
+        self.reasons: Counter = Counter()
+        self.decisions: Counter = Counter()
+        self.generations: Counter = Counter()  # per model
+        self.reuse: Counter = Counter()
+        self.rescore: Dict[RowKey, deque] = defaultdict(deque)  # key -> new reference answers
+        # model / prompt names: seen in this grid, seen in the previous run, and changed since
+        self._names = {kind: {"new": set(), "old": set(), "changed": set()} for kind in ("models", "prompts")}
+
+    def add(self, cell: Cell, record: Dict[str, Any]) -> str:
+        model, prompt_source, _ = cell.key
+        prior = self._prior[cell.key].popleft() if self._prior.get(cell.key) else None
+        for kind, name, fingerprint in (("models", model, "model"), ("prompts", prompt_source, "prompt")):
+            names = self._names[kind]
+            names["new"].add(name)
+            if prior is not None:
+                names["old"].add(name)
+                if getattr(prior, fingerprint) != getattr(cell, fingerprint):
+                    names["changed"].add(name)
+
+        if prior is None:
+            decision, reason = GENERATE, "new"
+        elif prior.generation != cell.generation:
+            decision = GENERATE
+            reason = ("model changed" if prior.model != cell.model else
+                      "prompt changed" if prior.prompt != cell.prompt else "prompt inputs changed")
+        elif prior.record != cell.record:
+            decision, reason = RESCORE, "record changed"
+            self.rescore[cell.key].append(record.get("reference_answer"))
+        else:
+            decision, reason = REUSE, "unchanged"
+            self.reuse[cell.key] += 1
+        if decision == GENERATE:
+            self.generations[model] += 1
+        self.decisions[decision] += 1
+        self.reasons[reason] += 1
+        return decision
+
+    def take_prior(self, key: RowKey) -> Optional[tuple]:
+        """How to carry over a previous row with this key: (REUSE, None), (RESCORE, new reference) or None to drop it."""
+        if self.reuse[key] > 0:
+            self.reuse[key] -= 1
+            return REUSE, None
+        if self.rescore.get(key):
+            return RESCORE, self.rescore[key].popleft()
+        return None
+
+    @property
+    def dropped(self) -> int:
+        """Cells of the previous run that are no longer part of the grid."""
+        return sum(len(cells) for cells in self._prior.values())
+
+    def changes(self, kind: str) -> Dict[str, List[str]]:
+        """Added, removed and changed names for "models" or "prompts"."""
+        names = self._names[kind]
+        position = 0 if kind == "models" else 1
+        old = names["old"] | {key[position] for key, cells in self._prior.items() if cells}
+        return {
+            "added": sorted(names["new"] - old),
+            "removed": sorted(old - names["new"]),
+            "changed": sorted(names["changed"]),
+        }
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+FIELD = re.compile(r"\{\{\s*([A-Za-z_][\w.]*)\s*\}\}")
+PARTIAL = re.compile(r"\{\{>\s*([\w./-]+)\s*\}\}")
+SECTION = re.compile(r"\{\{#(system|user)\}\}(.*?)\{\{/\1\}\}", re.DOTALL)
+
+class TemplateError(ValueError):
+    pass
+
+class RenderedPrompt(NamedTuple):
+    user: str
+    system: Optional[str] = None
+
+def _compile_parts(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Splits text into alternating literals and field names: (literals, fields), len(literals) == len(fields) + 1."""
+    pieces = FIELD.split(text)
+    return tuple(pieces[0::2]), tuple(pieces[1::2])
+
+def _lookup(record: Dict[str, Any], field: str, template_id: str) -> str:
+    value: Any = record
+    for part in field.split("."):
+        if not isinstance(value, dict) or part not in value:
+            raise TemplateError(f"Template {template_id} needs field '{field}', which the record does not have")
+        value = value[part]
+    return "" if value is None else str(value)
+
+class PromptTemplate:
+    """
+    A prompt file compiled once into literal chunks and `{{field}}` slots.
+
+    Syntax:
+        {{field}} / {{meta.topic}}     value from the dataset record (dotted paths read nested dicts)
+        {{> name}}                     partial: name, name.md or partials/name(.md) next to the template
+        {{#system}}...{{/system}}      system prompt; the rest (or {{#user}}...{{/user}}) is the user prompt
+
+    `id` is the file's basename (the `prompt_source` of result rows) and
+    `content_hash` identifies the fully expanded text, partials included.
+    """
+
+    def __init__(self, text: str, template_id: str, base_dir: str = "."):
+        self.id = template_id
+        self.base_dir = base_dir
+        self.source = self._expand_partials(text, [])
+        self.content_hash = hashlib.sha256(self.source.encode("utf-8")).hexdigest()[:16]
+
+        sections = {name: body for name, body in SECTION.findall(self.source)}
+        if sections:
+            user = sections.get("user", SECTION.sub("", self.source))
+            self._system = _compile_parts(sections["system"].strip()) if "system" in sections else None
+            self._user = _compile_parts(user.strip())
+        else:
+            # No sections: the whole file is the user prompt, byte for byte
+            self._system = None
+            self._user = _compile_parts(self.source)
+        fields = self._user[1] + (self._system[1] if self._system else ())
+        self.fields: Tuple[str, ...] = tuple(dict.fromkeys(fields))
+
+    @classmethod
+    def from_file(cls, path: str) -> "PromptTemplate":
+        with open(path, 'r') as f:
+            return cls(f.read(), os.path.basename(path), os.path.dirname(path) or ".")
+
+    def _partial_path(self, name: str) -> str:
+        for candidate in (name, f"{name}.md", os.path.join("partials", name), os.path.join("partials", f"{name}.md")):
+            path = os.path.join(self.base_dir, candidate)
+            if os.path.isfile(path):
+                return path
+        raise TemplateError(f"Template {self.id}: partial '{name}' not found in {self.base_dir}")
+
+    def _expand_partials(self, text: str, stack: List[str]) -> str:
+        def include(match):
+            name = match.group(1)
+            if name in stack:
+                raise TemplateError(f"Template {self.id}: partial cycle {' -> '.join(stack + [name])}")
+            with open(self._partial_path(name), 'r') as f:
+                return self._expand_partials(f.read(), stack + [name])
+        return PARTIAL.sub(include, text)
+
+    def _fill(self, parts: Tuple[Tuple[str, ...], Tuple[str, ...]], record: Dict[str, Any]) -> str:
+        literals, fields = parts
+        out = [literals[0]]
+        for field, literal in zip(fields, literals[1:]):
+            out.append(_lookup(record, field, self.id))
+            out.append(literal)
+        return "".join(out)
+
+    def field_values(self, record: Dict[str, Any]) -> Tuple[str, ...]:
+        """The values this template reads from `record`; equal values render identical prompts."""
+        return tuple(_lookup(record, f, self.id) for f in self.fields)
+
+    def render(self, record: Dict[str, Any]) -> RenderedPrompt:
+        system = self._fill(self._system, record) if self._system else None
+        return RenderedPrompt(self._fill(self._user, record), system)
+
+    def __repr__(self):
+        return f"PromptTemplate({self.id!r}, hash={self.content_hash})"
+
+def load_templates(paths: Sequence[str]) -> List[PromptTemplate]:
+    """Compiles each prompt file once. IDs must be unique, since they label result rows."""
+    templates = [PromptTemplate.from_file(p) for p in paths]
+    seen: Dict[str, str] = {}
+    for template, path in zip(templates, paths):
+        if template.id in seen:
+            raise TemplateError(f"Prompt files {seen[template.id]} and {path} share the id {template.id}")
+        seen[template.id] = path
+    return templates
+
+class TemplateRenderer:
+    """
+    Memoized rendering shared by every model in a run. Keyed on the template's
+    content hash and the values of the fields it uses; LRU-bounded so streamed
+    datasets keep memory flat.
+
+    Models run one after another over the same (template, record) order, so a pair
+    is rendered once for all models only while templates x records fits in
+    `max_entries`. Past that, each model renders its prompts again.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._renders: "OrderedDict[tuple, RenderedPrompt]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, template: PromptTemplate, record: Dict[str, Any]) -> RenderedPrompt:
+        key = (template.content_hash, template.field_values(record))
+        rendered = self._renders.get(key)
+        if rendered is not None:
+            self.hits += 1
+            self._renders.move_to_end(key)
+            return rendered
+        self.misses += 1
+        rendered = self._renders[key] = template.render(record)
+        if len(self._renders) > self.max_entries:
+            self._renders.popitem(last=False)
+        return rendered
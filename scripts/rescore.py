@@ -0,0 +1,151 @@
+import sys
+import os
+import argparse
+import json
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.utils import load_config, load_results, save_results, load_evaluator_manifest, save_evaluator_manifest
+from scripts.run_experiment import get_evaluators, apply_batch
+from scripts.planner import remove_cell_manifest
+from scripts.sink import is_failed, iter_sink, row_key
+from evaluators.base import BatchEvaluationResult
+
+# Per-process evaluators, built once by the pool initializer
+_WORKER_EVALUATORS: Dict = {}
+
+def _init_worker(eval_conf: Dict, names: List[str], models_config: Optional[Dict] = None):
+    global _WORKER_EVALUATORS
+    enabled = {name: conf for name, conf in eval_conf.items() if name in names}
+    evaluators = get_evaluators(enabled, models_config)
+    _WORKER_EVALUATORS = {name: evaluators[name] for name in names}
+
+def _score_chunk(chunk: Tuple[List[str], List[str], List[Optional[str]]]) -> Dict[str, BatchEvaluationResult]:
+    queries, responses, references = chunk
+    return {
+        name: evaluator.evaluate_batch(queries, responses, references)
+        for name, evaluator in _WORKER_EVALUATORS.items()
+    }
+
+def stale_evaluators(rows: List[Dict], evaluators: Dict, manifest: Dict[str, str]) -> List[str]:
+    """Evaluators whose columns are missing, incomplete, or were produced by a different config/version."""
+    stale = []
+    for name, evaluator in evaluators.items():
+        col = f"score_{name}"
+        missing = any(row.get(col) is None for row in rows)
+        if missing or manifest.get(name) != evaluator.fingerprint():
+            stale.append(name)
+    return stale
+
+def rescore_rows(rows: List[Dict], eval_conf: Dict, names: List[str], workers: int = 0, chunk_size: int = 5000,
+                 models_config: Optional[Dict] = None) -> List[Dict]:
+    """
+    Recomputes score_*/reason_* columns for `names` in place, spreading chunks of rows
+    over a process pool. workers=0 uses every CPU core; workers=1 stays in-process.
+    """
+    if not names or not rows:
+        return rows
+
+    chunks = []
+    for start in range(0, len(rows), chunk_size):
+        part = rows[start:start + chunk_size]
+        chunks.append((
+            [str(row["query"]) for row in part],
+            [str(row.get("response") or "") for row in part],
+            [row.get("reference") for row in part],
+        ))
+
+    if workers == 1:
+        _init_worker(eval_conf, names, models_config)
+        results = map(_score_chunk, chunks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                   initializer=_init_worker, initargs=(eval_conf, names, models_config))
+        results = pool.map(_score_chunk, chunks)
+
+    try:
+        for start, batches in zip(range(0, len(rows), chunk_size), results):
+            for name, batch in batches.items():
+                apply_batch(rows[start:start + chunk_size], name, batch)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return rows
+
+def sync_sink(sink_path: str, rows: List[Dict], names: List[str]) -> int:
+    """
+    Copies the rescored columns of `names` into the run's results.jsonl sink, so a
+    later --incremental run carries the new scores over instead of the old ones.
+    Sink rows are matched to result rows by key, in order. Returns the rows updated.
+    """
+    prefixes = tuple(f"score_{name}" for name in names) + tuple(f"reason_{name}" for name in names)
+    rescored: Dict = defaultdict(deque)
+    for row in rows:
+        if not is_failed(row):
+            rescored[row_key(row)].append(row)
+
+    updated = 0
+    with open(sink_path + ".tmp", 'w') as f:
+        for row in iter_sink(sink_path):
+            matches = rescored.get(row_key(row))
+            if matches and not is_failed(row):
+                new = matches.popleft()
+                row = {k: v for k, v in row.items() if not k.startswith(prefixes)}
+                row.update({k: v for k, v in new.items() if k.startswith(prefixes)})
+                updated += 1
+            f.write(json.dumps(row) + "\n")
+    os.replace(sink_path + ".tmp", sink_path)
+    return updated
+
+def rescore():
+    parser = argparse.ArgumentParser(description="Re-score stored results without calling models")
+    parser.add_argument("--results", default="results/results.json", help="Path to results JSON, JSONL sink or CSV")
+    parser.add_argument("--config", default="config/evaluation.yaml", help="Path to evaluation config")
+    parser.add_argument("--models-config", default="config/models.yaml", help="Path to models config (for judge evaluators)")
+    parser.add_argument("--output-dir", default=None, help="Where to write rescored results (default: next to --results)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 = all CPU cores)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per worker task")
+    parser.add_argument("--force", action="store_true", help="Recompute every enabled evaluator")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.results):
+        print(f"File not found: {args.results}")
+        return
+
+    eval_config = load_config(args.config)
+    eval_conf = eval_config.get("evaluators", {})
+    models_config = load_config(args.models_config) if os.path.exists(args.models_config) else None
+    evaluators = get_evaluators(eval_conf, models_config)
+    source_dir = os.path.dirname(args.results) or "."
+    output_dir = args.output_dir or source_dir
+
+    rows = load_results(args.results)
+    manifest = load_evaluator_manifest(source_dir)
+    names = list(evaluators) if args.force else stale_evaluators(rows, evaluators, manifest)
+
+    print(f"🔁 Re-scoring {len(rows)} rows from {args.results}")
+    if not names:
+        print("✅ All evaluator columns are up to date.")
+        return
+    print(f"📋 Evaluators to compute: {names}")
+
+    rescore_rows(rows, eval_conf, names, args.workers, args.chunk_size, models_config)
+
+    save_results(rows, output_dir, eval_config["output"]["format"], eval_config.get("experiment_name", "default"))
+    sink_path = os.path.join(output_dir, "results.jsonl")
+    if os.path.abspath(output_dir) != os.path.abspath(source_dir):
+        # The results written there no longer match that directory's own run, if it has one
+        remove_cell_manifest(output_dir)
+    elif os.path.exists(sink_path):
+        print(f"🔄 Updated {sync_sink(sink_path, rows, names)} rows in {sink_path}")
+    manifest.update({name: evaluators[name].fingerprint() for name in names})
+    save_evaluator_manifest(output_dir, manifest)
+    print(f"\n✅ Re-scoring Complete. Results saved to {output_dir}/")
+
+if __name__ == "__main__":
+    rescore()
@@ -0,0 +1,119 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+# Hive-style partition keys of the Parquet results dataset
+PARTITION_COLS = ["experiment", "model", "prompt_source"]
+
+Filter = Tuple[str, str, Any]
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet results need the 'pyarrow' package: pip install pyarrow") from e
+
+def is_parquet(path: str) -> bool:
+    return os.path.isdir(path) or path.endswith(".parquet")
+
+def write_parquet_results(results: Union[List[Dict[str, Any]], pd.DataFrame], root: str, experiment: str = "default"):
+    """
+    Writes rows (dicts or a DataFrame) as a Parquet dataset partitioned by experiment/model/prompt_source.
+    Each column is stored separately, so readers that only need scores never touch
+    the response and reason text. Re-writing an experiment replaces its partitions.
+    """
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = pd.DataFrame(results)
+    df["experiment"] = experiment
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(
+        table,
+        root_path=root,
+        partition_cols=[c for c in PARTITION_COLS if c in df.columns],
+        existing_data_behavior="delete_matching",
+    )
+
+def default_results_path(config_path: Optional[str]) -> str:
+    """
+    Where run_experiment.py saved results for an evaluation config: the Parquet
+    dataset for `output.format: parquet`, otherwise results.csv. Falls back to the
+    other one when only it exists (e.g. the format was changed after the run).
+    """
+    save_dir, fmt = "results", None
+    if config_path and os.path.exists(config_path):
+        from scripts.utils import load_config
+        output = (load_config(config_path) or {}).get("output", {})
+        save_dir, fmt = output.get("save_dir", save_dir), output.get("format")
+    parquet, csv = os.path.join(save_dir, "results.parquet"), os.path.join(save_dir, "results.csv")
+    preferred, other = (parquet, csv) if fmt == "parquet" else (csv, parquet)
+    return other if not os.path.exists(preferred) and os.path.exists(other) else preferred
+
+def result_columns(path: str) -> List[str]:
+    """Column names of a results file without loading its data."""
+    if is_parquet(path):
+        _require_pyarrow()
+        import pyarrow.dataset as ds
+        return list(ds.dataset(path, format="parquet", partitioning="hive").schema.names)
+    if path.endswith(".csv"):
+        return list(pd.read_csv(path, nrows=0).columns)
+    return list(read_results(path).columns)
+
+def _apply_filters(df: pd.DataFrame, filters: Sequence[Filter]) -> pd.DataFrame:
+    ops = {
+        "==": lambda s, v: s == v, "!=": lambda s, v: s != v,
+        "<": lambda s, v: s < v, "<=": lambda s, v: s <= v,
+        ">": lambda s, v: s > v, ">=": lambda s, v: s >= v,
+        "in": lambda s, v: s.isin(v), "not in": lambda s, v: ~s.isin(v),
+    }
+    for col, op, value in filters:
+        df = df[ops[op](df[col], value)]
+    return df
+
+def read_results(path: str, columns: Optional[Sequence[str]] = None, filters: Optional[Sequence[Filter]] = None) -> pd.DataFrame:
+    """
+    Loads results from a Parquet dataset, results.json, a results.jsonl sink or CSV.
+
+    `columns` limits what is read (for Parquet and CSV, other columns are never
+    decoded), and `filters` are (column, op, value) predicates such as
+    ("model", "==", "gpt-4"). On Parquet they are pushed down to partition pruning
+    and row-group statistics.
+    """
+    filters = list(filters or [])
+    if is_parquet(path):
+        _require_pyarrow()
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        dataset = ds.dataset(path, format="parquet", partitioning="hive")
+        wanted = None
+        if columns is not None:
+            wanted = [c for c in columns if c in dataset.schema.names]
+        expression = pq.filters_to_expression(filters) if filters else None
+        df = dataset.to_table(columns=wanted, filter=expression).to_pandas()
+        # Partition keys come back as categoricals; plain strings group like the CSV columns
+        for col in PARTITION_COLS:
+            if col in df.columns:
+                df[col] = df[col].astype(str)
+        return df
+
+    if path.endswith(".csv"):
+        usecols = None
+        if columns is not None:
+            needed = set(columns) | {col for col, _, _ in filters}
+            usecols = lambda c: c in needed
+        df = pd.read_csv(path, usecols=usecols)
+    elif path.endswith(".jsonl"):
+        df = pd.read_json(path, lines=True)
+    else:
+        with open(path, 'r') as f:
+            df = pd.DataFrame(json.load(f))
+
+    df = _apply_filters(df, filters)
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df
@@ -1,47 +1,440 @@
 import sys
 import os
 import argparse
+import cProfile
+import itertools
 import time
-from typing import List, Dict
-import pandas as pd
+from collections import Counter, defaultdict, deque
+from typing import List, Dict, Optional
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from scripts.utils import load_config, load_prompt, load_dataset, save_results
-from models.openai_client import OpenAIClient
-from models.local_model_client import LocalModelClient
-from evaluators.relevance import RelevanceEvaluator
-from evaluators.safety import SafetyEvaluator
-from evaluators.accuracy import AccuracyEvaluator
-from evaluators.clarity import ClarityEvaluator
+from scripts.utils import load_config, save_results, save_evaluator_manifest, load_evaluator_manifest
+from scripts.prompt_templates import PromptTemplate, TemplateRenderer, load_templates
+from scripts.dataset_stream import StreamingDataset
+from scripts.sharding import parse_shard, shard_of, shard_dir, write_shard_manifest
+from scripts.planner import (CellManifestWriter, Plan, GENERATE, RESCORE, REUSE, load_cell_manifest, make_cell,
+                             model_fingerprint, remove_cell_manifest)
+from scripts.sink import JsonlResultSink, load_completed, collect_columns, is_failed, iter_sink, row_key
+from scripts.executor import ordered_map, ordered_amap, get_max_concurrency
+from models.registry import get_provider
+from models.cache import ResponseCache, CachedModelClient, CACHE_MODES
+from models.scheduler import ScheduledModelClient
+from scripts.instrumentation import TIMINGS_FILE, Instrumentation, format_summary, save_summary, timed_iter
+from models.tokens import get_counter, estimate_cost
+from evaluators.registry import EVALUATORS, get_evaluator_class
 
 def get_model(model_conf: Dict):
-    provider = model_conf.get("provider")
-    if provider == "openai":
-        return OpenAIClient(model_conf)
-    elif provider == "local":
-        return LocalModelClient(model_conf)
-    else:
-        raise ValueError(f"Unknown model provider: {provider}")
+    """Client for a models.yaml entry; only the configured provider's module is imported."""
+    return get_provider(model_conf.get("provider"))(model_conf)
+
+def get_evaluators(eval_conf: Dict, models_config: Optional[Dict] = None, cache=None, cache_mode: str = "off",
+                   schedulers: Optional[List] = None) -> Dict:
+    """
+    Enabled evaluators in registry order (then unregistered ones with a `class`), importing only those.
 
-def get_evaluators(eval_conf: Dict) -> Dict:
+    The judge's client is built like any model's (build_client), so its `rate_limit`
+    budget, retries and the response cache apply; its scheduler is appended to `schedulers`.
+    """
     evaluators = {}
-    if eval_conf.get("relevance", {}).get("enabled"):
-        evaluators["relevance"] = RelevanceEvaluator(eval_conf["relevance"])
-    if eval_conf.get("safety", {}).get("enabled"):
-        evaluators["safety"] = SafetyEvaluator(eval_conf["safety"])
-    if eval_conf.get("accuracy", {}).get("enabled"):
-        evaluators["accuracy"] = AccuracyEvaluator(eval_conf["accuracy"])
-    if eval_conf.get("clarity", {}).get("enabled"):
-        evaluators["clarity"] = ClarityEvaluator(eval_conf["clarity"])
+    names = list(EVALUATORS) + [name for name in eval_conf if name not in EVALUATORS]
+    for name in names:
+        conf = eval_conf.get(name) or {}
+        if not conf.get("enabled"):
+            continue
+        evaluator_class = get_evaluator_class(name, conf)
+        if name == "judge":
+            judge_model = conf.get("model")
+            if not models_config or judge_model not in models_config.get("models", {}):
+                raise ValueError(f"Judge model {judge_model} not found in models.yaml")
+            client, scheduler = build_client(models_config["models"][judge_model], cache, cache_mode)
+            if scheduler is not None and schedulers is not None:
+                schedulers.append(scheduler)
+            evaluators[name] = evaluator_class(conf, client=client)
+        else:
+            evaluators[name] = evaluator_class(conf)
     return evaluators
 
-def run():
+def build_row(model, prompt_source: str, item: Dict, response_obj) -> Dict:
+    return {
+        "model": model.model_name,
+        "prompt_source": prompt_source,
+        "query": item["query"],
+        "reference": item.get("reference_answer"),
+        "response": response_obj.content,
+        "latency_ms": response_obj.latency_ms,
+        "prompt_tokens": response_obj.token_usage.prompt_tokens,
+        "completion_tokens": response_obj.token_usage.completion_tokens,
+        "error": response_obj.error,
+    }
+
+def evaluate_rows(rows: List[Dict], evaluators: Dict, instr: Optional[Instrumentation] = None) -> List[Dict]:
+    """Scores a batch of rows in place with each evaluator's evaluate_batch()."""
+    if not rows:
+        return rows
+    queries = [row["query"] for row in rows]
+    responses = [row["response"] for row in rows]
+    references = [row["reference"] for row in rows]
+
+    for ev_name, evaluator in evaluators.items():
+        start = time.perf_counter()
+        batch = evaluator.evaluate_batch(queries, responses, references)
+        if instr is not None:
+            elapsed = time.perf_counter() - start
+            instr.add_stage(f"evaluate:{ev_name}", elapsed)
+            instr.observe(f"evaluator:{ev_name}", elapsed / len(rows))
+        apply_batch(rows, ev_name, batch)
+    return rows
+
+def apply_batch(rows: List[Dict], ev_name: str, batch) -> None:
+    """Writes a BatchEvaluationResult into rows as score_*/reason_* columns."""
+    for row, score, reason in zip(rows, batch.scores, batch.reasons):
+        row[f"score_{ev_name}"] = score
+        row[f"reason_{ev_name}"] = reason
+    for dimension, scores in batch.dimension_scores.items():
+        for row, score in zip(rows, scores):
+            row[f"score_{ev_name}_{dimension}"] = score
+
+def build_client(model_conf: Dict, cache=None, cache_mode: str = "off"):
+    """Model client wrapped with rate limiting and caching as configured. Returns (client, scheduler or None)."""
+    model = get_model(model_conf)
+    scheduler = None
+    if model_conf.get("rate_limit"):
+        model = scheduler = ScheduledModelClient(model, model_conf["rate_limit"])
+    if cache is not None:
+        model = CachedModelClient(model, cache, cache_mode)
+    return model, scheduler
+
+def generate(model, work_items: List, max_concurrency: int, use_async: bool = False,
+             instr: Optional[Instrumentation] = None):
+    """
+    Yields (work_item, response) in work order. Each work item is a
+    (prompt_source, RenderedPrompt, index, record) tuple.
+
+    With `instr`, records per-model latency histograms: "queue:<model>" (submitted
+    until a worker picks it up), "model:<model>" (the whole client call, including
+    rate limiting and the cache) and "overhead:<model>" (the call minus the latency
+    the client reports, i.e. token counting and response model construction).
+    """
+    if instr is None:
+        if use_async:
+            async def agenerate(work_item):
+                rendered = work_item[1]
+                return await model.agenerate(rendered.user, system_prompt=rendered.system)
+            return ordered_amap(agenerate, work_items, max_concurrency)
+
+        def sync_generate(work_item):
+            rendered = work_item[1]
+            return model.generate(rendered.user, system_prompt=rendered.system)
+        return ordered_map(sync_generate, work_items, max_concurrency)
+
+    name = model.model_name
+
+    def observe(submitted: float, start: float, response):
+        elapsed = time.perf_counter() - start
+        instr.observe(f"queue:{name}", start - submitted)
+        instr.observe(f"model:{name}", elapsed)
+        instr.observe(f"overhead:{name}", max(0.0, elapsed - (response.latency_ms or 0) / 1000))
+
+    if use_async:
+        async def agenerate_timed(stamped):
+            submitted, (_, rendered, _, _) = stamped
+            start = time.perf_counter()
+            response = await model.agenerate(rendered.user, system_prompt=rendered.system)
+            observe(submitted, start, response)
+            return response
+        results = ordered_amap(agenerate_timed, ((time.perf_counter(), w) for w in work_items), max_concurrency)
+    else:
+        def generate_timed(stamped):
+            submitted, (_, rendered, _, _) = stamped
+            start = time.perf_counter()
+            response = model.generate(rendered.user, system_prompt=rendered.system)
+            observe(submitted, start, response)
+            return response
+        results = ordered_map(generate_timed, ((time.perf_counter(), w) for w in work_items), max_concurrency)
+    return ((work_item, response) for (_, work_item), response in results)
+
+def estimate_model_run(model_conf: Dict, templates: List[PromptTemplate], datasets, renderer: TemplateRenderer,
+                       default_concurrency: int = 1) -> Dict:
+    """
+    Dry-run estimate for one model without calling it: renders every prompt, counts
+    prompt tokens with the model's offline tokenizer, assumes `expected_completion_tokens`
+    (else `max_tokens`) per response, and prices the total from `pricing`. Wall time is
+    the slowest of latency / max_concurrency, the RPM budget and the TPM budget.
+    """
+    counter = get_counter(model_conf.get("tokenizer"))
+    requests = prompt_tokens = 0
+    for template in templates:
+        for item in datasets:
+            rendered = renderer.render(template, item)
+            prompt_tokens += counter.count_prompt(rendered.user, rendered.system)
+            requests += 1
+    return estimate_work(model_conf, requests, prompt_tokens, default_concurrency)
+
+def estimate_work(model_conf: Dict, requests: int, prompt_tokens: int, default_concurrency: int = 1) -> Dict:
+    """Completion tokens, cost and wall time for `requests` generations with `prompt_tokens` in total."""
+    completion_tokens = requests * model_conf.get("expected_completion_tokens", model_conf.get("max_tokens", 256))
+    max_concurrency = get_max_concurrency(model_conf, default_concurrency)
+    latency_s = model_conf.get("expected_latency_ms", model_conf.get("latency_ms", 1000)) / 1000
+
+    wall_s = requests * latency_s / max_concurrency
+    rate_limit = model_conf.get("rate_limit") or {}
+    if rate_limit.get("rpm"):
+        wall_s = max(wall_s, requests / rate_limit["rpm"] * 60)
+    if rate_limit.get("tpm"):
+        wall_s = max(wall_s, (prompt_tokens + completion_tokens) / rate_limit["tpm"] * 60)
+
+    total_tokens = prompt_tokens + completion_tokens
+    return {
+        "requests": requests,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost_usd": round(estimate_cost(model_conf.get("pricing"), prompt_tokens, completion_tokens), 4),
+        "wall_s": round(wall_s, 1),
+        "tokens_per_minute": int(total_tokens / wall_s * 60) if wall_s else 0,
+    }
+
+def _score_and_write(indexed_rows: List, evaluators: Dict, sink: JsonlResultSink,
+                     instr: Optional[Instrumentation] = None) -> List:
+    # Failed generations are written unscored, as a record of the failure for --resume to retry
+    scored = [row for _, row in indexed_rows if not is_failed(row)]
+    evaluate_rows(scored, evaluators, instr)
+    if instr is not None and len(scored) < len(indexed_rows):
+        instr.count("failed_generations", len(indexed_rows) - len(scored))
+    start = time.perf_counter()
+    for _, row in indexed_rows:
+        sink.write(row)
+    if instr is not None and indexed_rows:
+        instr.add_stage("sink_write", time.perf_counter() - start, calls=len(indexed_rows))
+    return indexed_rows
+
+def plan_run(model_confs: List[Dict], templates: List[PromptTemplate], datasets, renderer: TemplateRenderer,
+             evaluators: Dict, output_dir: str, default_concurrency: int = 1):
+    """
+    Diffs the configured grid against the last completed run in `output_dir` (its
+    cells.jsonl and evaluators.json). Returns the Plan and a work estimate per model
+    for the generations it needs.
+    """
+    fingerprints = {name: ev.fingerprint() for name, ev in evaluators.items()}
+    plan = Plan(load_cell_manifest(output_dir), fingerprints, load_evaluator_manifest(output_dir))
+    estimates = {}
+    for model_conf in model_confs:
+        model_name, model_fp = model_conf.get("model_name", "unknown-model"), model_fingerprint(model_conf)
+        counter = get_counter(model_conf.get("tokenizer"))
+        prompt_tokens = 0
+        for template in templates:
+            for item in datasets:
+                cell = make_cell((model_name, template.id, item["query"]), model_fp, template, item)
+                if plan.add(cell, item) == GENERATE:
+                    rendered = renderer.render(template, item)
+                    prompt_tokens += counter.count_prompt(rendered.user, rendered.system)
+        estimates[model_name] = estimate_work(model_conf, plan.generations[model_name], prompt_tokens, default_concurrency)
+    return plan, estimates
+
+def print_plan(plan: Plan, estimates: Dict[str, Dict], evaluators: Dict):
+    print("\n🗺️  Plan" + ("" if plan.has_prior else " (no previous run: everything is new)") + ":")
+    for kind in ("models", "prompts"):
+        changes = plan.changes(kind)
+        parts = [f"{label}: {', '.join(changes[label])}" for label in ("changed", "added", "removed") if changes[label]]
+        print(f"  {kind}: {'; '.join(parts) or 'unchanged'}")
+    parts = [f"{label}: {', '.join(names)}" for label, names in (
+        ("stale", [n for n in plan.stale_evaluators if n not in plan.added_evaluators]),
+        ("added", plan.added_evaluators), ("removed", plan.removed_evaluators)) if names]
+    print(f"  evaluators: {'; '.join(parts) or 'unchanged'}")
+    reasons = ", ".join(f"{count} {reason}" for reason, count in plan.reasons.most_common() if reason != "unchanged")
+    print(f"  cells: {plan.decisions[REUSE]} reused, {plan.decisions[GENERATE]} to generate, "
+          f"{plan.decisions[RESCORE]} to re-evaluate, {plan.dropped} dropped" + (f" ({reasons})" if reasons else ""))
+    full_rows = plan.decisions[GENERATE] + plan.decisions[RESCORE]
+    print(f"  evaluations: {full_rows} rows x {len(evaluators)} evaluators"
+          + (f" + {plan.decisions[REUSE]} reused rows x {len(plan.stale_evaluators)} stale" if plan.stale_evaluators else ""))
+    for model_name, estimate in estimates.items():
+        if estimate["requests"]:
+            print(f"  {model_name}: {estimate['requests']} generations, ~{estimate['prompt_tokens'] + estimate['completion_tokens']} "
+                  f"tokens, ~${estimate['cost_usd']}, ~{estimate['wall_s']}s")
+
+def carry_over(prev_sink: str, plan: Plan, evaluators: Dict, sink: JsonlResultSink, eval_batch_size: int = 32,
+               instr: Optional[Instrumentation] = None, done: Optional[Counter] = None) -> Counter:
+    """
+    Copies the rows of a previous run that the plan keeps into `sink`: re-evaluated
+    with every evaluator when their record changed, and otherwise only with the
+    stale evaluators. Returns the keys written, to be skipped like resumed rows.
+
+    `done` counts rows per key already in `sink` (a resumed run); that many kept
+    rows of each key are skipped rather than written again.
+    """
+    skip = Counter(done or {})
+    stale = {name: evaluators[name] for name in plan.stale_evaluators}
+    removed = tuple(f"score_{name}" for name in plan.removed_evaluators) + tuple(f"reason_{name}" for name in plan.removed_evaluators)
+    carried: Counter = Counter()
+    batches = {RESCORE: [], REUSE: []}
+
+    def flush(decision):
+        _score_and_write(batches[decision], evaluators if decision == RESCORE else stale, sink, instr)
+        batches[decision] = []
+
+    for row in iter_sink(prev_sink):
+        if is_failed(row):  # regenerated rather than carried
+            continue
+        key = row_key(row)
+        taken = plan.take_prior(key)
+        if taken is None:
+            continue
+        decision, reference = taken
+        if skip[key] > 0:
+            skip[key] -= 1
+            continue
+        for column in [c for c in row if c.startswith(removed)]:
+            del row[column]
+        if decision == RESCORE:
+            row["reference"] = reference
+        carried[key] += 1
+        batches[decision].append((None, row))
+        if len(batches[decision]) >= eval_batch_size:
+            flush(decision)
+    flush(RESCORE)
+    flush(REUSE)
+    return carried
+
+def run_adaptive(clients: List, templates: List[PromptTemplate], datasets: List[Dict],
+                 evaluators: Dict, sink: JsonlResultSink, adaptive_conf: Dict, weights: Dict[str, float],
+                 done_rows: Optional[Dict] = None, use_async: bool = False, eval_batch_size: int = 32,
+                 renderer: Optional[TemplateRenderer] = None, instr: Optional[Instrumentation] = None):
+    """
+    Adaptive sampling: visits queries in a seeded random order, a round at a time,
+    running every still-active (model, prompt) arm on the round's queries. After each
+    round, arms clearly dominated by the leader are retired; the run ends early once a
+    single arm remains. `clients` are (client, model_conf, max_concurrency) triples and
+    `done_rows` holds rows from a previous run to reuse on --resume and `instr`
+    collects stage timings.
+
+    Returns (planned keys in run order, the AdaptiveSampler).
+    """
+    import pandas as pd
+    from scripts.adaptive import AdaptiveSampler, shuffled_order
+    from scripts.stats import weighted_overall
+
+    by_id = {template.id: template for template in templates}
+    renderer = renderer or TemplateRenderer()
+    instr = instr or Instrumentation()
+    by_name = {client.model_name: (client, model_conf, max_concurrency) for client, model_conf, max_concurrency in clients}
+    arms = [(name, template.id) for name in by_name for template in templates]
+    order = shuffled_order(len(datasets), adaptive_conf.get("seed", 0))
+    sampler = AdaptiveSampler(
+        arms,
+        total_queries=len(datasets),
+        round_size=adaptive_conf.get("round_size", 20),
+        confidence=adaptive_conf.get("confidence", 0.95),
+        min_rounds=adaptive_conf.get("min_rounds", 2),
+        n_resamples=adaptive_conf.get("n_resamples", 2000),
+        seed=adaptive_conf.get("seed", 0),
+    )
+    done_rows = done_rows if done_rows is not None else defaultdict(deque)
+    planned_keys = []
+
+    for start in range(0, len(order), sampler.round_size):
+        round_queries = order[start:start + sampler.round_size].tolist()
+        print(f"\n🎯 Round {sampler.rounds + 1}: {len(round_queries)} queries, {len(sampler.active)} active arms")
+        for name, (client, model_conf, max_concurrency) in by_name.items():
+            sources = [source for model_name, source in sampler.active if model_name == name]
+            rows, work_items = [], []
+            for source in sources:
+                for idx in round_queries:
+                    item = datasets[idx]
+                    key = (name, source, item["query"])
+                    planned_keys.append(key)
+                    if done_rows[key]:
+                        rows.append((idx, done_rows[key].popleft()))
+                    else:
+                        with instr.stage("render"):
+                            rendered = renderer.render(by_id[source], item)
+                        work_items.append((source, rendered, idx, item))
+
+            # Score finished rows in small batches while later generations are in flight
+            pending = []
+            generations = generate(client, work_items, max_concurrency, use_async, instr)
+            for (source, _, idx, item), response_obj in timed_iter(generations, instr, "wait_generation"):
+                with instr.stage("build_row"):
+                    pending.append((idx, build_row(client, source, item, response_obj)))
+                if len(pending) >= eval_batch_size:
+                    rows.extend(_score_and_write(pending, evaluators, sink, instr))
+                    pending = []
+            rows.extend(_score_and_write(pending, evaluators, sink, instr))
+
+            if rows:
+                overall = weighted_overall(pd.DataFrame([row for _, row in rows]), weights).tolist()
+                for (idx, row), score in zip(rows, overall):
+                    tokens = (row.get("prompt_tokens") or 0) + (row.get("completion_tokens") or 0)
+                    cost = estimate_cost(model_conf.get("pricing"), row.get("prompt_tokens") or 0, row.get("completion_tokens") or 0)
+                    sampler.record((name, row["prompt_source"]), idx, score, tokens, cost)
+
+        for model_name, source in sampler.end_round():
+            print(f"  ✂️  Dropped {model_name} / {source} (dominated by {' / '.join(sampler.leader())})")
+        if sampler.done:
+            print(f"🏁 {' / '.join(sampler.leader())} is the best arm at {adaptive_conf.get('confidence', 0.95):.0%} confidence; stopping early.")
+            break
+
+    return planned_keys, sampler
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Run Prompt Evaluation Experiment")
     parser.add_argument("--config", default="config/evaluation.yaml", help="Path to evaluation config")
     parser.add_argument("--models-config", default="config/models.yaml", help="Path to models config")
+    parser.add_argument("--max-concurrency", type=int, default=1,
+                        help="Default in-flight generations per model when models.yaml sets no max_concurrency")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Drive generations through agenerate() on an event loop instead of a thread pool")
+    parser.add_argument("--cache-mode", choices=CACHE_MODES, default=None,
+                        help="Override the response cache mode from the evaluation config")
+    parser.add_argument("--eval-batch-size", type=int, default=32,
+                        help="Number of finished rows scored together with evaluate_batch()")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue a previous run, skipping rows already in the results sink")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Evaluate shuffled queries in rounds and stop dominated (model, prompt) arms early")
+    parser.add_argument("--offset", type=int, default=0, help="Skip the first N dataset records")
+    parser.add_argument("--limit", type=int, default=None, help="Use at most N dataset records")
+    parser.add_argument("--sample", type=float, default=None, help="Keep each dataset record with this probability")
+    parser.add_argument("--sample-seed", type=int, default=0, help="Seed for --sample")
+    parser.add_argument("--shard", default=None,
+                        help="Only run work units in shard i/N (0-based), writing to <save_dir>/shards/; merge with merge_shards.py")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Render every prompt and estimate tokens, cost and wall time without calling any model")
+    parser.add_argument("--plan", action="store_true",
+                        help="Diff the config against the last completed run and print the work an --incremental run would do")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only generate and evaluate cells whose model, prompt, record or evaluators changed since the last run "
+                             "(add --resume to continue an interrupted one)")
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="PATH",
+                        help="Profile the run's main thread with cProfile and write a .pstats file "
+                             "(default <results dir>/profile.pstats; view with snakeviz, tuna or flameprof)")
+    return parser
+
+def run():
+    parser = build_parser()
     args = parser.parse_args()
+    if args.profile is None:
+        run_experiment(parser, args)
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        run_dir = run_experiment(parser, args)
+    finally:
+        profiler.disable()
+    path = args.profile or os.path.join(run_dir or ".", "profile.pstats")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    profiler.dump_stats(path)
+    print(f"🔬 Profile written to {path}")
+
+def run_experiment(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Optional[str]:
+    """Runs the experiment described by parsed CLI `args`; returns the directory results were written to."""
+    instr = Instrumentation()
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as e:
+        parser.error(str(e))
 
     # Load Configs
     eval_config = load_config(args.config)
@@ -49,75 +442,224 @@ def run():
 
     print(f"🚀 Starting Experiment: {eval_config.get('experiment_name')}")
     
-    # Initialize Evaluators
-    evaluators = get_evaluators(eval_config.get("evaluators", {}))
+    # Response Cache
+    cache_conf = eval_config.get("cache", {})
+    cache_mode = args.cache_mode or cache_conf.get("mode", "off")
+    cache = None
+    if cache_mode != "off":
+        cache = ResponseCache(
+            cache_conf.get("path", ".cache/responses.sqlite"),
+            max_entries=cache_conf.get("max_entries"),
+            max_age_days=cache_conf.get("max_age_days"),
+        )
+        print(f"💾 Response cache: {cache.path} (mode={cache_mode})")
+
+    # Initialize Evaluators (the judge shares the cache and is rate limited like the models)
+    schedulers = []
+    evaluators = get_evaluators(eval_config.get("evaluators", {}), models_config, cache, cache_mode, schedulers)
     print(f"📋 Loaded Evaluators: {list(evaluators.keys())}")
 
     # Load Data
-    prompts = [load_prompt(p) for p in eval_config["prompts"]]
-    datasets = []
-    for d in eval_config["datasets"]:
-        datasets.extend(load_dataset(d))
-    
-    print(f"📝 Loaded {len(prompts)} prompts and {len(datasets)} queries.")
+    # Each prompt file is compiled once; renders are reused across models while the grid fits the renderer
+    templates = load_templates(eval_config["prompts"])
+    renderer = TemplateRenderer()
+    # Queries are streamed from disk on every pass instead of being loaded up front
+    datasets = StreamingDataset(eval_config["datasets"], offset=args.offset, limit=args.limit,
+                                sample=args.sample, seed=args.sample_seed)
+
+    print(f"📝 Loaded {len(templates)} prompts; streaming queries from {len(datasets.paths)} dataset file(s).")
+
+    output_dir = eval_config["output"]["save_dir"]
+    model_confs = [models_config["models"][key] for key in eval_config["models"] if key in models_config["models"]]
+    plan = None
+    if args.plan or args.incremental:
+        for flag, enabled in (("--shard", shard), ("--adaptive", args.adaptive)):
+            if enabled:
+                parser.error(f"--plan/--incremental cannot be combined with {flag}")
+        plan, estimates = plan_run(model_confs, templates, datasets, renderer, evaluators, output_dir, args.max_concurrency)
+        print_plan(plan, estimates, evaluators)
+        if args.plan:
+            return None
+
+    if args.dry_run:
+        print("\n🧮 Dry run (no model calls):")
+        totals = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+        for model_key in eval_config["models"]:
+            if model_key not in models_config["models"]:
+                print(f"Warning: Model {model_key} not found in models.yaml")
+                continue
+            estimate = estimate_model_run(models_config["models"][model_key], templates, datasets, renderer, args.max_concurrency)
+            print(f"  {model_key}: {estimate['requests']} requests, {estimate['prompt_tokens']} prompt + "
+                  f"~{estimate['completion_tokens']} completion tokens, ~${estimate['cost_usd']}, "
+                  f"~{estimate['wall_s']}s wall time, ~{estimate['tokens_per_minute']} tokens/min")
+            for key in totals:
+                totals[key] += estimate[key]
+        print(f"  Total: {totals['requests']} requests, {totals['prompt_tokens'] + totals['completion_tokens']} tokens, "
+              f"~${round(totals['cost_usd'], 4)}")
+        return None
 
-    results = []
+    # Stream rows to an append-only sink as they complete (one partition per shard)
+    run_dir = shard_dir(output_dir, shard) if shard else output_dir
+    sink_path = os.path.join(run_dir, "results.jsonl")
+    completed = load_completed(sink_path) if args.resume else None
+    if completed:
+        print(f"⏩ Resuming: {sum(completed.values())} rows already in {sink_path}")
+    adaptive_conf = eval_config.get("adaptive", {})
+    adaptive = args.adaptive or adaptive_conf.get("enabled")
+    # Fingerprints of every cell, for the next --plan/--incremental (full-grid runs only)
+    cell_manifest = None if shard or adaptive else CellManifestWriter(output_dir)
+    if plan is None and not shard:
+        # The sink no longer holds the rows the last manifest describes
+        remove_cell_manifest(output_dir)
+    # An incremental run keeps the last completed run's rows (and manifest) until it
+    # finishes. If results.prev.jsonl already exists, a previous incremental run was
+    # interrupted and results.jsonl holds only its partial output: keep the older file.
+    prev_sink = os.path.join(run_dir, "results.prev.jsonl")
+    if plan is not None and not os.path.exists(prev_sink) and os.path.exists(sink_path):
+        os.replace(sink_path, prev_sink)
+    sink = JsonlResultSink(sink_path, resume=args.resume)
+    if plan is not None and os.path.exists(prev_sink):
+        carried = carry_over(prev_sink, plan, evaluators, sink, args.eval_batch_size, instr, completed)
+        completed = (completed or Counter()) + carried
+        print(f"♻️  Carried over {sum(carried.values())} rows from the previous run")
+    planned_keys = []
+    ordinals = []
 
     # Iterate through models defined in evaluation config that are present in models.yaml
     target_models = eval_config["models"]
-    
+    clients = []
     for model_key in target_models:
         if model_key not in models_config["models"]:
             print(f"Warning: Model {model_key} not found in models.yaml")
             continue
-            
+
         model_conf = models_config["models"][model_key]
-        model = get_model(model_conf)
-        print(f"\nrunning model: {model.model_name}...")
+        model, scheduler = build_client(model_conf, cache, cache_mode)
+        if scheduler is not None:
+            schedulers.append(scheduler)
+        clients.append((model, model_conf, get_max_concurrency(model_conf, args.max_concurrency)))
+
+    if adaptive and shard:
+        parser.error("--adaptive needs every arm's scores in one process and cannot be combined with --shard")
+    if adaptive:
+        done_rows = defaultdict(deque)
+        if args.resume:
+            for row in iter_sink(sink_path):
+                if not is_failed(row):
+                    done_rows[row_key(row)].append(row)
+        from scripts.stats import evaluator_weights
+        weights = evaluator_weights(eval_config.get("evaluators", {}))
+        # Shuffling needs random access, so adaptive runs hold the (sampled) queries in memory
+        planned_keys, sampler = run_adaptive(clients, templates, list(datasets), evaluators, sink, adaptive_conf,
+                                             weights, done_rows, args.use_async, args.eval_batch_size, renderer, instr)
+        saved = sampler.savings()
+        print(f"\n💡 Adaptive run: {sampler.rounds} rounds; saved {saved['generations']} generations "
+              f"({saved['generations_pct']}%), ~{saved['tokens']} tokens, ~${saved['cost_usd']} vs. a full run")
+    else:
+        # Global position of each work unit, so merged shards come out in unsharded order
+        unit_counter = itertools.count()
+        for model, model_conf, max_concurrency in clients:
+            print(f"\nrunning model: {model.model_name} (max_concurrency={max_concurrency})...")
+            model_fp = model_fingerprint(model_conf)
 
-        for prompt_template in prompts:
-            for idx, item in enumerate(datasets):
+            # Work units in deterministic (prompt, query) order, minus rows already done.
+            # A generator, so the first generation starts as soon as the first record is read.
+            def work_items(model=model, model_fp=model_fp):
+                for template in templates:
+                    for idx, item in enumerate(datasets):
+                        # Interned, so the plan holds each query once however many passes reread it
+                        key = (model.model_name, template.id, sys.intern(item["query"]))
+                        ordinal = next(unit_counter)
+                        if shard and shard_of(key, shard[1]) != shard[0]:
+                            continue
+                        planned_keys.append(key)
+                        ordinals.append(ordinal)
+                        if cell_manifest is not None:
+                            cell_manifest.write(make_cell(key, model_fp, template, item))
+                        if completed and completed[key] > 0:
+                            completed[key] -= 1
+                            continue
+                        with instr.stage("render"):
+                            rendered = renderer.render(template, item)
+                        yield (template.id, rendered, idx, item)
+
+            generations = generate(model, work_items(), max_concurrency, args.use_async, instr)
+
+            # Score finished rows in small batches while later generations are in flight
+            pending_rows = []
+            for (prompt_source, _, idx, item), response_obj in timed_iter(generations, instr, "wait_generation"):
                 query = item["query"]
-                reference = item.get("reference_answer")
-                
-                # Render Prompt
-                rendered_prompt = prompt_template.replace("{{query}}", query)
-                
-                # Generate
-                print(f"  generating {idx+1}/{len(datasets)}: {query[:30]}...")
-                response_obj = model.generate(rendered_prompt)
-                
-                # Evaluate
-                row = {
-                    "model": model.model_name,
-                    "prompt_source": os.path.basename(eval_config["prompts"][prompts.index(prompt_template)]),
-                    "query": query,
-                    "reference": reference,
-                    "response": response_obj.content,
-                    "latency_ms": response_obj.latency_ms,
-                    "prompt_tokens": response_obj.token_usage.prompt_tokens,
-                    "completion_tokens": response_obj.token_usage.completion_tokens,
-                }
-                
-                for ev_name, evaluator in evaluators.items():
-                    eval_res = evaluator.evaluate(query, response_obj.content, reference)
-                    row[f"score_{ev_name}"] = eval_res.score
-                    row[f"reason_{ev_name}"] = eval_res.reasoning
-
-                results.append(row)
-
-    # Save Results
-    output_dir = eval_config["output"]["save_dir"]
-    save_results(results, output_dir, eval_config["output"]["format"])
-    
-    print(f"\n✅ Experiment Complete. Results saved to {output_dir}/")
+                print(f"  generated #{idx+1}: {query[:30]}...")
+                with instr.stage("build_row"):
+                    pending_rows.append((idx, build_row(model, prompt_source, item, response_obj)))
+                if len(pending_rows) >= args.eval_batch_size:
+                    _score_and_write(pending_rows, evaluators, sink, instr)
+                    pending_rows = []
+            _score_and_write(pending_rows, evaluators, sink, instr)
+
+    sink.close()
+
+    # Save Results in planned order, regardless of how many resumes it took
+    with instr.stage("collect_results"):
+        results, stale = collect_columns(sink_path, planned_keys)
+    if stale:
+        print(f"Warning: ignored {stale} rows in {sink_path} that are not part of this experiment")
+    failed = instr.counters["failed_generations"]
+    if failed:
+        print(f"Warning: {failed} generations failed and are left out of the results; rerun with --resume to retry them")
+    fingerprints = {name: ev.fingerprint() for name, ev in evaluators.items()}
+    if shard:
+        write_shard_manifest(run_dir, shard, list(zip(ordinals, planned_keys)), len(results), fingerprints,
+                             eval_config.get("experiment_name", "default"))
+        print(f"\n✅ Shard {shard[0]}/{shard[1]} Complete. Rows saved to {run_dir}/ "
+              f"(merge with scripts/merge_shards.py once every shard has finished)")
+    else:
+        with instr.stage("save_results"):
+            save_results(results, output_dir, eval_config["output"]["format"], eval_config.get("experiment_name", "default"))
+        save_evaluator_manifest(output_dir, fingerprints)
+        # Drop the previous rows before the new manifest replaces the one they match
+        if os.path.exists(prev_sink):
+            os.remove(prev_sink)
+        if cell_manifest is not None:
+            cell_manifest.commit()
+        print(f"\n✅ Experiment Complete. Results saved to {output_dir}/")
     
+    print(f"🧩 Prompt renders: {renderer.misses} rendered, {renderer.hits} reused across models")
+
+    for scheduler in schedulers:
+        stats = scheduler.stats()
+        print(f"⏱️  {scheduler.model_name}: {stats['requests']} requests, {stats['retries']} retries, "
+              f"{stats['failures']} failed after retries, {stats['throttle_s']}s throttled, {stats['backoff_s']}s backing off")
+
+    judge = evaluators.get("judge")
+    if judge is not None:
+        stats = judge.stats()
+        instr.count("judge_errors", stats["errors"])
+        instr.count("unjudged_rows", stats["unjudged"])
+        print(f"⚖️  Judge: {stats['calls']} calls, {stats['errors']} failed, {stats['unjudged']} rows without a verdict (scored NaN)"
+              + (f"; last error: {stats['last_error']}" if stats["last_error"] else ""))
+
+    if cache is not None:
+        evicted = cache.evict()
+        stats = cache.stats()
+        print(f"💾 Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['writes']} writes, {evicted} evicted")
+        cache.close()
+
     # Simple summary to stdout
-    df = pd.DataFrame(results)
-    score_cols = [c for c in df.columns if c.startswith("score_")]
+    score_cols = [c for c in results.columns if c.startswith("score_")]
     if score_cols:
+        df = results.to_frame(["model", *score_cols])
         print("\n📊 Summary Statistics:")
         print(df.groupby("model")[score_cols].mean())
 
+    instr.count("rows", len(results))
+    instr.count("renders", renderer.misses)
+    instr.count("render_cache_hits", renderer.hits)
+    timings = instr.summary()
+    save_summary(timings, os.path.join(run_dir, TIMINGS_FILE))
+    print(f"\n⏱️  Timings (saved to {os.path.join(run_dir, TIMINGS_FILE)}):")
+    print(format_summary(timings))
+    return run_dir
+
 if __name__ == "__main__":
     run()
@@ -0,0 +1,51 @@
+import sys
+import os
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.utils import load_config
+from scripts.sharding import shard_dir
+from scripts.merge_shards import merge
+
+RUN_EXPERIMENT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_experiment.py")
+
+def run_shard(index: int, num_shards: int, output_dir: str, extra_args: list) -> int:
+    """Runs one shard as its own Python process, logging to <shard dir>/run.log."""
+    log_dir = shard_dir(output_dir, (index, num_shards))
+    os.makedirs(log_dir, exist_ok=True)
+    with open(os.path.join(log_dir, "run.log"), 'w') as log:
+        return subprocess.run(
+            [sys.executable, RUN_EXPERIMENT, *extra_args, "--shard", f"{index}/{num_shards}"],
+            stdout=log, stderr=subprocess.STDOUT,
+        ).returncode
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run an experiment as N shard processes on this machine, then merge them. "
+                    "Unrecognised arguments are passed to run_experiment.py.")
+    parser.add_argument("--config", default="config/evaluation.yaml", help="Path to evaluation config")
+    parser.add_argument("--num-shards", type=int, default=os.cpu_count(), help="Number of shards")
+    parser.add_argument("--workers", type=int, default=None, help="Shards running at once (default: all)")
+    args, extra = parser.parse_known_args()
+
+    output_dir = load_config(args.config)["output"]["save_dir"]
+    forwarded = ["--config", args.config, *extra]
+    workers = args.workers or args.num_shards
+    print(f"🚀 Running {args.num_shards} shards ({workers} at a time); logs in {output_dir}/shards/*/run.log")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        codes = list(pool.map(lambda i: run_shard(i, args.num_shards, output_dir, forwarded), range(args.num_shards)))
+
+    failed = [i for i, code in enumerate(codes) if code != 0]
+    if failed:
+        print(f"❌ Shards {failed} failed; re-run them with --shard i/{args.num_shards} --resume, then merge_shards.py")
+        sys.exit(1)
+    if not merge(args.config):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
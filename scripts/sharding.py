@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Tuple
+
+from scripts.sink import RowKey, is_failed, iter_sink, row_key
+
+SHARDS_DIR = "shards"
+SHARD_MANIFEST = "shard.json"
+PLAN_FILE = "plan.jsonl"
+
+Shard = Tuple[int, int]  # (index, count)
+
+def parse_shard(spec: str) -> Shard:
+    """Parses "i/N" (0 <= i < N)."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}': expected i/N, e.g. 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}': need 0 <= i < N")
+    return index, count
+
+def shard_of(key: RowKey, count: int) -> int:
+    """Stable shard for a (model, prompt id, query) work unit; identical on every machine and Python run."""
+    digest = hashlib.blake2b(json.dumps(list(key)).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+def shard_dir(output_dir: str, shard: Shard) -> str:
+    index, count = shard
+    return os.path.join(output_dir, SHARDS_DIR, f"shard-{index:03d}-of-{count:03d}")
+
+def write_shard_manifest(run_dir: str, shard: Shard, plan: List[Tuple[int, RowKey]], completed: int,
+                         fingerprints: Dict[str, str], experiment: str):
+    """
+    Records what a shard was supposed to produce: its plan (global ordinal + key per
+    work unit, so merged rows come out in unsharded order) and a summary manifest.
+    """
+    with open(os.path.join(run_dir, PLAN_FILE), 'w') as f:
+        for ordinal, key in plan:
+            f.write(json.dumps([ordinal, *key]) + "\n")
+    with open(os.path.join(run_dir, SHARD_MANIFEST), 'w') as f:
+        json.dump({
+            "shard": shard[0],
+            "num_shards": shard[1],
+            "experiment": experiment,
+            "planned": len(plan),
+            "completed": completed,
+            "evaluators": fingerprints,
+        }, f, indent=2, sort_keys=True)
+
+def find_shards(root: str) -> List[str]:
+    """Shard directories under `root` (any layout, e.g. copied in from several machines)."""
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        if SHARD_MANIFEST in filenames:
+            found.append(dirpath)
+    return sorted(found)
+
+def merge_shards(root: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Merges shard result partitions into one result set in global plan order.
+
+    Validates that every shard of the run is present, that all shards used the same
+    evaluator versions, and that every planned work unit has a row. Rows repeated
+    in a sink (e.g. re-written after a resume) are dropped. Returns (rows, report);
+    the merge is complete only if report["complete"] is True.
+    """
+    manifests, ordered, errors = [], [], []
+    duplicates = 0
+    missing_rows = 0
+    for path in find_shards(root):
+        with open(os.path.join(path, SHARD_MANIFEST), 'r') as f:
+            manifests.append(json.load(f))
+
+        by_key: Dict[RowKey, deque] = defaultdict(deque)
+        for row in iter_sink(os.path.join(path, "results.jsonl")):
+            if not is_failed(row):  # counted as missing, so the shard has to be resumed
+                by_key[row_key(row)].append(row)
+        with open(os.path.join(path, PLAN_FILE), 'r') as f:
+            for line in f:
+                ordinal, *key = json.loads(line)
+                key = tuple(key)
+                if by_key[key]:
+                    ordered.append((ordinal, by_key[key].popleft()))
+                else:
+                    missing_rows += 1
+        duplicates += sum(len(rows) for rows in by_key.values())
+
+    counts = {m["num_shards"] for m in manifests}
+    if len(counts) > 1:
+        errors.append(f"shards come from runs with different shard counts: {sorted(counts)}")
+    expected = max(counts) if counts else 0
+    present = sorted({m["shard"] for m in manifests})
+    missing_shards = sorted(set(range(expected)) - set(present))
+    if missing_shards:
+        errors.append(f"missing shards: {missing_shards}")
+    if len(present) < len(manifests):
+        errors.append("the same shard appears more than once")
+    if len({m["experiment"] for m in manifests}) > 1:
+        errors.append("shards belong to different experiments")
+    if len({json.dumps(m["evaluators"], sort_keys=True) for m in manifests}) > 1:
+        errors.append("shards were scored with different evaluator versions")
+    if missing_rows:
+        errors.append(f"{missing_rows} planned rows have no result")
+
+    ordered.sort(key=lambda pair: pair[0])
+    report = {
+        "shards": len(manifests),
+        "expected_shards": expected,
+        "missing_shards": missing_shards,
+        "rows": len(ordered),
+        "missing_rows": missing_rows,
+        "duplicates": duplicates,
+        "evaluators": manifests[0]["evaluators"] if manifests else {},
+        "errors": errors,
+        "complete": bool(manifests) and not errors,
+    }
+    return [row for _, row in ordered], report
@@ -0,0 +1,170 @@
+import json
+import os
+from collections import Counter, deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+RowKey = Tuple[str, str, str]
+
+def row_key(row: Dict[str, Any]) -> RowKey:
+    """Identity of a result row: (model, prompt source, query)."""
+    return (row["model"], row["prompt_source"], row["query"])
+
+def iter_sink(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yields rows from an append-only JSONL sink.
+    A truncated trailing line (e.g. from a crash mid-write) is ignored.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            if line.strip():
+                yield json.loads(line)
+
+def is_failed(row: Dict[str, Any]) -> bool:
+    """A row whose generation failed (after any retries); resumes regenerate it."""
+    return bool(row.get("error"))
+
+def load_completed(path: str) -> Counter:
+    """Counts finished rows per (model, prompt source, query) key; failed generations are not finished."""
+    return Counter(row_key(row) for row in iter_sink(path) if not is_failed(row))
+
+class JsonlResultSink:
+    """
+    Append-only JSONL writer. Each row is flushed as soon as it is written, so a
+    crashed run keeps every completed row and can be resumed.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if resume:
+            self._drop_partial_line()
+            self._f = open(path, 'a')
+        else:
+            self._f = open(path, 'w')
+
+    def _drop_partial_line(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def write(self, row: Dict[str, Any]):
+        self._f.write(json.dumps(row) + "\n")
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_MISSING = object()
+
+class ResultColumns:
+    """
+    Result rows stored column-wise: one list per column instead of one dict per row.
+    A dict per row costs several hundred bytes before any values are stored, which
+    dominates memory for large runs; columns also turn into a DataFrame without a
+    per-row conversion. Rows that lack a column hold a sentinel, so `rows()` gives
+    back the original dicts.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, List[Any]] = {}
+        self._sparse = set()
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, row: Dict[str, Any]):
+        n = self._len
+        for name, value in row.items():
+            column = self.columns.get(name)
+            if column is None:
+                column = self.columns[name] = [_MISSING] * n
+                if n:
+                    self._sparse.add(name)
+            column.append(value)
+        if len(row) < len(self.columns):
+            for name, column in self.columns.items():
+                if len(column) == n:
+                    column.append(_MISSING)
+                    self._sparse.add(name)
+        self._len += 1
+
+    def reorder(self, order: List[int]):
+        """Keeps only the rows at `order`, in that order (one column at a time, so memory stays flat)."""
+        for name in self.columns:
+            column = self.columns[name]
+            self.columns[name] = [column[i] for i in order]
+        self._len = len(order)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield {name: value for name, value in zip(names, values) if value is not _MISSING}
+
+    def to_frame(self, columns: Optional[List[str]] = None):
+        """DataFrame of all (or the given) columns; missing values become None."""
+        import pandas as pd
+        names = [name for name in (columns or self.columns) if name in self.columns]
+        return pd.DataFrame({
+            name: [None if v is _MISSING else v for v in self.columns[name]] if name in self._sparse else self.columns[name]
+            for name in names
+        }, index=pd.RangeIndex(self._len))
+
+def collect_columns(path: str, planned_keys: List[RowKey]) -> Tuple[ResultColumns, int]:
+    """
+    Reads the sink back in planned (deterministic) order, so a resumed run produces
+    the same output as an uninterrupted one. Failed generations are left out, so
+    their keys stay missing until a resume regenerates them. Returns (rows as
+    ResultColumns, number of stale rows in the sink that are not part of the current plan).
+    """
+    columns = ResultColumns()
+    # Sink position of each key; a deque only for keys written more than once (e.g. across resumes)
+    positions: Dict[RowKey, Any] = {}
+    index = -1
+    for row in iter_sink(path):
+        if is_failed(row):
+            continue
+        index += 1
+        columns.append(row)
+        key = row_key(row)
+        seen = positions.get(key)
+        if seen is None:
+            positions[key] = index
+        elif isinstance(seen, int):
+            positions[key] = deque([seen, index])
+        else:
+            seen.append(index)
+
+    order = []
+    for key in planned_keys:
+        seen = positions.get(key)
+        if seen is None:
+            continue
+        if isinstance(seen, int):
+            order.append(seen)
+            del positions[key]
+        else:
+            order.append(seen.popleft())
+            if not seen:
+                del positions[key]
+    stale = sum(1 if isinstance(seen, int) else len(seen) for seen in positions.values())
+    columns.reorder(order)
+    return columns, stale
+
+def collect_results(path: str, planned_keys: List[RowKey]) -> Tuple[List[Dict[str, Any]], int]:
+    """`collect_columns` with the rows as a list of dicts."""
+    columns, stale = collect_columns(path, planned_keys)
+    return list(columns.rows()), stale
@@ -0,0 +1,198 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Above this many distinct values, resampling falls back to drawing row indices
+MAX_DISTINCT_VALUES = 4096
+
+# Caps the (resamples x rows) index matrix drawn at once by the fallback path
+INDEX_CHUNK_CELLS = 10_000_000
+
+def evaluator_weights(eval_conf: Dict) -> Dict[str, float]:
+    """Weight per enabled evaluator from the `evaluators` section of evaluation.yaml."""
+    return {
+        name: float(conf.get("weight", 1.0))
+        for name, conf in (eval_conf or {}).items()
+        if conf.get("enabled", True)
+    }
+
+def weighted_overall(df: pd.DataFrame, weights: Optional[Dict[str, float]] = None) -> pd.Series:
+    """
+    Weighted mean of the score_<evaluator> columns per row, rounded like evaluator scores.
+    Missing scores drop out of both numerator and denominator. Without weights every
+    score_* column counts equally.
+    """
+    if weights:
+        cols = [f"score_{name}" for name in weights if f"score_{name}" in df.columns]
+        w = np.array([weights[c[len("score_"):]] for c in cols], dtype=float)
+    else:
+        cols = [c for c in df.columns if c.startswith("score_")]
+        w = np.ones(len(cols))
+    scores = df[cols].to_numpy(dtype=float)
+    present = ~np.isnan(scores)
+    total = (np.where(present, scores, 0.0) * w).sum(axis=1)
+    weight_sum = (present * w).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        overall = np.where(weight_sum > 0, total / weight_sum, np.nan)
+    return pd.Series(np.round(overall, 2), index=df.index, name="overall_score")
+
+def paired_matrix(df: pd.DataFrame, value: str = "overall_score", keys: Sequence[str] = ("model", "query"),
+                  arm: str = "prompt_source") -> pd.DataFrame:
+    """One row per paired unit (e.g. model x query), one column per prompt; repeats are averaged."""
+    keys = [k for k in keys if k in df.columns]
+    return df.groupby([*keys, arm])[value].mean().unstack(arm)
+
+def _distinct(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return np.unique(values, return_counts=True)
+
+def bootstrap_means(values: np.ndarray, n_resamples: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Means of `n_resamples` bootstrap resamples of `values`, vectorized.
+
+    Scores live on a 0.01 grid, so a sample has few distinct values: resampling n rows
+    is then the same as drawing multinomial counts over those values, which costs
+    (resamples x distinct values) instead of (resamples x rows).
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n == 0:
+        return np.full(n_resamples, np.nan)
+    distinct, counts = _distinct(values)
+    if len(distinct) <= MAX_DISTINCT_VALUES:
+        return rng.multinomial(n, counts / n, size=n_resamples) @ distinct / n
+    out = np.empty(n_resamples)
+    step = max(1, INDEX_CHUNK_CELLS // n)
+    for start in range(0, n_resamples, step):
+        size = min(step, n_resamples - start)
+        out[start:start + size] = values[rng.integers(0, n, size=(size, n))].mean(axis=1)
+    return out
+
+def bootstrap_ci(values: np.ndarray, n_resamples: int = 10_000, alpha: float = 0.05,
+                 rng: Optional[np.random.Generator] = None) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval for the mean."""
+    rng = rng or np.random.default_rng()
+    means = bootstrap_means(values, n_resamples, rng)
+    lo, hi = np.quantile(means, [alpha / 2, 1 - alpha / 2])
+    return float(lo), float(hi)
+
+def sign_flip_pvalue(diffs: np.ndarray, n_resamples: int = 10_000, rng: Optional[np.random.Generator] = None) -> float:
+    """
+    Two-sided paired permutation test of mean(diffs) == 0, randomly flipping the sign
+    of each paired difference. Flips are drawn per distinct |diff| as binomial counts,
+    so the cost does not grow with the number of rows.
+    """
+    rng = rng or np.random.default_rng()
+    diffs = np.asarray(diffs, dtype=float)
+    diffs = diffs[diffs != 0]
+    if len(diffs) == 0:
+        return 1.0
+    observed = abs(diffs.sum())
+    magnitude, counts = _distinct(np.abs(diffs))
+    if len(magnitude) <= MAX_DISTINCT_VALUES:
+        positives = rng.binomial(counts, 0.5, size=(n_resamples, len(counts)))
+        sums = (2 * positives - counts) @ magnitude
+    else:
+        sums = np.empty(n_resamples)
+        step = max(1, INDEX_CHUNK_CELLS // len(diffs))
+        for start in range(0, n_resamples, step):
+            size = min(step, n_resamples - start)
+            signs = rng.integers(0, 2, size=(size, len(diffs)), dtype=np.int8) * 2 - 1
+            sums[start:start + size] = signs @ np.abs(diffs)
+    # Tolerance keeps float noise from hiding ties with the observed sum
+    extreme = np.count_nonzero(np.abs(sums) >= observed - 1e-9)
+    return float((extreme + 1) / (n_resamples + 1))
+
+def holm(pvalues: Sequence[float]) -> np.ndarray:
+    """Holm-Bonferroni adjusted p-values (family-wise error control across prompt pairs)."""
+    p = np.asarray(pvalues, dtype=float)
+    m = len(p)
+    if m == 0:
+        return p
+    order = np.argsort(p)
+    adjusted = np.maximum.accumulate((m - np.arange(m)) * p[order])
+    out = np.empty(m)
+    out[order] = np.minimum(adjusted, 1.0)
+    return out
+
+def prompt_summary(matrix: pd.DataFrame, n_resamples: int = 10_000, alpha: float = 0.05,
+                   rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
+    """Mean overall score per prompt with a bootstrap CI, best first."""
+    rng = rng or np.random.default_rng()
+    rows = []
+    for prompt in matrix.columns:
+        values = matrix[prompt].dropna().to_numpy()
+        lo, hi = bootstrap_ci(values, n_resamples, alpha, rng)
+        rows.append({"prompt_source": prompt, "n": len(values), "mean": values.mean() if len(values) else np.nan,
+                     "ci_low": lo, "ci_high": hi})
+    return pd.DataFrame(rows).sort_values("mean", ascending=False, kind="stable").set_index("prompt_source")
+
+def compare_pairs(matrix: pd.DataFrame, n_resamples: int = 10_000, alpha: float = 0.05,
+                  rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
+    """
+    Paired comparison of every prompt pair on the units both were scored on:
+    mean difference (a - b), its bootstrap CI, a sign-flip p-value and the
+    Holm-adjusted p-value across all pairs.
+    """
+    rng = rng or np.random.default_rng()
+    prompts = list(matrix.columns)
+    rows = []
+    for i, a in enumerate(prompts):
+        for b in prompts[i + 1:]:
+            pair = matrix[[a, b]].dropna()
+            diffs = np.round((pair[a] - pair[b]).to_numpy(), 2)
+            if len(diffs) == 0:
+                rows.append({"prompt_a": a, "prompt_b": b, "n": 0, "mean_diff": np.nan,
+                             "ci_low": np.nan, "ci_high": np.nan, "p_value": 1.0})
+                continue
+            lo, hi = bootstrap_ci(diffs, n_resamples, alpha, rng)
+            rows.append({"prompt_a": a, "prompt_b": b, "n": len(diffs), "mean_diff": diffs.mean(),
+                         "ci_low": lo, "ci_high": hi, "p_value": sign_flip_pvalue(diffs, n_resamples, rng)})
+    pairs = pd.DataFrame(rows, columns=["prompt_a", "prompt_b", "n", "mean_diff", "ci_low", "ci_high", "p_value"])
+    pairs["p_holm"] = holm(pairs["p_value"].to_numpy())
+    pairs["significant"] = pairs["p_holm"] < alpha
+    return pairs
+
+def sequential_compare(matrix: pd.DataFrame, looks: int = 5, alpha: float = 0.05, n_resamples: int = 2_000,
+                       seed: Optional[int] = None) -> Dict:
+    """
+    Sequential early stopping: visits the paired units in a seeded random order and,
+    at `looks` evenly spaced checkpoints, tests whether the current leader beats every
+    other prompt. Each look spends alpha / looks (Bonferroni), so stopping at the first
+    significant look keeps the overall false-winner rate below alpha.
+
+    Returns the winner (or None), the units used and the look it stopped at.
+    """
+    rng = np.random.default_rng(seed)
+    complete = matrix.dropna()
+    total = len(complete)
+    result = {"winner": None, "n_used": total, "n_total": total, "look": looks, "stopped_early": False}
+    if total == 0 or complete.shape[1] < 2:
+        return result
+
+    values = complete.to_numpy(dtype=float)[rng.permutation(total)]
+    prompts = list(complete.columns)
+    per_look_alpha = alpha / looks
+    checkpoints = np.unique(np.linspace(total / looks, total, looks).astype(int).clip(1, total))
+    for look, n in enumerate(checkpoints, start=1):
+        seen = values[:n]
+        leader = int(np.argmax(seen.mean(axis=0)))
+        pvalues = [
+            sign_flip_pvalue(np.round(seen[:, leader] - seen[:, j], 2), n_resamples, rng)
+            for j in range(len(prompts)) if j != leader
+        ]
+        if max(pvalues) < per_look_alpha:
+            result.update(winner=prompts[leader], n_used=int(n), look=look, stopped_early=bool(n < total))
+            return result
+    return result
+
+def format_pairs(pairs: pd.DataFrame) -> List[str]:
+    """Human-readable lines for compare_pairs() output."""
+    lines = []
+    for p in pairs.itertuples(index=False):
+        verdict = "significant" if p.significant else "not significant"
+        lines.append(
+            f"{p.prompt_a} vs {p.prompt_b}: Δ={p.mean_diff:+.3f} "
+            f"[{p.ci_low:+.3f}, {p.ci_high:+.3f}] n={p.n} p={p.p_value:.4f} (Holm {p.p_holm:.4f}, {verdict})"
+        )
+    return lines
@@ -1,7 +1,10 @@
 import yaml
 import json
 import os
-from typing import List, Dict, Any
+import textwrap
+from typing import Any, Dict, Iterable, List, Union
+
+from scripts.sink import ResultColumns
 
 def load_config(path: str) -> Dict[str, Any]:
     with open(path, 'r') as f:
@@ -12,22 +15,68 @@ def load_prompt(path: str) -> str:
         return f.read()
 
 def load_dataset(path: str) -> List[Dict[str, str]]:
-    data = []
-    with open(path, 'r') as f:
-        for line in f:
-            if line.strip():
-                data.append(json.loads(line))
-    return data
+    """Reads a whole (optionally compressed) JSONL file; use StreamingDataset to iterate lazily."""
+    from scripts.dataset_stream import iter_jsonl
+    return list(iter_jsonl(path))
 
-def save_results(results: List[Dict[str, Any]], output_dir: str, format: str = "json"):
+def save_results(results: Union[List[Dict[str, Any]], ResultColumns], output_dir: str, format: str = "json",
+                 experiment: str = "default"):
+    """Saves rows given as a list of dicts or as ResultColumns (converted to rows or a DataFrame only here)."""
     os.makedirs(output_dir, exist_ok=True)
-    
+    columnar = isinstance(results, ResultColumns)
+
+    if format == "parquet":
+        # Columnar, partitioned by experiment/model/prompt; no row-oriented CSV copy
+        from scripts.results_store import write_parquet_results
+        write_parquet_results(results.to_frame() if columnar else results, os.path.join(output_dir, "results.parquet"), experiment)
+        return
+
     if format == "json":
-        with open(os.path.join(output_dir, "results.json"), 'w') as f:
-            json.dump(results, f, indent=2)
-    
+        write_json_rows(results.rows() if columnar else results, os.path.join(output_dir, "results.json"))
+
     # Simple CSV export
     if format == "csv" or True: # always do CSV too
         import pandas as pd
-        df = pd.DataFrame(results)
+        df = results.to_frame() if columnar else pd.DataFrame(results)
         df.to_csv(os.path.join(output_dir, "results.csv"), index=False)
+
+def write_json_rows(rows: Iterable[Dict[str, Any]], path: str):
+    """Writes the same bytes as json.dump(list(rows), f, indent=2), one row at a time."""
+    with open(path, 'w') as f:
+        first = True
+        for row in rows:
+            f.write("[\n" if first else ",\n")
+            f.write(textwrap.indent(json.dumps(row, indent=2), "  "))
+            first = False
+        f.write("[]" if first else "\n]")
+
+def load_results(path: str) -> List[Dict[str, Any]]:
+    """Loads result rows from results.json, a results.jsonl sink, results.csv or a Parquet dataset."""
+    from scripts.results_store import is_parquet, read_results
+    if is_parquet(path):
+        df = read_results(path)
+        return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    if path.endswith(".jsonl"):
+        return load_dataset(path)
+    if path.endswith(".json"):
+        with open(path, 'r') as f:
+            return json.load(f)
+    import pandas as pd
+    df = pd.read_csv(path)
+    # CSV turns missing values into NaN; restore None so evaluators see "no reference"
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+EVALUATOR_MANIFEST = "evaluators.json"
+
+def save_evaluator_manifest(output_dir: str, fingerprints: Dict[str, str]):
+    """Records which evaluator version produced each score_* column."""
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, EVALUATOR_MANIFEST), 'w') as f:
+        json.dump(fingerprints, f, indent=2, sort_keys=True)
+
+def load_evaluator_manifest(output_dir: str) -> Dict[str, str]:
+    path = os.path.join(output_dir, EVALUATOR_MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
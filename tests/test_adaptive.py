@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from scripts.adaptive import AdaptiveSampler, RunningStats, shuffled_order
+from models.tokens import estimate_cost
+
+class TestAdaptive(unittest.TestCase):
+
+    def test_running_stats(self):
+        values = [3.0, 5.0, 8.5, 1.0]
+        stats = RunningStats()
+        for v in values:
+            stats.update(v)
+        self.assertEqual(stats.n, 4)
+        self.assertAlmostEqual(stats.mean, np.mean(values))
+        self.assertAlmostEqual(stats.std, np.std(values, ddof=1))
+
+    def test_estimate_cost_and_order(self):
+        self.assertAlmostEqual(estimate_cost({"prompt_per_1k": 0.01, "completion_per_1k": 0.03}, 1000, 500), 0.025)
+        self.assertEqual(estimate_cost(None, 1000, 500), 0.0)
+        np.testing.assert_array_equal(shuffled_order(10, 7), shuffled_order(10, 7))
+        self.assertEqual(sorted(shuffled_order(10, 7).tolist()), list(range(10)))
+
+    def _run(self, gaps, total=200, **kwargs):
+        rng = np.random.default_rng(0)
+        arms = [("m", f"p{i}") for i in range(len(gaps))]
+        sampler = AdaptiveSampler(arms, total_queries=total, round_size=20, seed=0, **kwargs)
+        for start in range(0, total, sampler.round_size):
+            for q in range(start, start + sampler.round_size):
+                base = rng.uniform(2, 8)
+                for arm, gap in zip(arms, gaps):
+                    if arm in sampler.active:
+                        sampler.record(arm, q, round(base + gap + rng.normal(0, 0.3), 2), tokens=100, cost=0.01)
+            sampler.end_round()
+            if sampler.done:
+                break
+        return sampler
+
+    def test_drops_dominated_arms_and_reports_savings(self):
+        sampler = self._run([2.0, 0.0, 0.0])
+        self.assertTrue(sampler.done)
+        self.assertEqual(sampler.active, [("m", "p0")])
+        self.assertLess(sampler.rounds, 10)
+
+        saved = sampler.savings()
+        done = sum(len(s) for s in sampler.scores.values())
+        self.assertEqual(saved["generations"], 3 * 200 - done)
+        self.assertEqual(saved["tokens"], 100 * saved["generations"])
+        self.assertAlmostEqual(saved["cost_usd"], 0.01 * saved["generations"])
+
+    def test_keeps_arms_that_are_not_clearly_worse(self):
+        sampler = self._run([0.0, 0.0], min_rounds=1)
+        self.assertEqual(len(sampler.active), 2)
+        self.assertEqual(sampler.savings()["generations"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+import yaml
+from scripts.analyze_failures import (
+    DEFAULT_CATEGORIES, analyze, metric_thresholds, failure_mask, failure_criteria, categorize, top_k_failures
+)
+
+class TestAnalyzeFailures(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "model": ["m1", "m1", "m2", "m2"],
+            "prompt_source": ["p.md"] * 4,
+            "query": ["q1", "q2", "q3", "q4"],
+            "response": ["Sorry, I cannot help.", "ok", "A fine answer here.", np.nan],
+            "score_relevance": [2.0, 8.0, 9.0, 1.0],
+            "score_safety": [10.0, 10.0, 0.0, 10.0],
+        })
+        self.score_cols = ["score_relevance", "score_safety"]
+
+    def test_thresholds_and_criteria(self):
+        limits = metric_thresholds(self.score_cols, {"safety": 10.0}, 5.0)
+        np.testing.assert_array_equal(limits, [5.0, 10.0])
+
+        mask = failure_mask(self.df, self.score_cols, limits)
+        self.assertEqual(mask.any(axis=1).tolist(), [True, False, True, True])
+
+        criteria = failure_criteria(self.df, mask)
+        self.assertEqual(criteria.tolist(), ["score_relevance (2.0)", "", "score_safety (0.0)", "score_relevance (1.0)"])
+
+        both = failure_mask(self.df, self.score_cols, np.array([5.0, 20.0]))
+        self.assertEqual(failure_criteria(self.df, both)[0], "score_relevance (2.0), score_safety (10.0)")
+
+    def test_categorize_matches_original_rules(self):
+        cats = categorize(self.df["response"], DEFAULT_CATEGORIES)
+        self.assertEqual(cats.tolist(), ["Refusal", "Empty", "Other", "Empty"])
+
+        custom = categorize(self.df["response"], [{"name": "Short", "max_length": 2}, {"name": "Fine", "pattern": "fine"}])
+        self.assertEqual(custom.tolist(), ["Other", "Short", "Fine", "Short"])
+
+    def test_top_k_uses_severity_order(self):
+        severity = pd.Series([3.0, 0.5, 10.0, 4.0], index=self.df.index)
+        top = top_k_failures(self.df, severity, 2)
+        self.assertEqual(top["query"].tolist(), ["q3", "q4"])
+        self.assertEqual(len(top_k_failures(self.df, severity, 10)), 4)
+
+    def test_threshold_flag_overrides_config_default(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            results, config = os.path.join(tmp, "results.json"), os.path.join(tmp, "evaluation.yaml")
+            self.df.to_json(results, orient="records")
+            with open(config, "w") as f:
+                yaml.safe_dump({"analysis": {"default_threshold": 5.0, "thresholds": {"safety": 10.0}}}, f)
+
+            def failures(*flags):
+                argv = ["analyze_failures.py", "--results", results, "--config", config, *flags]
+                with mock.patch.object(sys, "argv", argv), mock.patch("builtins.print") as printed:
+                    analyze()
+                return next(c.args[0] for c in printed.call_args_list if "Found" in str(c.args[0]))
+
+            self.assertIn("Found 3 failures", failures())
+            self.assertIn("Found 4 failures", failures("--threshold", "9"))
+
+if __name__ == '__main__':
+    unittest.main()
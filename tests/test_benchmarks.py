@@ -0,0 +1,29 @@
+import unittest
+from benchmarks.bench_pipeline import compare_to_baseline
+from benchmarks.synthetic import make_dataset, make_responses, make_results_frame
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_baseline_comparison_respects_metric_direction(self):
+        baseline = {"evaluator.safety.rows_per_s": 1000.0, "analysis.compare_prompts_s": 2.0, "analysis.rows": 10.0}
+        ok = {"evaluator.safety.rows_per_s": 850.0, "analysis.compare_prompts_s": 2.3, "analysis.rows": 99.0}
+        self.assertEqual(compare_to_baseline(ok, baseline, 0.2), [])
+
+        slow = {"evaluator.safety.rows_per_s": 700.0, "analysis.compare_prompts_s": 3.0, "new.metric_per_s": 1.0}
+        regressions = compare_to_baseline(slow, baseline, 0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("evaluator.safety.rows_per_s"))
+
+    def test_synthetic_generators(self):
+        records = make_dataset(10, seed=1)
+        self.assertEqual(records, make_dataset(10, seed=1))
+        self.assertEqual(len({r["query"] for r in records}), 10)
+        self.assertEqual(len(make_responses(records, 30)), 10)
+
+        df = make_results_frame(600, seed=1)
+        self.assertEqual(len(df), 600)
+        self.assertEqual(df.groupby(["model", "prompt_source"]).size().tolist(), [100] * 6)
+        self.assertTrue(df["score_accuracy"].between(0, 10).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import time
+import unittest
+from typing import Optional
+from models.base_model import BaseModelClient, LLMResponse
+from models.cache import ResponseCache, CachedModelClient, cache_key
+
+class CountingClient(BaseModelClient):
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(content=f"answer #{self.calls}", model_name=self.model_name)
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self.tmp.name, "cache.sqlite"))
+        self.client = CountingClient({"model_name": "m", "temperature": 0.7, "max_tokens": 64})
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_key_depends_on_generation_params(self):
+        conf = {"model_name": "m", "temperature": 0.7, "max_tokens": 64}
+        base = cache_key(conf, "p")
+        self.assertEqual(base, cache_key(dict(conf), "p"))
+        self.assertNotEqual(base, cache_key(conf, "p", system_prompt="s"))
+        self.assertNotEqual(base, cache_key({**conf, "temperature": 0.0}, "p"))
+        self.assertNotEqual(base, cache_key(conf, "p", max_tokens=10))
+
+    def test_read_through(self):
+        cached = CachedModelClient(self.client, self.cache, "read_through")
+        first = cached.generate("p")
+        second = cached.generate("p")
+        self.assertEqual(self.client.calls, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "writes": 1})
+
+    def test_write_only_and_refresh(self):
+        CachedModelClient(self.client, self.cache, "write_only").generate("p")
+        CachedModelClient(self.client, self.cache, "write_only").generate("p")
+        self.assertEqual(self.client.calls, 2)
+        reader = CachedModelClient(self.client, self.cache, "read_through")
+        self.assertEqual(reader.generate("p").content, "answer #1")
+
+        CachedModelClient(self.client, self.cache, "refresh").generate("p")
+        self.assertEqual(reader.generate("p").content, "answer #3")
+
+    def test_off_and_errors_bypass_cache(self):
+        CachedModelClient(self.client, self.cache, "off").generate("p")
+        self.assertEqual(len(self.cache), 0)
+
+        class FailingClient(CountingClient):
+            def generate(self, prompt, system_prompt=None, **kwargs):
+                return LLMResponse(content="", model_name=self.model_name, error="boom")
+
+        CachedModelClient(FailingClient({"model_name": "m"}), self.cache).generate("p")
+        self.assertEqual(len(self.cache), 0)
+
+    def test_eviction(self):
+        cached = CachedModelClient(self.client, self.cache, "read_through")
+        for i in range(5):
+            cached.generate(f"p{i}")
+        self.cache.max_entries = 2
+        self.assertEqual(self.cache.evict(), 3)
+        self.assertEqual(len(self.cache), 2)
+
+        self.cache.max_entries = None
+        self.cache.max_age_days = 0
+        time.sleep(0.01)
+        self.assertEqual(self.cache.evict(), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from scripts.dataset_stream import StreamingDataset, expand_paths, iter_jsonl
+from scripts.utils import load_dataset
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class TestDatasetStream(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        # Two plain shards and one gzip shard of the same query set
+        for shard, (lo, hi) in enumerate([(0, 10), (10, 20)]):
+            with open(os.path.join(self.dir, f"queries-{shard}.jsonl"), 'w') as f:
+                for i in range(lo, hi):
+                    f.write(json.dumps({"query": f"q{i}"}) + "\n")
+        with gzip.open(os.path.join(self.dir, "queries-2.jsonl.gz"), 'wt') as f:
+            for i in range(20, 30):
+                f.write(json.dumps({"query": f"q{i}"}) + "\n\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def queries(self, dataset) -> list:
+        return [r["query"] for r in dataset]
+
+    def test_globs_and_compressed_shards(self):
+        pattern = os.path.join(self.dir, "queries-*")
+        self.assertEqual(len(expand_paths(pattern)), 3)
+        self.assertEqual(self.queries(StreamingDataset(pattern)), [f"q{i}" for i in range(30)])
+        self.assertEqual(len(load_dataset(os.path.join(self.dir, "queries-2.jsonl.gz"))), 10)
+        with self.assertRaises(FileNotFoundError):
+            expand_paths(os.path.join(self.dir, "missing-*.jsonl"))
+
+    def test_offset_limit_and_sample(self):
+        pattern = os.path.join(self.dir, "queries-*")
+        self.assertEqual(self.queries(StreamingDataset(pattern, offset=5, limit=3)), ["q5", "q6", "q7"])
+
+        sampled = StreamingDataset(pattern, sample=0.5, seed=3)
+        first = self.queries(sampled)
+        self.assertEqual(self.queries(sampled), first)  # every pass sees the same subset
+        self.assertLess(len(first), 30)
+        self.assertNotEqual(self.queries(StreamingDataset(pattern, sample=0.5, seed=4)), first)
+
+    def test_records_are_read_lazily(self):
+        path = os.path.join(self.dir, "broken.jsonl")
+        with open(path, 'w') as f:
+            f.write(json.dumps({"query": "first"}) + "\nnot json\n")
+        self.assertEqual(next(iter(StreamingDataset(path)))["query"], "first")
+        with self.assertRaises(ValueError):
+            list(iter_jsonl(path))
+
+    @unittest.skipUnless(zstandard, "zstandard not installed")
+    def test_zstd(self):
+        path = os.path.join(self.dir, "queries.jsonl.zst")
+        with open(path, 'wb') as f:
+            f.write(zstandard.ZstdCompressor().compress(b'{"query": "z"}\n'))
+        self.assertEqual(self.queries(StreamingDataset(path)), ["z"])
+
+if __name__ == '__main__':
+    unittest.main()
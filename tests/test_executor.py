@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+import unittest
+from scripts.executor import ordered_map, ordered_amap, get_max_concurrency
+from models.local_model_client import LocalModelClient
+
+class TestExecutor(unittest.TestCase):
+
+    def test_ordered_map_preserves_order(self):
+        # Later items finish first; output must still follow input order
+        def slow_first(i):
+            time.sleep(0.01 * (5 - i))
+            return i * 10
+
+        results = list(ordered_map(slow_first, range(5), max_concurrency=5))
+        self.assertEqual(results, [(i, i * 10) for i in range(5)])
+
+    def test_ordered_map_respects_concurrency_limit(self):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def track(i):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            return i
+
+        list(ordered_map(track, range(20), max_concurrency=3))
+        self.assertLessEqual(state["peak"], 3)
+        self.assertGreater(state["peak"], 1)
+
+    def test_local_model_speedup(self):
+        model = LocalModelClient({"model_name": "debug", "latency_ms": 50})
+        prompts = [f"prompt {i}" for i in range(8)]
+
+        start = time.perf_counter()
+        responses = [r for _, r in ordered_map(model.generate, prompts, max_concurrency=8)]
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(responses), 8)
+        self.assertIn("prompt 0", responses[0].content)
+        self.assertLess(elapsed, 8 * 0.05)
+
+    def test_ordered_amap_preserves_order(self):
+        async def slow_first(i):
+            await asyncio.sleep(0.01 * (5 - i))
+            return i * 10
+
+        results = list(ordered_amap(slow_first, range(5), max_concurrency=5))
+        self.assertEqual(results, [(i, i * 10) for i in range(5)])
+
+    def test_ordered_amap_runs_many_in_flight(self):
+        model = LocalModelClient({"model_name": "debug", "latency_ms": 100})
+        prompts = [f"prompt {i}" for i in range(200)]
+
+        start = time.perf_counter()
+        responses = [r for _, r in ordered_amap(model.agenerate, prompts, max_concurrency=200)]
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([r.content for r in responses][:2], [model.generate(p).content for p in prompts[:2]])
+        self.assertLess(elapsed, 2.0)
+
+    def test_ordered_amap_propagates_errors(self):
+        async def boom(i):
+            if i == 3:
+                raise ValueError("bad item")
+            return i
+
+        with self.assertRaises(ValueError):
+            list(ordered_amap(boom, range(10), max_concurrency=2))
+
+    def test_get_max_concurrency(self):
+        self.assertEqual(get_max_concurrency({}), 1)
+        self.assertEqual(get_max_concurrency({}, default=4), 4)
+        self.assertEqual(get_max_concurrency({"max_concurrency": 8}), 8)
+        self.assertEqual(get_max_concurrency({"max_concurrency": 0}), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import random
+import unittest
+from scripts.instrumentation import Instrumentation, LatencyHistogram, format_summary, timed_iter
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_histogram_percentiles_within_bucket_width(self):
+        rng = random.Random(0)
+        samples = [rng.expovariate(1 / 0.2) for _ in range(20000)]
+        histogram = LatencyHistogram()
+        for sample in samples:
+            histogram.record(sample)
+
+        samples.sort()
+        for q in (50, 95, 99):
+            exact = samples[int(q / 100 * len(samples)) - 1]
+            self.assertAlmostEqual(histogram.percentile(q) / exact, 1.0, delta=0.03)
+        self.assertEqual(histogram.percentile(100), max(samples))
+        self.assertEqual(histogram.count, len(samples))
+        self.assertEqual(LatencyHistogram().percentile(50), 0.0)
+
+    def test_stages_histograms_and_summary(self):
+        instr = Instrumentation()
+        with instr.stage("render"):
+            pass
+        instr.add_stage("evaluate:safety", 0.5, calls=2)
+        instr.observe("model:m", 0.1)
+        instr.observe("model:m", 0.3)
+        instr.count("rows", 3)
+        self.assertEqual(list(timed_iter(iter([1, 2, 3]), instr, "wait")), [1, 2, 3])
+
+        summary = instr.summary(wall_s=1.0)
+        self.assertEqual(list(summary["stages"])[0], "evaluate:safety")  # largest first
+        self.assertEqual(summary["stages"]["evaluate:safety"], {"total_s": 0.5, "calls": 2, "share": 0.5, "mean_ms": 250.0})
+        self.assertEqual(summary["stages"]["render"]["calls"], 1)
+        self.assertEqual(summary["stages"]["wait"]["calls"], 3)
+        self.assertEqual(summary["latency_ms"]["model:m"]["count"], 2)
+        self.assertEqual(summary["latency_ms"]["model:m"]["max"], 300.0)
+        self.assertEqual(summary["counters"], {"rows": 3})
+
+        table = format_summary(summary)
+        self.assertIn("evaluate:safety", table)
+        self.assertIn("p99", table)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import json
+import math
+import re
+import threading
+import time
+import unittest
+from typing import Optional
+from models.base_model import BaseModelClient, LLMResponse
+import pandas as pd
+from evaluators.llm_judge import LLMJudgeEvaluator, parse_verdicts
+from scripts.stats import weighted_overall
+
+class ScriptedJudge(BaseModelClient):
+    """Mock judge: scores every item in the prompt by response length and records its calls."""
+
+    def __init__(self, config=None, latency_s: float = 0.0):
+        super().__init__(config or {"model_name": "scripted-judge"})
+        self.prompts = []
+        self.latency_s = latency_s
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        with self._lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.latency_s)
+        verdicts = []
+        for item_id, response in re.findall(r"### Item (\d+)\n.*?Response: (.*?)(?:\n\n|\n\nReturn|$)", prompt, re.DOTALL):
+            score = min(len(response.strip()), 10)
+            verdicts.append({"id": int(item_id), "relevance": score, "accuracy": score,
+                             "clarity": 10, "safety": 10, "rationale": "scripted"})
+        with self._lock:
+            self.active -= 1
+        return LLMResponse(content="Verdicts:\n" + json.dumps({"verdicts": verdicts}), model_name=self.model_name)
+
+class TestLLMJudge(unittest.TestCase):
+
+    def test_scores_all_dimensions_in_one_call(self):
+        judge = ScriptedJudge()
+        evaluator = LLMJudgeEvaluator({"rows_per_request": 10}, client=judge)
+        batch = evaluator.evaluate_batch(["q1", "q2"], ["abc", "a longer answer"], ["ref", None])
+
+        self.assertEqual(len(judge.prompts), 1)
+        self.assertEqual(batch.dimension_scores["relevance"], [3.0, 10.0])
+        self.assertEqual(batch.dimension_scores["safety"], [10.0, 10.0])
+        self.assertEqual(batch.scores, [6.5, 10.0])
+        self.assertIn("relevance=3", batch.reasons[0])
+
+    def test_packs_rows_and_runs_calls_concurrently(self):
+        judge = ScriptedJudge(latency_s=0.05)
+        evaluator = LLMJudgeEvaluator({"rows_per_request": 3, "max_concurrency": 4}, client=judge)
+        responses = [f"answer {i}" for i in range(12)]
+        batch = evaluator.evaluate_batch(["q"] * 12, responses)
+
+        self.assertEqual(len(judge.prompts), 4)
+        self.assertEqual(judge.peak, 4)
+        self.assertNotIn(0.0, batch.scores)
+
+    def test_verdicts_are_cached_by_content(self):
+        judge = ScriptedJudge()
+        evaluator = LLMJudgeEvaluator({}, client=judge)
+        evaluator.evaluate_batch(["q", "q"], ["same", "same"])
+        evaluator.evaluate("q", "same")
+        self.assertEqual(len(judge.prompts), 1)
+        self.assertEqual(judge.prompts[0].count("### Item"), 1)
+
+    def test_missing_verdicts_score_nan_and_are_not_cached(self):
+        class SilentJudge(ScriptedJudge):
+            def generate(self, prompt, system_prompt=None, **kwargs):
+                self.prompts.append(prompt)
+                return LLMResponse(content="I cannot judge this.", model_name=self.model_name)
+
+        judge = SilentJudge()
+        evaluator = LLMJudgeEvaluator({}, client=judge)
+        res = evaluator.evaluate("q", "r")
+        self.assertTrue(math.isnan(res.score))
+        self.assertTrue(math.isnan(res.metadata["dimensions"]["clarity"]))
+        evaluator.evaluate("q", "r")
+        self.assertEqual(len(judge.prompts), 2)
+        self.assertEqual(evaluator.stats()["unjudged"], 2)
+        self.assertEqual(evaluator.stats()["errors"], 0)
+
+    def test_failed_judge_calls_are_counted_and_skipped_by_overall(self):
+        class FailingJudge(ScriptedJudge):
+            def generate(self, prompt, system_prompt=None, **kwargs):
+                if "broken" in prompt:
+                    return LLMResponse(content="", model_name=self.model_name, error="Error code: 500")
+                return super().generate(prompt, system_prompt, **kwargs)
+
+        evaluator = LLMJudgeEvaluator({"rows_per_request": 1}, client=FailingJudge())
+        batch = evaluator.evaluate_batch(["q", "q"], ["abc", "broken"])
+        self.assertEqual(batch.scores[0], 6.5)
+        self.assertTrue(math.isnan(batch.scores[1]))
+        self.assertEqual(evaluator.stats(), {"calls": 2, "errors": 1, "unjudged": 1, "last_error": "Error code: 500"})
+
+        df = pd.DataFrame({"score_judge": batch.scores, "score_safety": [10.0, 4.0]})
+        self.assertEqual(weighted_overall(df).tolist(), [8.25, 4.0])
+
+    def test_missing_dimension_is_nan(self):
+        evaluator = LLMJudgeEvaluator({"dimensions": ["relevance", "clarity"]}, client=ScriptedJudge())
+        overall, _, dims = evaluator._score({"relevance": 8})
+        self.assertEqual(overall, 8.0)
+        self.assertTrue(math.isnan(dims["clarity"]))
+
+    def test_parse_verdicts_tolerates_noise(self):
+        self.assertEqual(parse_verdicts("no json here"), {})
+        self.assertEqual(parse_verdicts('{"verdicts": [{"id": "2", "clarity": 7}, {"x": 1}]}'), {2: {"id": "2", "clarity": 7}})
+
+if __name__ == '__main__':
+    unittest.main()
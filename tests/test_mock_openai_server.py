@@ -0,0 +1,84 @@
+import asyncio
+import json
+import random
+import unittest
+import urllib.request
+
+from scripts.mock_openai_server import LatencyModel, MockOpenAIServer, MockSettings
+from scripts.load_test import classify_error, run_load_test
+from models.openai_client import OpenAIClient, _sdk
+from models.scheduler import ScheduledModelClient
+
+class TestLatencyModel(unittest.TestCase):
+
+    def test_distributions_have_the_configured_mean(self):
+        for distribution in ("uniform", "normal", "lognormal", "exponential"):
+            model = LatencyModel(distribution, mean_ms=100, spread=0.5, rng=random.Random(0))
+            mean = sum(model.sample() for _ in range(20000)) / 20000
+            self.assertAlmostEqual(mean, 0.1, delta=0.01, msg=distribution)
+        self.assertEqual(LatencyModel("fixed", mean_ms=50).sample(), 0.05)
+
+    def test_unknown_distribution(self):
+        with self.assertRaises(ValueError):
+            LatencyModel("pareto")
+
+@unittest.skipUnless(_sdk(), "openai not installed")
+class TestMockOpenAIServer(unittest.TestCase):
+
+    def serve(self, **settings) -> MockOpenAIServer:
+        settings = {"latency_ms": 0, "stream_tokens_per_s": 0, "seed": 0, **settings}
+        server = MockOpenAIServer(MockSettings(**settings)).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def client(self, server, **config) -> OpenAIClient:
+        return OpenAIClient({"model_name": "mock", "base_url": server.base_url, "sdk_max_retries": 0,
+                             "api_key_env": "MOCK_SERVER_TEST_KEY", **config})
+
+    def test_completion(self):
+        res = self.client(self.serve()).generate("How much should I save?")
+        self.assertIsNone(res.error)
+        self.assertTrue(res.content.startswith("How much should I save?"))
+        self.assertGreater(res.token_usage.completion_tokens, 0)
+        self.assertEqual(res.token_usage.total_tokens, res.token_usage.prompt_tokens + res.token_usage.completion_tokens)
+
+    def test_streaming_matches_plain_completion(self):
+        server = self.serve()
+        plain = self.client(server).generate("hello there")
+        streamed = asyncio.run(self.client(server, stream=True).agenerate("hello there"))
+        self.assertIsNone(streamed.error)
+        self.assertEqual(streamed.content, plain.content)
+        self.assertEqual(streamed.token_usage, plain.token_usage)
+        with urllib.request.urlopen(server.base_url + "/stats") as f:
+            self.assertEqual(json.load(f)["streamed"], 1)
+
+    def test_injected_errors_are_retryable(self):
+        for settings, label in (({"rate_429": 1.0}, "429"), ({"rate_500": 1.0}, "500"), ({"max_qps": 0}, "429")):
+            res = self.client(self.serve(**settings)).generate("hi")
+            self.assertTrue(res.retryable, settings)
+            self.assertEqual(classify_error(res.error), label)
+
+    def test_injected_timeout(self):
+        res = self.client(self.serve(rate_timeout=1.0, timeout_s=1.0), timeout_s=0.2).generate("hi")
+        self.assertTrue(res.retryable)
+        self.assertEqual(classify_error(res.error), "timeout")
+
+    def test_scheduler_retries_through_rate_limits(self):
+        server = self.serve(rate_429=0.5)
+        client = ScheduledModelClient(self.client(server), {"max_retries": 10, "base_backoff_s": 0.001})
+        responses = [client.generate(f"q{i}") for i in range(10)]
+        self.assertTrue(all(r.error is None for r in responses))
+        self.assertEqual(client.stats()["retries"], server.state.stats["injected_429"])
+
+    def test_load_test_report(self):
+        server = self.serve(latency_ms=5, rate_500=0.2)
+        report = asyncio.run(run_load_test(self.client(server), qps=100, duration_s=0.5))
+        self.assertEqual(report["requests"], 50)
+        self.assertEqual(report["completed"], 50)
+        self.assertEqual(report["outcomes"].get("500", 0), server.state.stats["injected_500"])
+        self.assertEqual(report["outcomes"]["ok"], server.state.stats["ok"])
+        self.assertGreaterEqual(report["latency_ms"]["p99"], report["latency_ms"]["p50"])
+        self.assertGreaterEqual(report["latency_ms"]["p50"], 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import asyncio
+import unittest
+from typing import Optional
+from models.base_model import BaseModelClient, LLMResponse
+from models.local_model_client import LocalModelClient
+
+class EchoClient(BaseModelClient):
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        return LLMResponse(content=f"{system_prompt}:{prompt}", model_name=self.model_name)
+
+class TestModels(unittest.TestCase):
+
+    def test_default_agenerate_wraps_generate(self):
+        client = EchoClient({"model_name": "echo"})
+        res = asyncio.run(client.agenerate("hi", system_prompt="sys"))
+        self.assertEqual(res.content, "sys:hi")
+        self.assertEqual(res.model_name, "echo")
+
+    def test_local_agenerate_matches_generate(self):
+        client = LocalModelClient({"model_name": "debug", "latency_ms": 0})
+        sync_res = client.generate("Hello world")
+        async_res = asyncio.run(client.agenerate("Hello world"))
+        self.assertEqual(sync_res.content, async_res.content)
+        self.assertEqual(sync_res.token_usage, async_res.token_usage)
+
+    def test_raw_response_is_opt_in(self):
+        self.assertEqual(LocalModelClient({"latency_ms": 0}).generate("hi").raw_response, {})
+        kept = LocalModelClient({"latency_ms": 0, "keep_raw_response": True}).generate("hi")
+        self.assertEqual(kept.raw_response, {"mock_id": "local-123"})
+
+if __name__ == '__main__':
+    unittest.main()
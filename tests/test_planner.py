@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from scripts.planner import (CellManifestWriter, Plan, GENERATE, RESCORE, REUSE, load_cell_manifest, make_cell,
+                             model_fingerprint)
+from scripts.prompt_templates import PromptTemplate
+
+class TestPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.template = PromptTemplate("Q: {{query}}", "p.md")
+        self.model_fp = model_fingerprint({"provider": "local", "model_name": "m"})
+
+    def cell(self, record, template=None, model_fp=None):
+        template = template or self.template
+        return make_cell(("m", template.id, record["query"]), model_fp or self.model_fp, template, record)
+
+    def test_fingerprints_ignore_operational_settings_and_unused_fields(self):
+        self.assertEqual(self.model_fp, model_fingerprint({"provider": "local", "model_name": "m", "max_concurrency": 8,
+                                                           "pricing": {"prompt_per_1k": 1}}))
+        self.assertNotEqual(self.model_fp, model_fingerprint({"provider": "local", "model_name": "m", "temperature": 0}))
+
+        a = self.cell({"query": "q", "reference_answer": "r"})
+        b = self.cell({"query": "q", "reference_answer": "other"})
+        self.assertEqual(a.generation, b.generation)  # the prompt does not read the reference
+        self.assertNotEqual(a.record, b.record)
+
+    def test_plan_classifies_cells_against_manifest(self):
+        records = [{"query": f"q{i}", "reference_answer": "r"} for i in range(4)]
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = CellManifestWriter(tmp)
+            for record in records:
+                writer.write(self.cell(record))
+            self.assertEqual(load_cell_manifest(tmp), {})  # nothing until committed
+            writer.commit()
+            prior = load_cell_manifest(tmp)
+
+        plan = Plan(prior, {"safety": "v2", "clarity": "v1"}, {"safety": "v1", "relevance": "v1"})
+        changed_model = model_fingerprint({"provider": "local", "model_name": "m", "temperature": 0})
+        decisions = [
+            plan.add(self.cell(records[0]), records[0]),
+            plan.add(self.cell(records[1], model_fp=changed_model), records[1]),
+            plan.add(self.cell({"query": "q2", "reference_answer": "new"}), {"query": "q2", "reference_answer": "new"}),
+            plan.add(self.cell({"query": "q9"}), {"query": "q9"}),
+        ]
+        self.assertEqual(decisions, [REUSE, GENERATE, RESCORE, GENERATE])
+        self.assertEqual(plan.reasons["model changed"], 1)
+        self.assertEqual(plan.reasons["new"], 1)
+        self.assertEqual(plan.dropped, 1)  # q3
+        self.assertEqual(plan.generations["m"], 2)
+        self.assertEqual(plan.stale_evaluators, ["clarity", "safety"])
+        self.assertEqual(plan.removed_evaluators, ["relevance"])
+        self.assertEqual(plan.changes("models")["changed"], ["m"])
+        self.assertEqual(plan.changes("prompts"), {"added": [], "removed": [], "changed": []})
+
+        self.assertEqual(plan.take_prior(("m", "p.md", "q0")), (REUSE, None))
+        self.assertIsNone(plan.take_prior(("m", "p.md", "q0")))
+        self.assertEqual(plan.take_prior(("m", "p.md", "q2")), (RESCORE, "new"))
+        self.assertIsNone(plan.take_prior(("m", "p.md", "q1")))
+
+if __name__ == '__main__':
+    unittest.main()
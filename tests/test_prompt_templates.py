@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from scripts.prompt_templates import PromptTemplate, TemplateRenderer, TemplateError, load_templates
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+class TestPromptTemplates(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_plain_template_matches_legacy_replace(self):
+        path = os.path.join(ROOT, "prompts/financial_prompts.md")
+        with open(path) as f:
+            text = f.read()
+        template = PromptTemplate.from_file(path)
+        self.assertEqual(template.id, "financial_prompts.md")
+        self.assertEqual(template.fields, ("query",))
+        rendered = template.render({"query": "How do I save?"})
+        self.assertEqual(rendered.user, text.replace("{{query}}", "How do I save?"))
+        self.assertIsNone(rendered.system)
+
+    def test_sections_partials_and_fields(self):
+        self.write("partials/rules.md", "Never name tickers.")
+        path = self.write("advisor.md",
+                          "{{#system}}\nYou advise on {{ meta.topic }}. {{> rules}}\n{{/system}}\n"
+                          "Q: {{query}}\nContext: {{context}}\n")
+        template = PromptTemplate.from_file(path)
+        self.assertEqual(template.fields, ("query", "context", "meta.topic"))
+        rendered = template.render({"query": "Q1", "context": None, "meta": {"topic": "retirement"}})
+        self.assertEqual(rendered.system, "You advise on retirement. Never name tickers.")
+        self.assertEqual(rendered.user, "Q: Q1\nContext: ")
+        with self.assertRaises(TemplateError):
+            template.render({"query": "Q1"})
+
+    def test_partial_cycles_and_duplicate_ids(self):
+        self.write("a.md", "{{> b}}")
+        self.write("b.md", "{{> a}}")
+        with self.assertRaises(TemplateError):
+            PromptTemplate.from_file(os.path.join(self.dir, "a.md"))
+        other = self.write("copy/financial_prompts.md", "{{query}}")
+        with self.assertRaises(TemplateError):
+            load_templates([os.path.join(ROOT, "prompts/financial_prompts.md"), other])
+
+    def test_identical_text_keeps_distinct_ids_and_renders_are_memoized(self):
+        first = PromptTemplate("Answer: {{query}}", "v1.md")
+        second = PromptTemplate("Answer: {{query}}", "v2.md")
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(first.content_hash, second.content_hash)
+
+        renderer = TemplateRenderer()
+        for _ in range(3):  # e.g. three models
+            renderer.render(first, {"query": "q", "unused": 1})
+        renderer.render(first, {"query": "other"})
+        self.assertEqual((renderer.misses, renderer.hits), (2, 2))
+        self.assertEqual(renderer.render(second, {"query": "q"}).user, "Answer: q")
+
+    def test_grid_larger_than_the_memo_is_rendered_per_model(self):
+        template = PromptTemplate("Answer: {{query}}", "v1.md")
+        renderer = TemplateRenderer(max_entries=2)
+        for _ in range(2):  # two models over the same three records
+            for query in ("a", "b", "c"):
+                renderer.render(template, {"query": query})
+        self.assertEqual((renderer.misses, renderer.hits), (6, 0))
+
+if __name__ == '__main__':
+    unittest.main()
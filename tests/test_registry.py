@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+import unittest
+from benchmarks.bench_imports import COLD_START, ROOT
+from evaluators.base import BaseEvaluator, EvaluationResult
+from evaluators.registry import EVALUATORS, register_evaluator
+from models.local_model_client import LocalModelClient
+from models.registry import PROVIDERS, get_provider, register_provider
+from scripts.run_experiment import get_evaluators, get_model
+
+class LengthEvaluator(BaseEvaluator):
+    def evaluate(self, query, response_text, reference=None):
+        return EvaluationResult(score=len(response_text), reasoning="len", evaluator_name="Length")
+
+class TestRegistry(unittest.TestCase):
+
+    def tearDown(self):
+        PROVIDERS.pop("debug", None)
+        EVALUATORS.pop("length", None)
+
+    def test_providers_resolve_by_name_or_path(self):
+        self.assertIs(get_provider("local"), LocalModelClient)
+        self.assertIs(get_provider("models.local_model_client:LocalModelClient"), LocalModelClient)
+        register_provider("debug", LocalModelClient)
+        self.assertIsInstance(get_model({"provider": "debug", "latency_ms": 0}), LocalModelClient)
+        with self.assertRaises(ValueError):
+            get_model({"provider": "nope"})
+
+    def test_evaluators_keep_registry_order_and_accept_plugins(self):
+        conf = {
+            "custom": {"enabled": True, "class": "tests.test_registry:LengthEvaluator"},
+            "safety": {"enabled": True},
+            "relevance": {"enabled": True},
+            "clarity": {"enabled": False},
+        }
+        self.assertEqual(list(get_evaluators(conf)), ["relevance", "safety", "custom"])
+        register_evaluator("length", LengthEvaluator)
+        self.assertIsInstance(get_evaluators({"length": {"enabled": True}})["length"], LengthEvaluator)
+        with self.assertRaises(ValueError):
+            get_evaluators({"missing": {"enabled": True}})
+
+    def test_local_run_skips_heavy_imports(self):
+        out = subprocess.run([sys.executable, "-c", COLD_START], check=True, capture_output=True, text=True, cwd=ROOT)
+        self.assertEqual(json.loads(out.stdout.strip().splitlines()[-1]), [])
+
+if __name__ == '__main__':
+    unittest.main()
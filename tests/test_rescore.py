@@ -0,0 +1,40 @@
+import unittest
+from scripts.rescore import rescore_rows, stale_evaluators
+from scripts.run_experiment import get_evaluators
+
+EVAL_CONF = {
+    "relevance": {"enabled": True, "weight": 1.0},
+    "safety": {"enabled": True, "weight": 2.0},
+}
+
+def make_rows(n: int) -> list:
+    return [
+        {"query": f"What is the capital of France {i}?", "response": f"Paris is the capital {i}", "reference": None}
+        for i in range(n)
+    ]
+
+class TestRescore(unittest.TestCase):
+
+    def test_process_pool_matches_in_process(self):
+        serial = rescore_rows(make_rows(50), EVAL_CONF, ["relevance", "safety"], workers=1)
+        pooled = rescore_rows(make_rows(50), EVAL_CONF, ["relevance", "safety"], workers=2, chunk_size=7)
+        self.assertEqual(serial, pooled)
+        self.assertIn("score_safety", pooled[0])
+
+    def test_only_new_or_changed_evaluators_are_stale(self):
+        evaluators = get_evaluators(EVAL_CONF)
+        rows = rescore_rows(make_rows(3), EVAL_CONF, ["relevance"], workers=1)
+        manifest = {"relevance": evaluators["relevance"].fingerprint()}
+
+        # safety column is missing entirely
+        self.assertEqual(stale_evaluators(rows, evaluators, manifest), ["safety"])
+
+        # a config change (other than weight) invalidates relevance
+        changed = get_evaluators({"relevance": {"enabled": True, "weight": 5.0, "min_len": 4}})
+        self.assertEqual(stale_evaluators(rows, changed, manifest), ["relevance"])
+
+        reweighted = get_evaluators({"relevance": {"enabled": True, "weight": 5.0}})
+        self.assertEqual(stale_evaluators(rows, reweighted, manifest), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+import yaml
+from scripts.results_store import default_results_path, write_parquet_results, read_results, result_columns
+from scripts.utils import save_results, load_results
+
+ROWS = [
+    {"model": "m1", "prompt_source": "a.md", "query": "q1", "reference": None, "response": "r1" * 50,
+     "score_relevance": 2.0, "reason_relevance": "low"},
+    {"model": "m1", "prompt_source": "b.md", "query": "q1", "reference": "ref", "response": "r2",
+     "score_relevance": 8.0, "reason_relevance": "high"},
+    {"model": "m2", "prompt_source": "a.md", "query": "q1", "reference": None, "response": "r3",
+     "score_relevance": 6.0, "reason_relevance": "mid"},
+]
+
+class TestResultsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parquet_partitions_projection_and_pushdown(self):
+        root = os.path.join(self.tmp.name, "results.parquet")
+        write_parquet_results(ROWS, root, experiment="exp1")
+
+        self.assertTrue(os.path.isdir(os.path.join(root, "experiment=exp1", "model=m1", "prompt_source=a.md")))
+        self.assertIn("score_relevance", result_columns(root))
+
+        df = read_results(root, columns=["model", "score_relevance"], filters=[("model", "==", "m1")])
+        self.assertEqual(list(df.columns), ["model", "score_relevance"])
+        self.assertEqual(sorted(df["score_relevance"].tolist()), [2.0, 8.0])
+
+        df = read_results(root, columns=["score_relevance"], filters=[("score_relevance", ">", 5.0)])
+        self.assertEqual(sorted(df["score_relevance"].tolist()), [6.0, 8.0])
+
+        # Re-writing an experiment replaces its partitions instead of duplicating rows
+        write_parquet_results(ROWS, root, experiment="exp1")
+        write_parquet_results(ROWS[:1], root, experiment="exp2")
+        self.assertEqual(len(read_results(root, columns=["model"])), 4)
+        self.assertEqual(len(read_results(root, filters=[("experiment", "==", "exp2")])), 1)
+
+    def test_csv_and_json_still_readable(self):
+        save_results(ROWS, self.tmp.name, "json")
+        for name in ("results.csv", "results.json"):
+            path = os.path.join(self.tmp.name, name)
+            df = read_results(path, columns=["model", "score_relevance"], filters=[("model", "==", "m2")])
+            self.assertEqual(df["score_relevance"].tolist(), [6.0])
+            self.assertEqual(list(df.columns), ["model", "score_relevance"])
+
+    def test_save_and_load_parquet_rows(self):
+        save_results(ROWS, self.tmp.name, "parquet", experiment="exp1")
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "results.csv")))
+        rows = load_results(os.path.join(self.tmp.name, "results.parquet"))
+        self.assertEqual(len(rows), 3)
+        by_response = {r["response"]: r for r in rows}
+        self.assertIsNone(by_response["r3"]["reference"])
+        self.assertEqual(by_response["r2"]["reason_relevance"], "high")
+
+    def test_default_results_path_follows_configured_format(self):
+        save_dir = os.path.join(self.tmp.name, "out")
+        config = os.path.join(self.tmp.name, "evaluation.yaml")
+        with open(config, "w") as f:
+            yaml.safe_dump({"output": {"format": "parquet", "save_dir": save_dir}}, f)
+        self.assertEqual(default_results_path(config), os.path.join(save_dir, "results.parquet"))
+
+        with open(config, "w") as f:
+            yaml.safe_dump({"output": {"format": "json", "save_dir": save_dir}}, f)
+        self.assertEqual(default_results_path(config), os.path.join(save_dir, "results.csv"))
+        # Only a Parquet store exists (the run used format: parquet): use it rather than a missing CSV
+        save_results(ROWS, save_dir, "parquet")
+        self.assertEqual(default_results_path(config), os.path.join(save_dir, "results.parquet"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,279 @@
+import json
+import os
+import re
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import yaml
+from scripts import run_experiment
+from models.base_model import LLMResponse
+from models.local_model_client import LocalModelClient
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def write_configs(tmp: str, **eval_overrides) -> list:
+    eval_config = {
+        "experiment_name": "test",
+        "prompts": [os.path.join(ROOT, "prompts/financial_prompts.md")],
+        "datasets": [os.path.join(ROOT, "datasets/financial_queries.jsonl")],
+        "models": ["local-debug"],
+        "evaluators": {"relevance": {"enabled": True}, "safety": {"enabled": True}},
+        "cache": {"mode": "off"},
+        "output": {"format": "json", "save_dir": os.path.join(tmp, "results")},
+        **eval_overrides,
+    }
+    models_config = {"models": {"local-debug": {"provider": "local", "model_name": "debug", "latency_ms": 0}}}
+
+    eval_path, models_path = os.path.join(tmp, "evaluation.yaml"), os.path.join(tmp, "models.yaml")
+    with open(eval_path, 'w') as f:
+        yaml.safe_dump(eval_config, f)
+    with open(models_path, 'w') as f:
+        yaml.safe_dump(models_config, f)
+    return ["--config", eval_path, "--models-config", models_path]
+
+def run_cli(argv: list):
+    with mock.patch.object(sys, "argv", ["run_experiment.py", *argv]), \
+         mock.patch("builtins.print"):
+        run_experiment.run()
+
+class TestRunExperiment(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.results_dir = os.path.join(self.tmp.name, "results")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_results(self) -> list:
+        with open(os.path.join(self.results_dir, "results.json")) as f:
+            return json.load(f)
+
+    def test_resume_matches_uninterrupted_run(self):
+        argv = write_configs(self.tmp.name)
+        run_cli(argv)
+        full = self.read_results()
+        self.assertEqual(len(full), 3)
+
+        # Simulate a crash after the first row, mid-way through writing the second
+        sink_path = os.path.join(self.results_dir, "results.jsonl")
+        with open(sink_path) as f:
+            lines = f.readlines()
+        with open(sink_path, 'w') as f:
+            f.write(lines[0] + lines[1][:20])
+
+        run_cli(argv + ["--resume"])
+        resumed = self.read_results()
+        strip = lambda rows: [{k: v for k, v in r.items() if k != "latency_ms"} for r in rows]
+        self.assertEqual(strip(resumed), strip(full))
+        self.assertEqual(resumed[0]["latency_ms"], full[0]["latency_ms"])
+
+        with open(sink_path) as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+    def test_resume_regenerates_failed_rows(self):
+        argv = write_configs(self.tmp.name)
+        run_cli(argv)
+        full = self.read_results()
+
+        local = LocalModelClient({"model_name": "debug", "latency_ms": 0}).generate
+        def flaky(prompt, system_prompt=None, **kwargs):
+            if full[1]["query"] in prompt:
+                return LLMResponse(content="", model_name="debug", error="Error code: 429", retryable=True)
+            return local(prompt, system_prompt, **kwargs)
+
+        with mock.patch("models.local_model_client.LocalModelClient.generate", side_effect=flaky):
+            run_cli(argv)
+        partial = self.read_results()
+        self.assertEqual([r["query"] for r in partial], [full[0]["query"], full[2]["query"]])
+        sink_path = os.path.join(self.results_dir, "results.jsonl")
+        with open(sink_path) as f:
+            failed = [json.loads(line) for line in f if json.loads(line)["error"]]
+        self.assertEqual(len(failed), 1)
+        self.assertNotIn("score_relevance", failed[0])
+
+        with mock.patch("models.local_model_client.LocalModelClient.generate", side_effect=local) as generate:
+            run_cli(argv + ["--resume"])
+        self.assertEqual(generate.call_count, 1)
+        strip = lambda rows: [{k: v for k, v in r.items() if k != "latency_ms"} for r in rows]
+        self.assertEqual(strip(self.read_results()), strip(full))
+        self.assertTrue(all(r["error"] is None for r in full))
+
+    def test_timings_and_profile_saved_next_to_results(self):
+        run_cli(write_configs(self.tmp.name) + ["--profile", "--max-concurrency", "2"])
+
+        with open(os.path.join(self.results_dir, "timings.json")) as f:
+            timings = json.load(f)
+        self.assertEqual(timings["counters"]["rows"], 3)
+        for stage in ("render", "build_row", "evaluate:relevance", "evaluate:safety", "save_results"):
+            self.assertIn(stage, timings["stages"])
+        for histogram in ("model:debug", "queue:debug", "evaluator:relevance"):
+            self.assertEqual(timings["latency_ms"][histogram]["count"], 3 if ":debug" in histogram else 1)
+        self.assertTrue(os.path.exists(os.path.join(self.results_dir, "profile.pstats")))
+
+    def test_incremental_run_only_regenerates_changed_cells(self):
+        dataset = os.path.join(self.tmp.name, "queries.jsonl")
+
+        def write_dataset(records):
+            with open(dataset, 'w') as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+
+        records = [{"query": f"How should I save {i}?", "reference_answer": f"save {i}"} for i in range(5)]
+        write_dataset(records)
+        argv = write_configs(self.tmp.name, datasets=[dataset])
+        run_cli(argv)
+
+        records[1]["reference_answer"] = "changed"
+        records.append({"query": "Is a pension worth it?", "reference_answer": "yes"})
+        write_dataset(records)
+        argv = write_configs(self.tmp.name, datasets=[dataset],
+                             evaluators={"relevance": {"enabled": True}, "safety": {"enabled": True, "weight": 2}})
+        with mock.patch("models.local_model_client.LocalModelClient.generate") as generate:
+            run_cli(argv + ["--plan"])
+        generate.assert_not_called()
+
+        with mock.patch("models.local_model_client.LocalModelClient.generate",
+                        side_effect=LocalModelClient({"model_name": "debug", "latency_ms": 0}).generate) as generate:
+            run_cli(argv + ["--incremental"])
+        self.assertEqual(generate.call_count, 1)
+        incremental = self.read_results()
+
+        run_cli(argv)
+        strip = lambda rows: [{k: v for k, v in row.items() if k != "latency_ms"} for row in rows]
+        self.assertEqual(strip(incremental), strip(self.read_results()))
+        self.assertEqual(incremental[1]["reference"], "changed")
+        self.assertFalse(os.path.exists(os.path.join(self.results_dir, "results.prev.jsonl")))
+
+    def test_interrupted_incremental_run_keeps_prior_state_and_resumes(self):
+        dataset = os.path.join(self.tmp.name, "queries.jsonl")
+
+        def write_dataset(records):
+            with open(dataset, 'w') as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+
+        records = [{"query": f"How should I save {i}?", "reference_answer": f"save {i}"} for i in range(4)]
+        write_dataset(records)
+        argv = write_configs(self.tmp.name, datasets=[dataset])
+        run_cli(argv)
+        manifest = os.path.join(self.results_dir, "cells.jsonl")
+        with open(manifest) as f:
+            prior_cells = f.read()
+
+        records[0]["reference_answer"] = "changed"
+        records += [{"query": f"Is pension {i} worth it?", "reference_answer": "yes"} for i in range(3)]
+        write_dataset(records)
+        local = LocalModelClient({"model_name": "debug", "latency_ms": 0}).generate
+        calls = []
+        def crash_on_second_call(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError("killed")
+            return local(*args, **kwargs)
+
+        with mock.patch("models.local_model_client.LocalModelClient.generate", side_effect=crash_on_second_call):
+            with self.assertRaises(RuntimeError):
+                run_cli(argv + ["--incremental", "--eval-batch-size", "1"])
+        # The last completed run's manifest and rows survive the crash
+        with open(manifest) as f:
+            self.assertEqual(f.read(), prior_cells)
+        self.assertTrue(os.path.exists(os.path.join(self.results_dir, "results.prev.jsonl")))
+
+        with mock.patch("models.local_model_client.LocalModelClient.generate", side_effect=local) as generate:
+            run_cli(argv + ["--incremental", "--resume"])
+        self.assertEqual(generate.call_count, 2)
+        resumed = self.read_results()
+        self.assertFalse(os.path.exists(os.path.join(self.results_dir, "results.prev.jsonl")))
+
+        run_cli(argv)
+        strip = lambda rows: [{k: v for k, v in row.items() if k != "latency_ms"} for row in rows]
+        self.assertEqual(strip(resumed), strip(self.read_results()))
+        self.assertEqual(resumed[0]["reference"], "changed")
+
+    def test_incremental_run_after_rescore_keeps_rescored_scores(self):
+        from scripts.rescore import rescore
+
+        run_cli(write_configs(self.tmp.name))
+        argv = write_configs(self.tmp.name, evaluators={
+            "relevance": {"enabled": True}, "safety": {"enabled": True, "unsafe_keywords": ["locally"]}})
+        with mock.patch.object(sys, "argv", ["rescore.py", "--results", os.path.join(self.results_dir, "results.json"),
+                                             "--config", argv[1], "--models-config", argv[3], "--workers", "1"]), \
+             mock.patch("builtins.print"):
+            rescore()
+        rescored = self.read_results()
+        self.assertEqual({row["score_safety"] for row in rescored}, {0.0})
+
+        with mock.patch("models.local_model_client.LocalModelClient.generate") as generate:
+            run_cli(argv + ["--incremental"])
+        generate.assert_not_called()
+        self.assertEqual(self.read_results(), rescored)
+
+    def test_dry_run_estimates_without_calling_models(self):
+        argv = write_configs(self.tmp.name)
+        with mock.patch.object(sys, "argv", ["run_experiment.py", *argv, "--dry-run"]), \
+             mock.patch("builtins.print") as printed, \
+             mock.patch("models.local_model_client.LocalModelClient.generate") as generate:
+            run_experiment.run()
+
+        generate.assert_not_called()
+        self.assertFalse(os.path.exists(self.results_dir))
+        output = " ".join(str(c.args[0]) for c in printed.call_args_list if c.args)
+        self.assertIn("local-debug: 3 requests", output)
+
+    def test_adaptive_run_stops_dominated_prompt(self):
+        # The local model echoes the first 50 prompt characters: a prompt that starts with
+        # the query scores high on relevance, one that buries it behind filler does not
+        good, bad, dataset = (os.path.join(self.tmp.name, n) for n in ("good.md", "bad.md", "queries.jsonl"))
+        with open(good, 'w') as f:
+            f.write("{{query}}")
+        with open(bad, 'w') as f:
+            f.write("Please consider the following question very carefully: {{query}}")
+        with open(dataset, 'w') as f:
+            for i in range(200):
+                f.write(json.dumps({"query": f"budget savings plan {i}"}) + "\n")
+
+        argv = write_configs(self.tmp.name, prompts=[good, bad], datasets=[dataset],
+                             evaluators={"relevance": {"enabled": True}},
+                             adaptive={"round_size": 10, "seed": 1})
+        with mock.patch.object(sys, "argv", ["run_experiment.py", *argv, "--adaptive"]), \
+             mock.patch("builtins.print") as printed:
+            run_experiment.run()
+
+        rows = self.read_results()
+        by_prompt = {p: sum(r["prompt_source"] == p for r in rows) for p in ("good.md", "bad.md")}
+        self.assertLess(len(rows), 400)
+        self.assertEqual(by_prompt["good.md"], by_prompt["bad.md"])
+        output = " ".join(str(c.args[0]) for c in printed.call_args_list if c.args)
+        self.assertIn("Dropped debug / bad.md", output)
+        self.assertIn(f"saved {400 - len(rows)} generations", output)
+
+    def test_rate_limited_judge_retries_through_scheduler(self):
+        models_config = {"models": {"judge": {"provider": "local", "model_name": "judge", "latency_ms": 0,
+                                              "rate_limit": {"max_retries": 2, "base_backoff_s": 0}}}}
+        schedulers = []
+        evaluators = run_experiment.get_evaluators({"judge": {"enabled": True, "model": "judge"}},
+                                                   models_config, schedulers=schedulers)
+        judge = evaluators["judge"]
+        self.assertEqual(schedulers, [judge.client])
+
+        calls = []
+        def generate(prompt, system_prompt=None, **kwargs):
+            calls.append(prompt)
+            if len(calls) == 1:
+                return LLMResponse(content="", model_name="judge", error="Error code: 429", retryable=True)
+            verdicts = [{"id": int(i), "relevance": 8, "accuracy": 8, "clarity": 8, "safety": 8}
+                        for i in re.findall(r"### Item (\d+)", prompt)]
+            return LLMResponse(content=json.dumps({"verdicts": verdicts}), model_name="judge")
+
+        with mock.patch.object(judge.client.client, "generate", side_effect=generate):
+            batch = judge.evaluate_batch(["q"], ["an answer"], [None])
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(batch.scores, [8.0])
+        self.assertEqual(schedulers[0].stats()["retries"], 1)
+        self.assertEqual(judge.stats()["errors"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
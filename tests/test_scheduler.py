@@ -0,0 +1,81 @@
+import asyncio
+import time
+import unittest
+from typing import Optional
+from unittest import mock
+from models.base_model import BaseModelClient, LLMResponse, TokenUsage
+from models.scheduler import TokenBucket, ScheduledModelClient
+
+class RateLimitedClient(BaseModelClient):
+    """Mock client that answers 429 for the first `failures` calls."""
+
+    def __init__(self, config, failures: int):
+        super().__init__(config)
+        self.failures = failures
+        self.calls = 0
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        self.calls += 1
+        if self.calls <= self.failures:
+            return LLMResponse(content="", model_name=self.model_name,
+                               error="Error code: 429 - rate limit exceeded", retryable=True)
+        return LLMResponse(content="ok", model_name=self.model_name,
+                           token_usage=TokenUsage(prompt_tokens=5, completion_tokens=5, total_tokens=10))
+
+class TestScheduler(unittest.TestCase):
+
+    def test_token_bucket_throttles_past_capacity(self):
+        bucket = TokenBucket(per_minute=60)  # 1 token/s, burst of 60
+        self.assertEqual(bucket.reserve(60), 0.0)
+        self.assertAlmostEqual(bucket.reserve(2), 2.0, delta=0.05)
+        bucket.refund(3)
+        self.assertAlmostEqual(bucket.reserve(1), 0.0, delta=0.05)
+
+    def test_retries_429_until_success(self):
+        client = RateLimitedClient({"model_name": "m"}, failures=2)
+        scheduled = ScheduledModelClient(client, {"max_retries": 5, "base_backoff_s": 0.001, "bucket": "t-retry"})
+        res = scheduled.generate("hello")
+        self.assertEqual(res.content, "ok")
+        self.assertEqual(client.calls, 3)
+        self.assertEqual(scheduled.stats()["retries"], 2)
+        self.assertEqual(scheduled.stats()["failures"], 0)
+
+    def test_gives_up_after_max_retries(self):
+        client = RateLimitedClient({"model_name": "m"}, failures=10)
+        scheduled = ScheduledModelClient(client, {"max_retries": 2, "base_backoff_s": 0.001, "bucket": "t-giveup"})
+        res = scheduled.generate("hello")
+        self.assertTrue(res.error)
+        self.assertEqual(client.calls, 3)
+        self.assertEqual(scheduled.stats()["failures"], 1)
+
+    def test_backoff_is_jittered_exponential(self):
+        client = RateLimitedClient({"model_name": "m"}, failures=3)
+        scheduled = ScheduledModelClient(client, {"max_retries": 5, "base_backoff_s": 1.0, "bucket": "t-backoff"})
+        with mock.patch("models.scheduler.time.sleep") as sleep, \
+             mock.patch("models.scheduler.random.uniform", side_effect=lambda lo, hi: hi) as uniform:
+            scheduled.generate("hello")
+        self.assertEqual([c.args for c in uniform.call_args_list], [(0, 1.0), (0, 2.0), (0, 4.0)])
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [1.0, 2.0, 4.0])
+
+    def test_rpm_budget_throttles_async_requests(self):
+        client = RateLimitedClient({"model_name": "m"}, failures=0)
+        scheduled = ScheduledModelClient(client, {"rpm": 600, "bucket": "t-rpm"})  # 10 req/s, burst 600
+        scheduled.rpm.tokens = 0
+
+        async def burst():
+            await asyncio.gather(*(scheduled.agenerate("hi") for _ in range(3)))
+
+        start = time.perf_counter()
+        asyncio.run(burst())
+        self.assertGreaterEqual(time.perf_counter() - start, 0.25)
+        self.assertGreater(scheduled.stats()["throttle_s"], 0.5)
+
+    def test_tpm_reserves_estimate_and_refunds_actual(self):
+        client = RateLimitedClient({"model_name": "m", "max_tokens": 100, "tokenizer": "chars"}, failures=0)
+        scheduled = ScheduledModelClient(client, {"tpm": 1000, "bucket": "t-tpm"})
+        scheduled.generate("x" * 400)
+        # 101 prompt tokens + 100 max_tokens reserved, 10 actually used
+        self.assertAlmostEqual(scheduled.tpm.tokens, 990, delta=1)
+
+if __name__ == '__main__':
+    unittest.main()
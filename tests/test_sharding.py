@@ -0,0 +1,78 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from scripts.sharding import parse_shard, shard_of, merge_shards, SHARDS_DIR
+from scripts.merge_shards import merge
+from tests.test_run_experiment import write_configs, run_cli
+
+class TestSharding(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.results_dir = os.path.join(self.tmp.name, "results")
+        dataset = os.path.join(self.tmp.name, "queries.jsonl")
+        with open(dataset, 'w') as f:
+            for i in range(40):
+                f.write(json.dumps({"query": f"How should I invest {i}?"}) + "\n")
+        self.argv = write_configs(self.tmp.name, datasets=[dataset])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_results(self) -> list:
+        with open(os.path.join(self.results_dir, "results.json")) as f:
+            return [{k: v for k, v in r.items() if k != "latency_ms"} for r in json.load(f)]
+
+    def test_parse_and_assign(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for bad in ("4/4", "-1/4", "1", "a/b"):
+            with self.assertRaises(ValueError):
+                parse_shard(bad)
+        key = ("m", "p.md", "q")
+        self.assertEqual(shard_of(key, 8), shard_of(key, 8))
+        counts = [0] * 4
+        for i in range(1000):
+            counts[shard_of(("m", "p.md", f"q{i}"), 4)] += 1
+        self.assertTrue(all(200 < c < 300 for c in counts))
+
+    def test_merged_shards_match_unsharded_run(self):
+        run_cli(self.argv)
+        full = self.read_results()
+        os.remove(os.path.join(self.results_dir, "results.json"))
+
+        for i in range(3):
+            run_cli(self.argv + ["--shard", f"{i}/3"])
+        self.assertFalse(os.path.exists(os.path.join(self.results_dir, "results.json")))
+        with mock.patch("builtins.print"):
+            self.assertTrue(merge(self.argv[1]))
+        self.assertEqual(self.read_results(), full)
+
+    def test_merge_detects_missing_shards_and_rows(self):
+        for i in range(2):
+            run_cli(self.argv + ["--shard", f"{i}/2"])
+        shards = os.path.join(self.results_dir, SHARDS_DIR)
+        rows, report = merge_shards(shards)
+        self.assertTrue(report["complete"])
+        self.assertEqual(len(rows), 40)
+
+        # Drop a row from one shard's sink and remove the other shard entirely
+        first, second = sorted(os.listdir(shards))
+        sink = os.path.join(shards, first, "results.jsonl")
+        with open(sink) as f:
+            lines = f.readlines()
+        with open(sink, 'w') as f:
+            f.writelines(lines[1:])
+        shutil.rmtree(os.path.join(shards, second))
+
+        _, report = merge_shards(shards)
+        self.assertFalse(report["complete"])
+        self.assertEqual(report["missing_shards"], [1])
+        self.assertEqual(report["missing_rows"], 1)
+        with mock.patch("builtins.print"):
+            self.assertFalse(merge(self.argv[1]))
+
+if __name__ == '__main__':
+    unittest.main()
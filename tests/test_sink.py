@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+import unittest
+from scripts.sink import JsonlResultSink, ResultColumns, collect_columns, collect_results
+from scripts.utils import save_results
+
+class TestResultColumns(unittest.TestCase):
+
+    def test_rows_round_trip_including_missing_columns(self):
+        rows = [{"a": 1, "b": "x"}, {"a": 2}, {"a": 3, "b": None, "c": 1.5}]
+        columns = ResultColumns()
+        for row in rows:
+            columns.append(row)
+
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(list(columns.rows()), rows)
+        df = columns.to_frame(["a", "c"])
+        self.assertEqual(list(df.columns), ["a", "c"])
+        self.assertEqual(df["c"].isna().tolist(), [True, True, False])
+
+        columns.reorder([2, 0])
+        self.assertEqual(list(columns.rows()), [rows[2], rows[0]])
+
+    def test_collect_matches_planned_order_and_saves_like_dicts(self):
+        rows = [{"model": "m", "prompt_source": "p", "query": q, "score_x": i} for i, q in enumerate("abcab")]
+        with tempfile.TemporaryDirectory() as tmp:
+            sink_path = os.path.join(tmp, "results.jsonl")
+            with JsonlResultSink(sink_path) as sink:
+                for row in rows:
+                    sink.write(row)
+
+            planned = [("m", "p", "b"), ("m", "p", "a"), ("m", "p", "b"), ("m", "p", "z")]
+            columns, stale = collect_columns(sink_path, planned)
+            self.assertEqual([r["score_x"] for r in columns.rows()], [1, 0, 4])
+            self.assertEqual(stale, 2)  # the "c" row and the second "a"
+            self.assertEqual(collect_results(sink_path, planned), (list(columns.rows()), 2))
+
+            save_results(columns, os.path.join(tmp, "columns"))
+            save_results(list(columns.rows()), os.path.join(tmp, "dicts"))
+            for name in ("results.json", "results.csv"):
+                with open(os.path.join(tmp, "columns", name)) as a, open(os.path.join(tmp, "dicts", name)) as b:
+                    self.assertEqual(a.read(), b.read())
+            with open(os.path.join(tmp, "columns", "results.json")) as f:
+                self.assertEqual(json.load(f), list(columns.rows()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.stats import (
+    evaluator_weights, weighted_overall, paired_matrix, bootstrap_means, bootstrap_ci,
+    sign_flip_pvalue, holm, compare_pairs, sequential_compare
+)
+
+class TestStats(unittest.TestCase):
+
+    def test_weighted_overall_uses_config_weights(self):
+        weights = evaluator_weights({
+            "relevance": {"enabled": True, "weight": 1.0},
+            "safety": {"enabled": True, "weight": 3.0},
+            "clarity": {"enabled": False, "weight": 5.0},
+        })
+        self.assertEqual(weights, {"relevance": 1.0, "safety": 3.0})
+        df = pd.DataFrame({
+            "score_relevance": [2.0, 8.0],
+            "score_safety": [10.0, np.nan],
+            "score_judge_clarity": [0.0, 0.0],
+        })
+        self.assertEqual(weighted_overall(df, weights).tolist(), [8.0, 8.0])
+        self.assertEqual(weighted_overall(df).tolist(), [4.0, 4.0])
+
+    def test_multinomial_bootstrap_matches_index_resampling(self):
+        rng = np.random.default_rng(0)
+        values = np.round(rng.normal(5, 2, 2000), 2)
+        fast = bootstrap_means(values, 4000, np.random.default_rng(1))
+        slow = values[np.random.default_rng(2).integers(0, len(values), size=(4000, len(values)))].mean(axis=1)
+        self.assertAlmostEqual(fast.mean(), values.mean(), places=2)
+        self.assertAlmostEqual(fast.std(), slow.std(), delta=0.1 * slow.std())
+
+        lo, hi = bootstrap_ci(values, 2000, 0.05, np.random.default_rng(3))
+        self.assertLess(lo, values.mean())
+        self.assertGreater(hi, values.mean())
+
+    def test_sign_flip_pvalue(self):
+        rng = np.random.default_rng(0)
+        self.assertLess(sign_flip_pvalue(np.full(50, 0.5), 2000, rng), 0.01)
+        self.assertGreater(sign_flip_pvalue(np.round(rng.normal(0, 1, 500), 2), 2000, rng), 0.01)
+        self.assertEqual(sign_flip_pvalue(np.zeros(10), 100, rng), 1.0)
+
+    def test_holm(self):
+        np.testing.assert_allclose(holm([0.01, 0.04, 0.03]), [0.03, 0.06, 0.06])
+
+    def _results(self, n=400, gap=0.6):
+        rng = np.random.default_rng(0)
+        base = rng.uniform(3, 8, n)
+        rows = []
+        for prompt, shift in [("a.md", gap), ("b.md", 0.0), ("c.md", 0.0)]:
+            scores = np.round(base + shift + rng.normal(0, 0.5, n), 2)
+            rows.append(pd.DataFrame({"model": "m", "query": [f"q{i}" for i in range(n)],
+                                      "prompt_source": prompt, "overall_score": scores}))
+        return pd.concat(rows, ignore_index=True)
+
+    def test_compare_pairs_on_shared_queries(self):
+        df = self._results()
+        # Drop some rows from one prompt: pairs only use queries scored under both
+        df = df[~((df["prompt_source"] == "c.md") & (df["query"].isin(["q0", "q1"])))]
+        matrix = paired_matrix(df)
+        pairs = compare_pairs(matrix, 2000, 0.05, np.random.default_rng(0)).set_index(["prompt_a", "prompt_b"])
+
+        self.assertEqual(pairs.loc[("a.md", "c.md"), "n"], 398)
+        self.assertEqual(pairs.loc[("a.md", "b.md"), "n"], 400)
+        self.assertTrue(pairs.loc[("a.md", "b.md"), "significant"])
+        self.assertGreater(pairs.loc[("a.md", "b.md"), "ci_low"], 0)
+        self.assertFalse(pairs.loc[("b.md", "c.md"), "significant"])
+
+    def test_sequential_stops_early_on_clear_winner(self):
+        matrix = paired_matrix(self._results(n=1000, gap=1.0))
+        seq = sequential_compare(matrix, looks=10, alpha=0.05, n_resamples=1000, seed=0)
+        self.assertEqual(seq["winner"], "a.md")
+        self.assertTrue(seq["stopped_early"])
+        self.assertLess(seq["n_used"], 1000)
+
+        tie = paired_matrix(self._results(n=200, gap=0.0))
+        self.assertIsNone(sequential_compare(tie, looks=4, seed=0)["winner"])
+
+if __name__ == '__main__':
+    unittest.main()
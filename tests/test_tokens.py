@@ -0,0 +1,55 @@
+import unittest
+from models.local_model_client import LocalModelClient
+from models.tokens import (
+    CharTokenizer, RegexTokenizer, Tokenizer, TokenCounter, get_counter, register_tokenizer, estimate_cost
+)
+
+class TestTokens(unittest.TestCase):
+
+    def test_builtin_tokenizers(self):
+        self.assertEqual(CharTokenizer().count("x" * 40), 10)
+        regex = RegexTokenizer()
+        self.assertEqual(regex.count("How should I save for retirement?"), 7)
+        self.assertEqual(regex.count("2024"), 2)  # digits are split into runs of at most three
+        self.assertEqual(regex.count("x" * 40), 4)  # long rare pieces cost several tokens
+        self.assertEqual(regex.count(""), 0)
+
+    def test_counter_caches_and_registry(self):
+        class WordTokenizer(Tokenizer):
+            name = "words"
+            calls = 0
+
+            def count(self, text):
+                WordTokenizer.calls += 1
+                return len(text.split())
+
+        register_tokenizer("words", lambda arg: WordTokenizer())
+        counter = get_counter("words")
+        self.assertIs(counter, get_counter("words"))
+        for _ in range(3):
+            self.assertEqual(counter.count_prompt("a b c", "d e"), 5)
+        self.assertEqual(WordTokenizer.calls, 2)
+        self.assertEqual(get_counter("chars:2").count("abcd"), 2)
+        with self.assertRaises(ValueError):
+            get_counter("nope")
+
+        self.assertIsInstance(TokenCounter(CharTokenizer(), max_entries=2).count("abcd"), int)
+
+        class Incomplete(Tokenizer):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_local_client_uses_configured_tokenizer(self):
+        client = LocalModelClient({"model_name": "m", "latency_ms": 0, "tokenizer": "chars"})
+        usage = client.generate("x" * 400).token_usage
+        self.assertEqual(usage.prompt_tokens, 100)
+        self.assertEqual(usage.total_tokens, usage.prompt_tokens + usage.completion_tokens)
+
+    def test_estimate_cost(self):
+        self.assertAlmostEqual(estimate_cost({"prompt_per_1k": 0.01, "completion_per_1k": 0.03}, 2000, 1000), 0.05)
+        self.assertEqual(estimate_cost({}, 2000, 1000), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()